@@ -2,6 +2,7 @@ from .tendencias import Tendencias
 from .encuestas import Enaho, EnahoPanel, Enapres, Endes
 from .downloaders import Downloader
 from .utils import FileManager
-from .cleaners import EnahoCleaner, EnapresCleaner, EndesCleaner
+from .cleaners import EncuestaCleaner
+from .query import SurveyLake
 
 #__all__ = ["enahodata", "Modulo", "ModuloPanel"]
\ No newline at end of file
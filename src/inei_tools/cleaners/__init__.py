@@ -1,2 +1,8 @@
-from ._encuesta_cleaner import EnahoCleaner, EnapresCleaner, EndesCleaner
+from ._encuesta_cleaner import EncuestaCleaner
+from ._design import SurveyDesign, estimate_proportions
+from ._bootstrap import BootstrapReplicates
+from ._distribution import distribution_stats
+from ._poverty import poverty_indicators
+from ._rollup import geographic_rollup
+from ._cube import IndicatorCube
 #__all__ = ["enahodata", "Modulo", "ModuloPanel"]
\ No newline at end of file
@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+def parse_factor(values: pd.Series) -> pd.Series:
+    """
+    Convierte un factor de expansión a float64. Acepta coma decimal ('123,45')
+    y no hace nada si la columna ya es numérica.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype("float64")
+    text = values.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(text, errors="coerce").astype("float64")
+
+
+def factorize(values: pd.Series, sort: bool = True) -> tuple[np.ndarray, pd.Index]:
+    """
+    Códigos enteros (-1 para NA) y etiquetas de una columna. Si la columna es
+    categórica se usan sus códigos directamente, sin volver a factorizar.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values.cat.codes, dtype=np.int64), pd.Index(values.cat.categories)
+    codes, uniques = pd.factorize(values, sort=sort, use_na_sentinel=True)
+    return codes.astype(np.int64, copy=False), pd.Index(uniques)
+
+
+def labels_like(labels: pd.Index, source: pd.Series) -> pd.Index | pd.Categorical:
+    """Etiquetas con el mismo dtype categórico de la columna de origen (si lo tenía)."""
+    if isinstance(source.dtype, pd.CategoricalDtype):
+        return pd.Categorical(labels, dtype=source.dtype)
+    return labels
+
+
+@dataclass
+class CountGrid:
+    """Conteos sin factor y con factor en una grilla grupo × categoría."""
+    groups: pd.Index
+    categories: pd.Index
+    counts: np.ndarray               # (n_groups, n_categories) int64
+    weighted: np.ndarray | None      # (n_groups, n_categories) float64
+
+    def observed(self) -> "CountGrid":
+        """Quita grupos y categorías sin observaciones (como `observed=True`)."""
+        rows = self.counts.sum(axis=1) > 0
+        cols = self.counts.sum(axis=0) > 0
+        return CountGrid(
+            groups=self.groups[rows],
+            categories=self.categories[cols],
+            counts=self.counts[np.ix_(rows, cols)],
+            weighted=None if self.weighted is None else self.weighted[np.ix_(rows, cols)],
+        )
+
+
+def count_grid(
+    categories: pd.Series,
+    groups: pd.Series | None = None,
+    weights: pd.Series | np.ndarray | None = None,
+) -> CountGrid:
+    """
+    Cuenta filas (y suma pesos) por grupo y categoría con un solo `np.bincount`
+    sobre el índice plano `grupo * n_categorias + categoria`.
+    Las filas con grupo o categoría NA no se cuentan; los pesos NA suman 0.
+    """
+    cat_codes, cat_labels = factorize(categories)
+    if groups is None:
+        grp_codes = np.zeros(len(cat_codes), dtype=np.int64)
+        grp_labels = pd.Index(["Total"])
+    else:
+        grp_codes, grp_labels = factorize(groups)
+
+    n_cat, n_grp = len(cat_labels), len(grp_labels)
+    valid = (cat_codes >= 0) & (grp_codes >= 0)
+    flat = grp_codes[valid] * n_cat + cat_codes[valid]
+
+    counts = np.bincount(flat, minlength=n_grp * n_cat).reshape(n_grp, n_cat)
+    weighted = None
+    if weights is not None:
+        w = np.asarray(weights, dtype=np.float64)[valid]
+        weighted = np.bincount(
+            flat, weights=np.nan_to_num(w, nan=0.0), minlength=n_grp * n_cat
+        ).reshape(n_grp, n_cat)
+
+    return CountGrid(grp_labels, cat_labels, counts, weighted)
+
+
+def pooled_columns(
+    data: pd.DataFrame | list[pd.DataFrame],
+    columns: list[str],
+    source_column: str | None = None,
+) -> pd.DataFrame:
+    """
+    Une solo las columnas pedidas de uno o varios DataFrames (ej. varios años),
+    sin concatenar copias completas de cada tabla. Con `source_column` se agrega
+    el número de DataFrame de origen de cada fila.
+    """
+    frames = [data] if isinstance(data, pd.DataFrame) else list(data)
+    parts = []
+    for number, frame in enumerate(frames):
+        part = frame[[col for col in columns if col in frame.columns]]
+        if source_column:
+            part = part.assign(**{source_column: number})
+        parts.append(part)
+    if len(parts) == 1:
+        return parts[0]
+    return pd.concat(parts, ignore_index=True)
+
+
+def group_codes(keys: pd.DataFrame, by: list[str]) -> tuple[np.ndarray, pd.Index]:
+    """
+    Código entero (-1 si alguna llave es NA) de cada combinación de las columnas
+    `by` y las etiquetas de los grupos, ordenadas. Sin `by` todo es un solo grupo.
+    """
+    if not by:
+        return np.zeros(len(keys), dtype=np.int64), pd.Index(["Total"])
+    grouped = keys.groupby(by, observed=True, sort=True, dropna=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    return codes, grouped.size().index
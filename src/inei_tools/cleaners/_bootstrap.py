@@ -0,0 +1,149 @@
+import logging
+from typing import TYPE_CHECKING
+import numpy as np
+from ..utils.parallel import process_pool
+
+if TYPE_CHECKING:
+    from ._design import SurveyDesign
+
+
+def _quantile_block(
+    values: np.ndarray, weights: np.ndarray, psu: np.ndarray, q: float, multipliers: np.ndarray
+) -> np.ndarray:
+    """
+    Cuantil ponderado de cada réplica de un bloque. `values` ya viene ordenado,
+    así que basta un cumsum por columna y una búsqueda del peso acumulado.
+    """
+    replicate_weights = weights[:, None] * multipliers[psu]      # (n, r) float32
+    cumulative = np.cumsum(replicate_weights, axis=0, dtype=np.float64)
+    targets = q * cumulative[-1]
+    # Primer índice cuyo peso acumulado alcanza el objetivo, en cada columna
+    positions = (cumulative < targets).sum(axis=0)
+    return values[np.minimum(positions, len(values) - 1)]
+
+
+def _totals_block(psu_totals: np.ndarray, multipliers: np.ndarray) -> np.ndarray:
+    """Totales de las réplicas de un bloque: (n_cells, columnas del bloque)."""
+    return psu_totals.T @ multipliers
+
+
+class BootstrapReplicates:
+    """
+    Pesos de réplica bootstrap (Rao-Wu) para el diseño de una tabla.
+
+    En cada estrato con n_h conglomerados se eligen n_h - 1 con reemplazo y el
+    peso de cada UPM se multiplica por n_h / (n_h - 1) veces el número de veces
+    que fue elegida. Los multiplicadores se guardan por UPM en una matriz
+    float32 (n_psu, R), así que todas las réplicas de un total se obtienen con
+    un producto matricial contra los totales por UPM.
+
+    Parameters
+    ----------
+    design : SurveyDesign
+        Diseño muestral (factor, estrato y conglomerado de cada fila).
+    replicates : int, default 200
+        Número de réplicas R.
+    seed : int, optional
+        Semilla del generador aleatorio (para resultados reproducibles).
+    workers : int, optional
+        Procesos para evaluar las réplicas (totales y cuantiles); las réplicas se
+        reparten en bloques de columnas entre los procesos.
+    block_size : int, default 50
+        Réplicas por bloque.
+    """
+
+    def __init__(
+        self,
+        design: "SurveyDesign",
+        replicates: int = 200,
+        seed: int | None = None,
+        workers: int | None = None,
+        block_size: int = 50,
+    ):
+        self.design = design
+        self.replicates = replicates
+        self.workers = workers
+        self.block_size = block_size
+        self.multipliers = self._draw_multipliers(np.random.default_rng(seed))
+
+    def _draw_multipliers(self, rng: np.random.Generator) -> np.ndarray:
+        multipliers = np.ones((self.design.n_psu, self.replicates), dtype=np.float32)
+        strata = self.design.psu_strata
+        order = np.argsort(strata, kind="stable")
+        starts = np.flatnonzero(np.r_[True, strata[order][1:] != strata[order][:-1]])
+        for psus in np.split(order, starts[1:]):
+            n_h = len(psus)
+            if n_h < 2:
+                # Estrato con una sola UPM: no aporta varianza
+                continue
+            draws = rng.multinomial(n_h - 1, np.full(n_h, 1 / n_h), size=self.replicates)
+            multipliers[psus] = (draws.T * (n_h / (n_h - 1))).astype(np.float32)
+        return multipliers
+
+    def _map_blocks(self, function, *args, block_size: int | None = None) -> np.ndarray:
+        """
+        Evalúa `function(*args, multiplicadores_del_bloque)` por bloques de
+        réplicas (en paralelo con `workers > 1`) y une los resultados por columnas.
+        """
+        block_size = block_size or self.block_size
+        blocks = [
+            self.multipliers[:, start:start + block_size]
+            for start in range(0, self.replicates, block_size)
+        ]
+        if self.workers and self.workers > 1 and len(blocks) > 1:
+            logging.info(f"Evaluando {self.replicates} réplicas con {self.workers} procesos")
+            with process_pool(min(self.workers, len(blocks))) as executor:
+                futures = [executor.submit(function, *args, block) for block in blocks]
+                results = [future.result() for future in futures]
+        else:
+            results = [function(*args, block) for block in blocks]
+        return np.concatenate(results, axis=-1)
+
+    def weights(self) -> np.ndarray:
+        """Pesos de réplica por fila: matriz float32 (n_rows, R)."""
+        return self.design.weights.astype(np.float32)[:, None] * self.multipliers[self.design.psu]
+
+    def totals(
+        self, cells: np.ndarray, n_cells: int, mask: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Totales ponderados por celda en cada réplica: matriz (n_cells, R)."""
+        psu_totals = self.design.psu_totals(cells, n_cells, mask).astype(np.float32)
+        if self.workers and self.workers > 1:
+            return self._map_blocks(_totals_block, psu_totals)
+        # En un solo proceso, un único producto matricial sobre todas las réplicas
+        return _totals_block(psu_totals, self.multipliers)
+
+    def ratio(self, numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        """Razón de totales ponderados Σw·y / Σw·x en cada réplica: vector (R,)."""
+        design = self.design
+        num = np.bincount(design.psu, weights=design.weights * numerator, minlength=design.n_psu)
+        den = np.bincount(design.psu, weights=design.weights * denominator, minlength=design.n_psu)
+        return (num.astype(np.float32) @ self.multipliers) / (
+            den.astype(np.float32) @ self.multipliers
+        )
+
+    def quantile(
+        self, values: np.ndarray, q: float = 0.5, block_size: int | None = None
+    ) -> np.ndarray:
+        """
+        Cuantil ponderado (ej. mediana) en cada réplica: vector (R,).
+
+        Los valores se ordenan una sola vez; con `workers > 1` los bloques de
+        réplicas se evalúan en paralelo.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values)
+        order = np.argsort(values[keep], kind="stable")
+        sorted_values = values[keep][order]
+        weights = self.design.weights[keep][order].astype(np.float32)
+        psu = self.design.psu[keep][order]
+        return self._map_blocks(
+            _quantile_block, sorted_values, weights, psu, q, block_size=block_size
+        )
+
+    @staticmethod
+    def variance(replicate_estimates: np.ndarray, estimate: np.ndarray) -> np.ndarray:
+        """Varianza bootstrap: media de (θ_r - θ)² sobre las réplicas (último eje)."""
+        estimate = np.asarray(estimate, dtype=np.float64)
+        deviations = replicate_estimates - estimate[..., None]
+        return np.nanmean(deviations**2, axis=-1)
@@ -0,0 +1,198 @@
+from itertools import combinations
+from typing import Self
+import numpy as np
+import pandas as pd
+from ._aggregation import factorize, parse_factor, pooled_columns
+from ._design import clean_categories
+
+
+class IndicatorCube:
+    """
+    Cubo de conteos de una variable categórica: un array de NumPy con un eje por
+    dimensión (ej. departamento × área × sexo × grupo de edad × año) y un último
+    eje para las categorías de la variable.
+
+    Se construye con una sola agregación ponderada de la grilla más fina
+    (`IndicatorCube.build`); cualquier combinación de dimensiones, corte o tabla
+    se obtiene después sumando ejes del cubo, sin volver a los microdatos.
+
+    Parameters
+    ----------
+    variable : str
+        Nombre de la variable categórica.
+    dimensions : dict[str, pd.Index]
+        Etiquetas de cada dimensión, en el orden de los ejes.
+    categories : pd.Index
+        Categorías de la variable (último eje).
+    counts : np.ndarray
+        Número de observaciones por celda.
+    weighted : np.ndarray, optional
+        Suma del factor de expansión por celda.
+    """
+
+    def __init__(
+        self,
+        variable: str,
+        dimensions: dict[str, pd.Index],
+        categories: pd.Index,
+        counts: np.ndarray,
+        weighted: np.ndarray | None = None,
+    ):
+        self.variable = variable
+        self.dimensions = dimensions
+        self.categories = categories
+        self.counts = counts
+        self.weighted = weighted
+
+    @classmethod
+    def build(
+        cls,
+        data: pd.DataFrame | list[pd.DataFrame],
+        variable: str,
+        dimensions: list[str],
+        weight_column: str | None = None,
+        bins: dict[str, list[float]] | None = None,
+    ) -> "IndicatorCube":
+        """
+        Construye el cubo con un solo `np.bincount` sobre el índice plano de
+        todas las dimensiones (códigos enteros de cada una).
+
+        Parameters
+        ----------
+        data : pd.DataFrame | list[pd.DataFrame]
+            Microdatos; con una lista (ej. varios años) solo se unen las columnas usadas.
+        variable : str
+            Variable categórica a contar.
+        dimensions : list[str]
+            Columnas que forman los ejes del cubo (ej. ["Departamento", "AREA", "AÑO"]).
+        weight_column : str, optional
+            Factor de expansión. Sin él, el cubo solo tiene conteos.
+        bins : dict[str, list[float]], optional
+            Cortes para dimensiones numéricas, ej. {"EDAD": [0, 14, 29, 44, 64, 120]}.
+        """
+        bins = bins or {}
+        columns = [*dimensions, variable, weight_column]
+        df = pooled_columns(data, [col for col in dict.fromkeys(columns) if col])
+
+        cat_codes, categories = factorize(clean_categories(df[variable]))
+        axis_codes, labels = [], {}
+        for dimension in dimensions:
+            values = df[dimension]
+            if dimension in bins:
+                values = pd.cut(pd.to_numeric(values, errors="coerce"), bins[dimension])
+            codes, labels[dimension] = factorize(values)
+            axis_codes.append(codes)
+        axis_codes.append(cat_codes)
+
+        shape = tuple(len(index) for index in labels.values()) + (len(categories),)
+        valid = np.logical_and.reduce([codes >= 0 for codes in axis_codes])
+        flat = np.ravel_multi_index([codes[valid] for codes in axis_codes], shape)
+        size = int(np.prod(shape))
+
+        counts = np.bincount(flat, minlength=size).reshape(shape)
+        weighted = None
+        if weight_column:
+            weights = np.nan_to_num(parse_factor(df[weight_column]).to_numpy(np.float64)[valid])
+            weighted = np.bincount(flat, weights=weights, minlength=size).reshape(shape)
+        return cls(variable, labels, categories, counts, weighted)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self.counts.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.counts.nbytes + (self.weighted.nbytes if self.weighted is not None else 0)
+
+    def _axis(self, dimension: str) -> int:
+        if dimension not in self.dimensions:
+            raise KeyError(f"Dimensión '{dimension}' no existe. Dimensiones: {list(self.dimensions)}")
+        return list(self.dimensions).index(dimension)
+
+    def aggregate(self, *keep: str) -> Self:
+        """Cubo con solo las dimensiones `keep` (las demás se suman)."""
+        drop = tuple(self._axis(dim) for dim in self.dimensions if dim not in keep)
+        order = [self._axis(dim) for dim in keep]
+        # Después de sumar, los ejes conservados quedan en el orden original
+        remaining = sorted(order)
+        permutation = [remaining.index(axis) for axis in order] + [len(order)]
+
+        def reduce(values: np.ndarray | None) -> np.ndarray | None:
+            if values is None:
+                return None
+            return values.sum(axis=drop).transpose(permutation)
+
+        return type(self)(
+            self.variable,
+            {dim: self.dimensions[dim] for dim in keep},
+            self.categories,
+            reduce(self.counts),
+            reduce(self.weighted),
+        )
+
+    def slice(self, **selection) -> Self:
+        """
+        Cubo restringido a algunas etiquetas, ej. `cube.slice(AREA="Rural", AÑO=[2022, 2023])`.
+        Una etiqueta sola conserva la dimensión con un único valor.
+        """
+        index = [slice(None)] * self.counts.ndim
+        dimensions = dict(self.dimensions)
+        for dimension, labels in selection.items():
+            labels = labels if isinstance(labels, (list, tuple)) else [labels]
+            positions = self.dimensions[dimension].get_indexer(labels)
+            if (positions < 0).any():
+                raise KeyError(f"Etiquetas no encontradas en '{dimension}': {labels}")
+            index[self._axis(dimension)] = positions
+            dimensions[dimension] = self.dimensions[dimension][positions]
+
+        def take(values: np.ndarray | None) -> np.ndarray | None:
+            if values is None:
+                return None
+            for axis, selected in enumerate(index):
+                if not isinstance(selected, slice):
+                    values = np.take(values, selected, axis=axis)
+            return values
+
+        return type(self)(
+            self.variable, dimensions, self.categories, take(self.counts), take(self.weighted)
+        )
+
+    def to_frame(self, with_factor: bool = True, percentage: bool = True) -> pd.DataFrame:
+        """
+        Tabla con una fila por combinación de dimensiones y una columna por
+        categoría (como `group_by_departamento`). Con `percentage=True` cada fila
+        suma 100. Las combinaciones sin observaciones se omiten.
+        """
+        values = self.weighted if with_factor and self.weighted is not None else self.counts
+        values = values.reshape(-1, len(self.categories)).astype(np.float64)
+        observed = self.counts.reshape(-1, len(self.categories)).sum(axis=1) > 0
+        if percentage:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = values / values.sum(axis=1, keepdims=True) * 100
+
+        if self.dimensions:
+            index = pd.MultiIndex.from_product(
+                list(self.dimensions.values()), names=list(self.dimensions)
+            )
+        else:
+            index = pd.Index(["Total"])
+        df = pd.DataFrame(
+            values, index=index, columns=pd.Index(self.categories, name=self.variable)
+        )
+        df = df[observed]
+        return df.reset_index() if self.dimensions else df
+
+    def combinations(
+        self, max_dimensions: int | None = None, **kwargs
+    ) -> dict[tuple[str, ...], pd.DataFrame]:
+        """
+        Tablas de todas las combinaciones de dimensiones (hasta `max_dimensions`),
+        todas derivadas del mismo cubo. Los `kwargs` se pasan a `to_frame`.
+        """
+        names = list(self.dimensions)
+        max_dimensions = len(names) if max_dimensions is None else max_dimensions
+        return {
+            combo: self.aggregate(*combo).to_frame(**kwargs)
+            for size in range(max_dimensions + 1)
+            for combo in combinations(names, size)
+        }
@@ -0,0 +1,261 @@
+import logging
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Literal
+import numpy as np
+import pandas as pd
+from ._aggregation import factorize, group_codes, parse_factor
+from ._bootstrap import BootstrapReplicates
+from ..configs.encuesta_config import EncuestaConfig
+
+_BLANKS = {"", "nan", "NaN"}
+
+
+def clean_categories(values: pd.Series) -> pd.Series:
+    """Marca como NA las respuestas vacías ('', ' ', 'nan'), igual que `remove_nas`."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        blanks = [c for c in values.cat.categories if str(c).strip() in _BLANKS]
+        return values.cat.remove_categories(blanks) if blanks else values
+    return values.mask(values.astype(str).str.strip().isin(_BLANKS))
+
+
+def z_value(level: float) -> float:
+    """Valor crítico de la normal estándar para un nivel de confianza (ej. 0.95 -> 1.96)."""
+    return NormalDist().inv_cdf(0.5 + level / 2)
+
+
+@dataclass
+class SurveyDesign:
+    """
+    Diseño muestral de una tabla: factor de expansión, conglomerado (UPM) y
+    estrato de cada fila.
+
+    Los conglomerados se codifican como enteros únicos dentro de su estrato, de
+    modo que los totales por UPM se obtienen con un solo `np.bincount`.
+    """
+    weights: np.ndarray     # (n_rows,) float64
+    psu: np.ndarray         # (n_rows,) código de UPM
+    psu_strata: np.ndarray  # (n_psu,) estrato de cada UPM
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        config: EncuestaConfig,
+        weights: np.ndarray | None = None,
+        pool_column: str | None = None,
+    ) -> "SurveyDesign":
+        """
+        Diseño a partir de las columnas de `config`. `weights` reemplaza al factor
+        (ej. factor × miembros del hogar) y `pool_column` indica la columna que
+        separa muestras independientes (ej. años combinados): los estratos y
+        conglomerados se anidan dentro de ella.
+        """
+        if weights is None:
+            weights = parse_factor(df[config.factor_column]).fillna(0).to_numpy(np.float64)
+
+        strata_keys = [col for col in (pool_column, config.strata_column) if col]
+        if config.strata_column not in df.columns:
+            logging.warning(f"No se encontró {config.strata_column}: se usa un solo estrato")
+            strata_keys.remove(config.strata_column)
+        strata, _ = group_codes(df, strata_keys)
+        strata = np.where(strata < 0, strata.max() + 1, strata)  # estrato NA: uno aparte
+
+        if config.psu_column in df.columns:
+            psu_codes, _ = factorize(df[config.psu_column])
+            # La misma UPM en dos estratos se trata como dos UPM distintas
+            combined = strata * (psu_codes.max() + 2) + (psu_codes + 1)
+            _, psu = np.unique(combined, return_inverse=True)
+        else:
+            logging.warning(f"No se encontró {config.psu_column}: cada fila es su propia UPM")
+            psu = np.arange(len(df), dtype=np.int64)
+
+        psu_strata = np.zeros(psu.max() + 1 if len(psu) else 0, dtype=np.int64)
+        psu_strata[psu] = strata
+        return cls(weights=weights, psu=psu.astype(np.int64), psu_strata=psu_strata)
+
+    @property
+    def n_psu(self) -> int:
+        return len(self.psu_strata)
+
+    def psu_totals(
+        self, cells: np.ndarray, n_cells: int, mask: np.ndarray | None = None
+    ) -> np.ndarray:
+        """Suma de pesos por UPM y celda: matriz (n_psu, n_cells)."""
+        psu, weights = self.psu, self.weights
+        if mask is not None:
+            psu, weights, cells = psu[mask], weights[mask], cells[mask]
+        flat = psu * n_cells + cells
+        return np.bincount(
+            flat, weights=weights, minlength=self.n_psu * n_cells
+        ).reshape(self.n_psu, n_cells)
+
+    def variance(self, z: np.ndarray) -> np.ndarray:
+        """
+        Varianza de linealización de Taylor (con reemplazo entre UPM) de cada
+        columna de `z`, que contiene los totales por UPM de la variable linealizada.
+
+            V = Σ_h n_h / (n_h - 1) · Σ_j (z_hj - z̄_h)²
+
+        Los estratos con una sola UPM no aportan varianza.
+        """
+        order = np.argsort(self.psu_strata, kind="stable")
+        z = z[order]
+        strata = self.psu_strata[order]
+        starts = np.flatnonzero(np.r_[True, strata[1:] != strata[:-1]])
+        n_h = np.diff(np.r_[starts, len(strata)]).astype(np.float64)
+
+        sums = np.add.reduceat(z, starts, axis=0)
+        squares = np.add.reduceat(z * z, starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(n_h > 1, n_h / (n_h - 1), 0.0)
+        return (scale[:, None] * (squares - sums**2 / n_h[:, None])).sum(axis=0)
+
+    def domain_variance(
+        self, groups: np.ndarray, psu: np.ndarray, z: np.ndarray, n_groups: int
+    ) -> np.ndarray:
+        """
+        Igual que `variance`, pero con los totales por UPM en formato disperso:
+        una entrada por par (grupo, UPM) con observaciones. Las UPM sin
+        observaciones del grupo valen 0 y no cambian las sumas, así que no hace
+        falta una matriz densa grupos × UPM.
+
+        `z` es (n_pares,) o (n_pares, K); retorna (n_groups,) o (n_groups, K).
+        """
+        n_strata = int(self.psu_strata.max()) + 1 if self.n_psu else 0
+        n_h = np.bincount(self.psu_strata, minlength=n_strata).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(n_h > 1, n_h / (n_h - 1), 0.0)
+
+        keys = groups * n_strata + self.psu_strata[psu]
+        size = n_groups * n_strata
+        columns = z.reshape(len(z), -1).T
+        result = []
+        for column in columns:
+            sums = np.bincount(keys, column, minlength=size).reshape(n_groups, n_strata)
+            squares = np.bincount(keys, column**2, minlength=size).reshape(n_groups, n_strata)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                terms = np.where(n_h > 0, squares - sums**2 / n_h, 0.0)
+            result.append((scale * terms).sum(axis=1))
+        return np.stack(result, axis=1).reshape((n_groups,) + z.shape[1:])
+
+
+def estimate_proportions(
+    df: pd.DataFrame,
+    variables: list[str],
+    config: EncuestaConfig,
+    by: str | None = "Departamento",
+    level: float = 0.95,
+    cv_max: float = 15.0,
+    method: Literal["taylor", "bootstrap"] = "taylor",
+    replicates: int = 200,
+    seed: int | None = None,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Proporciones (%) de cada categoría por grupo, con errores estándar de
+    linealización de Taylor (o bootstrap), intervalos de confianza y
+    coeficientes de variación.
+
+    Para cada variable, todas las celdas grupo × categoría se calculan juntas:
+    los totales por UPM salen de un `np.bincount` y la varianza de unas pocas
+    operaciones matriciales por estrato (sin bucles por celda). Con bootstrap,
+    las R réplicas se evalúan con dos productos matriciales por variable.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Microdatos con el factor, el estrato y el conglomerado de `config`.
+    variables : list[str]
+        Variables categóricas a estimar.
+    config : EncuestaConfig
+        Configuración de la encuesta (nombres de factor, estrato y UPM).
+    by : str, optional
+        Columna de dominio (ej. "Departamento"). Con None se estima a nivel nacional.
+    level : float, default 0.95
+        Nivel de confianza de los intervalos.
+    cv_max : float, default 15.0
+        Las estimaciones con CV (%) mayor se marcan como referenciales.
+    method : {"taylor", "bootstrap"}, default "taylor"
+        Método para la varianza.
+    replicates : int, default 200
+        Número de réplicas bootstrap (solo con method="bootstrap").
+    seed : int, optional
+        Semilla de las réplicas bootstrap.
+    workers : int, optional
+        Procesos para evaluar las réplicas bootstrap por bloques.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas: variable, `by`, categoria, n, estimado, error_estandar,
+        ic_inferior, ic_superior, cv y referencial.
+    """
+    design = SurveyDesign.from_frame(df, config)
+    if by is None:
+        group_codes = np.zeros(len(df), dtype=np.int64)
+        group_labels = pd.Index(["Nacional"])
+    else:
+        group_codes, group_labels = factorize(df[by])
+    n_groups = len(group_labels)
+    z = z_value(level)
+    bootstrap = (
+        BootstrapReplicates(design, replicates=replicates, seed=seed, workers=workers)
+        if method == "bootstrap"
+        else None
+    )
+
+    tables = []
+    for variable in variables:
+        cat_codes, cat_labels = factorize(clean_categories(df[variable]))
+        n_cat = len(cat_labels)
+        valid = (cat_codes >= 0) & (group_codes >= 0)
+
+        # Totales por UPM: Y (grupo × categoría) y N (grupo)
+        cells = group_codes * n_cat + cat_codes
+        totals = design.psu_totals(cells, n_groups * n_cat, valid)
+        totals = totals.reshape(design.n_psu, n_groups, n_cat)
+        domain = design.psu_totals(group_codes, n_groups, valid)
+
+        y = totals.sum(axis=0)
+        n = domain.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = y / n[:, None]
+            if bootstrap is None:
+                # Variable linealizada de la razón Y/N, agregada por UPM
+                lin = (totals - p[None] * domain[:, :, None]) / n[None, :, None]
+                variance = design.variance(lin.reshape(design.n_psu, -1)).reshape(p.shape)
+            else:
+                replicate_y = bootstrap.totals(cells, n_groups * n_cat, valid)
+                replicate_n = bootstrap.totals(group_codes, n_groups, valid)
+                replicate_p = (
+                    replicate_y.reshape(n_groups, n_cat, -1) / replicate_n[:, None, :]
+                )
+                variance = bootstrap.variance(replicate_p, p)
+            se = np.sqrt(variance)
+            cv = se / p * 100
+
+        counts = np.bincount(
+            cells[valid], minlength=n_groups * n_cat
+        ).reshape(n_groups, n_cat)
+        table = pd.DataFrame(
+            {
+                "variable": variable,
+                by or "Ambito": np.repeat(group_labels, n_cat),
+                "categoria": np.tile(cat_labels, n_groups),
+                "n": counts.ravel(),
+                "estimado": p.ravel() * 100,
+                "error_estandar": se.ravel() * 100,
+                "cv": cv.ravel(),
+            }
+        )
+        table["ic_inferior"] = table["estimado"] - z * table["error_estandar"]
+        table["ic_superior"] = table["estimado"] + z * table["error_estandar"]
+        table["referencial"] = ~(table["cv"] <= cv_max)
+        tables.append(table[np.repeat(n > 0, n_cat)])
+
+    columns = [
+        "variable", by or "Ambito", "categoria", "n", "estimado", "error_estandar",
+        "ic_inferior", "ic_superior", "cv", "referencial",
+    ]
+    return pd.concat(tables, ignore_index=True)[columns]
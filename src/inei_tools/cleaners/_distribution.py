@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from ._aggregation import group_codes, parse_factor, pooled_columns
+
+
+class _SortedGroups:
+    """
+    Valores ordenados por (grupo, valor) con una sola ordenación, más los pesos
+    y valores acumulados. Todas las estadísticas de los grupos se obtienen luego
+    con búsquedas (`searchsorted`) y sumas por grupo (`bincount`).
+    """
+
+    def __init__(self, values: np.ndarray, weights: np.ndarray, codes: np.ndarray, n_groups: int):
+        keep = (codes >= 0) & ~np.isnan(values) & (weights > 0)
+        values, weights, codes = values[keep], weights[keep], codes[keep]
+        order = np.lexsort((values, codes))
+        self.values = values[order]
+        self.weights = weights[order]
+        self.codes = codes[order]
+        self.n_groups = n_groups
+
+        self.starts = np.searchsorted(self.codes, np.arange(n_groups), side="left")
+        self.ends = np.searchsorted(self.codes, np.arange(n_groups), side="right")
+        self.counts = self.ends - self.starts
+
+        self.cum_weights = np.cumsum(self.weights)
+        self.cum_values = np.cumsum(self.weights * self.values)
+        # Acumulado antes del inicio de cada grupo (para acumulados por grupo)
+        self.weights_before = np.r_[0.0, self.cum_weights][self.starts]
+        self.values_before = np.r_[0.0, self.cum_values][self.starts]
+        self.total_weight = np.bincount(self.codes, self.weights, minlength=n_groups)
+        self.total_value = np.bincount(
+            self.codes, self.weights * self.values, minlength=n_groups
+        )
+
+    def _positions(self, shares: np.ndarray) -> np.ndarray:
+        """Índice del primer elemento de cada grupo cuyo peso acumulado alcanza share · W."""
+        targets = self.weights_before[:, None] + shares[None, :] * self.total_weight[:, None]
+        positions = np.searchsorted(self.cum_weights, targets, side="left")
+        return np.clip(positions, self.starts[:, None], np.maximum(self.ends - 1, 0)[:, None])
+
+    def quantiles(self, qs: np.ndarray) -> np.ndarray:
+        """Cuantiles ponderados (G, Q): menor valor con peso acumulado >= q · W."""
+        if not len(self.values):
+            return np.full((self.n_groups, len(qs)), np.nan)
+        result = self.values[self._positions(qs)]
+        return np.where(self.counts[:, None] > 0, result, np.nan)
+
+    def lorenz(self, shares: np.ndarray) -> np.ndarray:
+        """Curva de Lorenz (G, P): fracción del valor total en la población más pobre."""
+        positions = self._positions(shares)
+        weight_before = np.r_[0.0, self.cum_weights][positions] - self.weights_before[:, None]
+        value_before = np.r_[0.0, self.cum_values][positions] - self.values_before[:, None]
+        partial = shares[None, :] * self.total_weight[:, None] - weight_before
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (value_before + partial * self.values[positions]) / self.total_value[:, None]
+
+    def gini(self) -> np.ndarray:
+        """Gini = 1 - Σ p_i (L_i + L_{i-1}), con la curva de Lorenz en cada observación."""
+        g = self.codes
+        weighted = self.weights * self.values
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lorenz = (self.cum_values - self.values_before[g]) / self.total_value[g]
+            shares = self.weights / self.total_weight[g]
+            terms = shares * (2 * lorenz - weighted / self.total_value[g])
+            return 1 - np.bincount(g, terms, minlength=self.n_groups)
+
+    def theil(self) -> np.ndarray:
+        """Índice de Theil T = (1/W) Σ w_i (y_i/μ) ln(y_i/μ)."""
+        g = self.codes
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = self.total_value / self.total_weight
+            ratio = self.values / mean[g]
+            terms = np.where(ratio > 0, self.weights * ratio * np.log(ratio), 0.0)
+            return np.bincount(g, terms, minlength=self.n_groups) / self.total_weight
+
+
+def distribution_stats(
+    data: pd.DataFrame | list[pd.DataFrame],
+    value_column: str,
+    weight_column: str,
+    by: list[str] | None = None,
+    members_column: str | None = None,
+    quantiles: tuple[float, ...] = (0.1, 0.25, 0.5, 0.75, 0.9),
+    decile_shares: bool = True,
+) -> pd.DataFrame:
+    """
+    Estadísticas de distribución ponderadas por grupo: media, cuantiles, Gini,
+    Theil y participación de cada decil en el total (ej. gasto o ingreso per
+    cápita de la Sumaria de Enaho por departamento y año).
+
+    Se hace una sola ordenación por (grupo, valor) para todos los grupos; los
+    cuantiles y deciles se obtienen buscando el peso acumulado.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | list[pd.DataFrame]
+        Microdatos. Con una lista (ej. varios años) solo se unen las columnas usadas.
+    value_column : str
+        Variable a analizar (ej. gasto per cápita).
+    weight_column : str
+        Factor de expansión (ej. FACTOR07).
+    by : list[str], optional
+        Columnas de agrupación (ej. ["AÑO", "Departamento"]).
+    members_column : str, optional
+        Si se indica (ej. MIEPERHO), el factor se multiplica por esta columna para
+        obtener estadísticas por persona a partir de datos por hogar.
+    quantiles : tuple[float, ...]
+        Cuantiles a calcular; la columna de q=0.5 se llama "p50".
+    decile_shares : bool, default True
+        Si True, agrega la participación (%) de cada decil ("d1" ... "d10").
+    """
+    by = list(by or [])
+    columns = list(dict.fromkeys([*by, value_column, weight_column, members_column]))
+    df = pooled_columns(data, [col for col in columns if col])
+
+    codes, labels = group_codes(df, by)
+    weights = parse_factor(df[weight_column]).to_numpy(np.float64)
+    if members_column:
+        weights = weights * parse_factor(df[members_column]).to_numpy(np.float64)
+    values = pd.to_numeric(df[value_column], errors="coerce").to_numpy(np.float64)
+
+    groups = _SortedGroups(values, np.nan_to_num(weights), codes, len(labels))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = groups.total_value / groups.total_weight
+
+    result = pd.DataFrame(
+        {"n": groups.counts, "poblacion": groups.total_weight, "media": mean}, index=labels
+    )
+    qs = np.asarray(quantiles, dtype=np.float64)
+    for q, column in zip(qs, groups.quantiles(qs).T):
+        result[f"p{round(q * 100):02d}"] = column
+    result["gini"] = groups.gini()
+    result["theil"] = groups.theil()
+
+    if decile_shares:
+        lorenz = groups.lorenz(np.linspace(0, 1, 11))
+        for decile, share in enumerate(np.diff(lorenz, axis=1).T, start=1):
+            result[f"d{decile}"] = share * 100
+
+    result = result[result["n"] > 0]
+    return result.reset_index() if by else result.reset_index(drop=True)
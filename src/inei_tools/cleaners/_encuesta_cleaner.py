@@ -1,25 +1,97 @@
 # Nota: solo funciona para preguntas en las que se evalúa la confianza
 # TODO: Agregar factor de expansión
 # TODO: Reducir los métodos, confunde el haber varios
+import inspect
 import logging
+from contextlib import ExitStack, contextmanager
+from functools import wraps
 from pathlib import Path
 from typing import Literal, Self
 import numpy as np
 import ubigeos_peru as ubg
 import pandas as pd
 from icecream import ic
-from ..utils import detect_delimiter, detect_encoding
+from ..utils import sniff_csv
+from ..utils.columns import match_columns, read_column_names
+from ..utils.memory import PeakMemory, copy_on_write
+from ..utils.table_cache import TableCache
+from ..utils.reading import iter_chunks, read_csv_arrow, read_dbf, read_parallel, read_spss
+from ._aggregation import count_grid, labels_like, parse_factor
+from ._cube import IndicatorCube
+from ._design import estimate_proportions
+from ._distribution import distribution_stats
+from ._plan import AGGREGATIONS, PlanStep, QueryPlan
+from ._polars import aggregate as aggregate_polars, scan as scan_polars
+from ._poverty import poverty_indicators
+from ._rollup import geographic_rollup
+from ._ubigeo import map_departamentos, map_nombres, map_provincias
 from ..configs.encuesta_config import EnahoConfig, EnapresConfig, EndesConfig
 
+
+def _step(method):
+    """
+    Paso del cleaner. En modo lazy solo se registra en el plan (ver `collect`).
+    En modo frugal se ejecuta con copy-on-write y, con `profile_memory`, se
+    registra en `memory_report` el pico de memoria que asignó (ver `memory_usage`).
+    """
+    signature = inspect.signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.plan is not None and not self._running_plan:
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            self.plan.add(method.__name__, dict(list(bound.arguments.items())[1:]))
+            return self
+        if not (self.frugal or self.profile_memory) or self._in_step:
+            return method(self, *args, **kwargs)
+        self._in_step = True
+        try:
+            with ExitStack() as stack:
+                if self.frugal:
+                    stack.enter_context(copy_on_write())
+                # tracemalloc hace más lenta cada asignación: solo si se pide el perfil
+                peak = stack.enter_context(PeakMemory()) if self.profile_memory else None
+                result = method(self, *args, **kwargs)
+        finally:
+            self._in_step = False
+        if peak is None:
+            return result
+        df_bytes = int(self.df.memory_usage(deep=True).sum()) if self.df is not None else 0
+        self.memory_report.append(
+            {
+                "step": method.__name__,
+                "rows": 0 if self.df is None else len(self.df),
+                "df_bytes": df_bytes,
+                "peak_bytes": peak.bytes,
+            }
+        )
+        return result
+    return wrapper
+
+
 # TODO: Forma más reliable de obtener el año
 # TODO: Add departamento debería tener como args with_lima_metro
 class EncuestaCleaner:
-    def __init__(self, encuesta: Literal["enaho", "enapres", "endes"]):
+    def __init__(
+        self,
+        encuesta: Literal["enaho", "enapres", "endes"],
+        engine: Literal["c", "pyarrow", "polars"] = "c",
+        read_workers: int | None = None,
+        parallel_read_min_bytes: int = 256 * 1024**2,
+        cache: bool | TableCache = False,
+        frugal: bool = False,
+        keep_original: bool | None = None,
+        lazy: bool = False,
+        profile_memory: bool = False,
+    ):
         self.data_source = None
         self.df: pd.DataFrame = None
         self.df_original = None
         self.target_variable_id = None
         self.year: int = None
+        # True cuando self.df contiene conteos parciales (ver aggregate_in_chunks)
+        self.is_aggregated = False
 
         if encuesta == "enaho":
             self.config = EnahoConfig()
@@ -29,19 +101,142 @@ class EncuestaCleaner:
             self.config = EndesConfig()
         
         self.encuesta = encuesta
+        # Parser de CSV: "c" (pandas) o "pyarrow" (multihilo, mismos tipos).
+        # Con "polars" el cleaner es lazy y los pasos hasta la agregación se
+        # ejecutan como una consulta de Polars (ver `_collect_polars`)
+        self.engine = engine
+        # Lectura multiproceso de .dta/.sav: solo si read_workers > 1 y el
+        # archivo pesa al menos parallel_read_min_bytes
+        self.read_workers = read_workers
+        self.parallel_read_min_bytes = parallel_read_min_bytes
+        # Caché persistente de tablas ya parseadas (ver utils.table_cache)
+        if cache is True:
+            self.table_cache = TableCache()
+        else:
+            self.table_cache = cache or None
+        # Modo frugal: sin copias implícitas y copy-on-write en cada paso.
+        # df_original solo se guarda si se pide (keep_original=True o `snapshot()`)
+        self.frugal = frugal
+        self.keep_original = not frugal if keep_original is None else keep_original
+        # Perfil de memoria por paso (tracemalloc): filas, tamaño y pico de cada paso
+        self.profile_memory = profile_memory
+        self.memory_report: list[dict] = []
+        self._in_step = False
+        # Modo lazy: los pasos se registran en un plan que se optimiza y se
+        # ejecuta una sola vez al pedir los datos (get_df / collect)
+        lazy = lazy or engine == "polars"
+        self.plan = QueryPlan(self.config, enapres=encuesta == "enapres") if lazy else None
+        self._running_plan = False
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self.plan:
+            self.collect()
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._df = value
+
+    @contextmanager
+    def _eager(self):
+        """Ejecuta los pasos directamente aunque el cleaner sea lazy."""
+        running, self._running_plan = self._running_plan, True
+        try:
+            yield
+        finally:
+            self._running_plan = running
+
+    def collect(self) -> Self:
+        """Optimiza y ejecuta el plan pendiente (modo lazy). No hace nada si no hay plan."""
+        if not self.plan:
+            return self
+        plan = self.plan.optimize(self.target_variable_id)
+        self.plan.steps = []
+        steps = self._collect_polars(plan.steps) if self.engine == "polars" else plan.steps
+        with self._eager():
+            for step in steps:
+                getattr(self, step.name)(**step.kwargs)
+        return self
+
+    def _collect_polars(self, steps: list[PlanStep]) -> list[PlanStep]:
+        """
+        Ejecuta en Polars la parte del plan hasta la primera agregación (lectura,
+        `remove_nas`, departamentos y conteos) y deja self.df con los conteos por
+        categoría, como `aggregate_in_chunks`. Retorna los pasos restantes, que
+        se aplican en pandas sobre la tabla ya agregada.
+        """
+        position = next((i for i, step in enumerate(steps) if step.name in AGGREGATIONS), None)
+        supported = {"remove_nas", "add_departamentos"}
+        if (
+            position is None
+            or steps[0].name != "initialize"
+            or any(step.name not in supported for step in steps[1:position])
+        ):
+            logging.info("engine='polars': el plan no termina en una agregación, se ejecuta en pandas")
+            return steps
 
-    def initialize(self, data_source: str | Path | pd.DataFrame) -> Self:
+        names = {step.name for step in steps[:position + 1]}
+        aggregation = steps[position]
+        source = steps[0].kwargs["data_source"]
+        if isinstance(source, str):
+            source = Path(source)
+        columns = steps[0].kwargs.get("columns") or self.required_columns()
+
+        frame = scan_polars(source, columns, self._load_into_memory)
+        self.df, self.year = aggregate_polars(
+            frame,
+            self.target_variable_id,
+            self.config,
+            self.encuesta,
+            remove_nas="remove_nas" in names,
+            departamentos=bool(
+                names & {"add_departamentos", "group_by_departamento", "_group_by_new_departamentos"}
+            ),
+        )
+        self.data_source = source if isinstance(source, Path) else None
+        self.df_original = None
+        self.is_aggregated = True
+        # Sobre conteos, el paso fusionado equivale a group_by_departamento
+        if aggregation.name == "_group_by_new_departamentos":
+            aggregation = PlanStep("group_by_departamento", aggregation.kwargs)
+        return [aggregation, *steps[position + 1:]]
+
+    def explain(self) -> str:
+        """Plan optimizado que se ejecutará en modo lazy (un paso por línea)."""
+        if self.plan is None:
+            return ""
+        return str(self.plan.optimize(self.target_variable_id))
+
+    @_step
+    def initialize(
+        self, data_source: str | Path | pd.DataFrame, columns: list[str] | None = None
+    ) -> Self:
+        """
+        Carga los datos. Con `columns` solo se usan esas columnas (ej.
+        `required_columns()` si solo se calcularán las tendencias de la variable);
+        por defecto se leen todas, porque pasos como `build_cube` o
+        `estimate_proportions` usan otras columnas. En modo lazy las define el
+        plan a partir de todos sus pasos.
+        """
+        self.is_aggregated = False
+        self.df_original = None
         if isinstance(data_source, pd.DataFrame):
+            if columns:
+                data_source = data_source[[col for col in columns if col in data_source.columns]]
             self.df = data_source
-            self.df_original = self.df.copy()
+            if self.keep_original:
+                self.df_original = self.df.copy()
 
         else:
             if isinstance(data_source, str):
-                self.data_source = Path(data_source)
+                data_source = Path(data_source)
 
             if isinstance(data_source, Path):
-                self.df = self._load_into_memory(data_source)
-                self.df_original = self.df.copy()
+                self.data_source = data_source
+                self.df = self._load_into_memory(data_source, columns=columns)
+                if self.keep_original:
+                    self.df_original = self.df.copy()
 
             else:
                 raise TypeError(
@@ -52,57 +247,216 @@ class EncuestaCleaner:
         self._detect_year()
         return self
 
+    def snapshot(self) -> Self:
+        """Guarda una copia del estado actual en df_original (opcional en modo frugal)."""
+        self.df_original = self.df.copy()
+        return self
+
+    def memory_usage(self) -> pd.DataFrame:
+        """Filas, tamaño de self.df y pico de memoria (bytes) de cada paso con `profile_memory`."""
+        return pd.DataFrame(self.memory_report, columns=["step", "rows", "df_bytes", "peak_bytes"])
+
     def _detect_year(self):
         self.year = int(self.df.loc[0, self.config.year_column])
 
-    def _load_into_memory(self, path: Path):
+    def required_columns(self) -> list[str] | None:
+        """
+        Columnas necesarias para calcular las tendencias de la variable objetivo.
+        Retorna None si aún no se definió la variable (se leen todas las columnas).
+        """
+        if not self.target_variable_id:
+            return None
+        return self.config.required_columns(self.target_variable_id)
+
+    def _resolve_usecols(
+        self, path: Path, columns: list[str] | None
+    ) -> tuple[list[str] | None, dict[str, str] | None]:
+        """Traduce las columnas pedidas a los nombres reales del archivo."""
+        if not columns:
+            return None, None
+        mapping = match_columns(read_column_names(path), columns)
+        return (list(mapping) or None), mapping
+
+    def _use_parallel_read(self, path: Path) -> bool:
+        return (
+            self.read_workers is not None
+            and self.read_workers > 1
+            and path.stat().st_size >= self.parallel_read_min_bytes
+        )
+
+    def _load_into_memory(self, path: Path, columns: list[str] | None = None):
+        """
+        Lee un archivo (.dta, .csv, .sav o .dbf) en un DataFrame.
+
+        Si se pasan `columns`, solo se leen esas columnas del archivo (se
+        toleran diferencias de mayúsculas y de `$`/`_`) y se renombran a los
+        nombres pedidos.
+
+        Si el cleaner tiene una caché de tablas, la tabla parseada se guarda
+        y las siguientes lecturas del mismo archivo (mismo contenido, opciones
+        y columnas) se sirven desde la caché.
+        """
+        path = Path(path)
+        if self.table_cache is None:
+            return self._parse_file(path, columns)
+
+        # Los lectores de .dta/.sav en paralelo (pyreadstat) y secuencial no
+        # garantizan los mismos tipos: cada uno tiene su propia entrada
+        parallel = path.suffix.lower() in (".dta", ".sav", ".zsav") and self._use_parallel_read(path)
+        key = self.table_cache.key(
+            path,
+            engine=self.engine,
+            columns=columns,
+            reader="pyreadstat" if parallel else "default",
+        )
+        df = self.table_cache.get(key)
+        if df is None:
+            df = self._parse_file(path, columns)
+            self.table_cache.put(key, df)
+        return df
+
+    def _parse_file(self, path: Path, columns: list[str] | None = None) -> pd.DataFrame:
         logging.info(f"📖 Reading {path}")
-        if path.suffix == ".dta":
-            df = pd.read_stata(path)
-        elif path.suffix == ".csv":
-            delim = detect_delimiter(path)
-            encoding = detect_encoding(path)
-            print(f"Encoding detectado: {encoding}")
-            df = pd.read_csv(path, encoding=encoding, sep=delim, low_memory=False)
+        usecols, mapping = self._resolve_usecols(path, columns)
+
+        suffix = path.suffix.lower()
+        if suffix in (".dta", ".sav", ".zsav") and self._use_parallel_read(path):
+            df = read_parallel(path, usecols=usecols, workers=self.read_workers)
+        elif suffix == ".dta":
+            df = pd.read_stata(path, columns=usecols)
+        elif suffix == ".csv":
+            dialect = sniff_csv(path)
+            if self.engine == "pyarrow":
+                df = read_csv_arrow(path, dialect, usecols=usecols)
+            else:
+                df = pd.read_csv(
+                    path, **dialect.read_csv_kwargs(), usecols=usecols, low_memory=False
+                )
+        elif suffix in (".sav", ".zsav"):
+            df, _ = read_spss(str(path), usecols=usecols)
+        elif suffix == ".dbf":
+            df = read_dbf(path, usecols=usecols)
+        else:
+            raise ValueError(f"Formato no soportado: {path.suffix}")
         logging.info(f"📖 Finished reading {path}")
 
+        if mapping:
+            df = df.rename(columns=mapping)
+        # El factor se convierte a número una sola vez, al leer (acepta coma decimal)
+        if self.config.factor_column in df.columns:
+            df[self.config.factor_column] = parse_factor(df[self.config.factor_column])
         return df
 
-    def add_departamentos(self) -> Self:
+    def aggregate_in_chunks(
+        self, data_source: str | Path, chunksize: int = 100_000
+    ) -> Self:
+        """
+        Modo streaming: lee el archivo por bloques de `chunksize` filas y
+        acumula conteos (sin factor y con factor) por departamento y categoría.
+
+        Sobre cada bloque se aplican `remove_nas` y `add_departamentos`, por lo
+        que el uso de memoria depende del tamaño del bloque y no del archivo.
+        Después se pueden encadenar `count_categories` o `group_by_departamento`,
+        que producen los mismos resultados que el flujo en memoria.
+        """
+        path = Path(data_source)
+        self.data_source = path
+        self.df_original = None
+        self.year = None
+        if self.plan is not None:
+            self.plan.steps = []
+        usecols, mapping = self._resolve_usecols(path, self.required_columns())
+
+        # La variable y el UBIGEO se leen como texto en todos los bloques; al final
+        # se convierten a número solo si todo el archivo era numérico, igual que
+        # la inferencia de tipos de la lectura completa (enteros con vacíos: float)
+        text_columns = [self.target_variable_id, self.config.ubigeo_column]
+        file_names = {wanted: real for real, wanted in (mapping or {}).items()}
+        dtype = {file_names.get(col, col): str for col in text_columns}
+        if usecols is not None:
+            dtype = {col: kind for col, kind in dtype.items() if col in usecols}
+        numeric, has_nas = True, False
+
+        partials: list[pd.DataFrame] = []
+        for chunk in iter_chunks(path, usecols=usecols, chunksize=chunksize, dtype=dtype):
+            self.df = chunk.rename(columns=mapping) if mapping else chunk
+            if self.year is None:
+                self.df = self.df.reset_index(drop=True)
+                self._detect_year()
+            if numeric and not pd.api.types.is_numeric_dtype(self.df[self.target_variable_id]):
+                values = self.df[self.target_variable_id].dropna()
+                numeric = pd.to_numeric(values, errors="coerce").notna().all()
+            # Antes de remove_nas: los vacíos cambian el tipo que infiere la lectura completa
+            has_nas = has_nas or bool(self.df[self.target_variable_id].isna().any())
+            with self._eager():
+                self.remove_nas().add_departamentos()
+            partials.append(self._partial_counts())
+            # Se combinan los parciales para que la memoria no crezca con el archivo
+            if len(partials) >= 32:
+                partials = [self._combine_partials(partials)]
+
+        self.df = self._combine_partials(partials)
+        if numeric and not pd.api.types.is_numeric_dtype(self.df[self.target_variable_id]):
+            values = pd.to_numeric(self.df[self.target_variable_id])
+            # pandas lee una columna de enteros con vacíos como float (1.0, 2.0, ...)
+            if has_nas and pd.api.types.is_integer_dtype(values):
+                values = values.astype("float64")
+            self.df[self.target_variable_id] = values
+        self.is_aggregated = True
+        return self
+
+    def _partial_counts(self) -> pd.DataFrame:
+        self._parse_factor()
+        keys = ["Departamento", self.target_variable_id]
+        grouped = self.df.groupby(keys, observed=True, dropna=False)
+        partial = grouped[self.config.factor_column].sum().to_frame()
+        partial["count"] = grouped.size()
+        partial = partial.reset_index()
+        # Categorías como valores simples para poder combinar bloques distintos
+        partial[self.target_variable_id] = partial[self.target_variable_id].astype(object)
+        return partial
+
+    def _combine_partials(self, partials: list[pd.DataFrame]) -> pd.DataFrame:
+        keys = ["Departamento", self.target_variable_id]
+        combined = pd.concat(partials, ignore_index=True)
+        combined = combined.groupby(keys, dropna=False, sort=False)[
+            [self.config.factor_column, "count"]
+        ].sum()
+        return combined.reset_index()
+
+    def _departamentos(self) -> pd.Series:
         if not self.encuesta == "enapres":
-            self.df.loc[:, "Departamento"] = (
-                self.df[self.config.ubigeo_column]
-                .astype(str)
-                .apply(
-                    lambda x: ubg.get_departamento(
-                        x, with_lima_metro=True, with_lima_region=True
-                    )
-                )
-            )
-        else:
-            self.df.loc[:, "Departamento"] = (
-                self.df["NOMBREDD"].astype(str).apply(ubg.validate_departamento)
-            )
-            return self
+            # Se resuelve una vez por provincia distinta, no por fila
+            return map_departamentos(self.df[self.config.ubigeo_column])
+        # Validación difusa una vez por escritura distinta (memoizada entre años)
+        return map_nombres(self.df["NOMBREDD"], "departamento")
 
+    @_step
+    def add_departamentos(self) -> Self:
+        self.df["Departamento"] = self._departamentos()
+        return self
+
+    @_step
     def add_provincia(self) -> Self:
         if not self.encuesta == "enapres":
-            self.df.loc[:, "Provincia"] = self.df[self.config.ubigeo_column].astype(str).apply(ubg.get_provincia)
+            self.df["Provincia"] = map_provincias(self.df[self.config.ubigeo_column])
         else:
-            self.df.loc[:, "Provincia"] = (
-            self.df["NOMBREPP"].astype(str).apply(lambda x: ubg.validate_ubicacion(x, on_error='capitalize'))
-        )
+            self.df["Provincia"] = map_nombres(self.df["NOMBREPP"], "provincia")
         return self
 
+    @_step
     def remove_nas(self) -> Self:
         # raise KeyError(f"No se encontró la variable '{self.variable_id}' en las columnas del DataFrame")
-        self.df[self.target_variable_id] = self.df[self.target_variable_id].replace(
-            ["", " ", "nan", "NaN"], pd.NA
-        )
-        self.df[self.target_variable_id] = self.df[self.target_variable_id].astype(
-            "category"
-        )
-        self.df = self.df.dropna(subset=[self.target_variable_id])
+        # Primero a categoría y luego se quitan las categorías vacías: el reemplazo
+        # se hace sobre los valores distintos y no sobre cada fila
+        values = self.df[self.target_variable_id]
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype("category")
+        blanks = [c for c in values.cat.categories if c in ("", " ", "nan", "NaN")]
+        if blanks:
+            values = values.cat.remove_categories(blanks)
+        self.df[self.target_variable_id] = values
+        self.df = self.df[values.notna().to_numpy()]
         return self
         # logging.info(f"Number of rows AFTER preprocessing category: {self.df.shape[0]}")
 
@@ -121,33 +475,67 @@ class EncuestaCleaner:
         #         logging.info([col for col in self.df.columns if col.startswith(self.variable_id[:2])])
         pass
 
+    def _parse_factor(self):
+        # No hace nada si el factor ya es numérico (ej. se convirtió al leer)
+        self.df[self.config.factor_column] = parse_factor(self.df[self.config.factor_column])
+
+    @_step
     def add_factor(self) -> Self:
-        self.df[self.config.factor_column] = (
-            self.df[self.config.factor_column].astype(str).str.replace(",", ".", regex=False)
-        )
-        self.df[self.config.factor_column] = pd.to_numeric(self.df[self.config.factor_column]).copy()
-        self.df = (
-            self.df.groupby(self.target_variable_id)[self.config.factor_column]
-            .sum()
-            .sort_values(ascending=False)
+        if self.is_aggregated:
+            self.df = (
+                self.df.groupby(self.target_variable_id, observed=True)[self.config.factor_column]
+                .sum()
+                .sort_values(ascending=False)
+                .reset_index()
+            )
+            return self
+
+        self._parse_factor()
+        target = self.df[self.target_variable_id]
+        grid = count_grid(target, weights=self.df[self.config.factor_column]).observed()
+        order = np.argsort(-grid.weighted[0], kind="stable")
+        self.df = pd.DataFrame(
+            {
+                self.target_variable_id: labels_like(grid.categories, target)[order],
+                self.config.factor_column: grid.weighted[0][order],
+            }
         )
-        self.df = self.df.reset_index()
         return self
 
     # TODO: Column to convert to percentage is hardcoded
+    @_step
     def count_categories(
         self, with_factor: bool = True, percentage: bool = True
     ) -> Self:
         if with_factor:
             self.add_factor()
+        elif self.is_aggregated:
+            labels = (
+                self.df[self.target_variable_id].astype(str).str.strip().replace({"": np.nan})
+            )
+            counts = (
+                self.df.groupby(labels, dropna=False)["count"]
+                .sum()
+                .sort_values(ascending=False, kind="stable")
+                .to_frame()
+                .reset_index()
+            )
+            counts.columns = [self.target_variable_id, "count"]
+            self.df = counts
         else:
+            # Conteo por código entero; el texto se limpia solo en las categorías
+            target = self.df[self.target_variable_id]
+            grid = count_grid(target)
+            labels = pd.Series(grid.categories.astype(str)).str.strip().replace({"": np.nan})
+            counts = pd.Series(grid.counts[0], index=labels)
+            n_missing = len(target) - int(grid.counts.sum())
+            if n_missing:
+                counts = pd.concat([counts, pd.Series([n_missing], index=["nan"])])
             counts = (
-                self.df[self.target_variable_id]
-                .astype(str)
-                .str.strip()
-                .replace({"": np.nan})
-                .value_counts(dropna=False)
-                .rename("count")
+                counts.groupby(level=0, dropna=False, sort=False)
+                .sum()
+                .loc[lambda c: c > 0]
+                .sort_values(ascending=False, kind="stable")
                 .to_frame()
                 .reset_index()
             )
@@ -162,39 +550,40 @@ class EncuestaCleaner:
         ic(self.df)
         return self
 
+    @_step
     def to_row_percentage(self) -> Self:
-        cat_cols = [c for c in self.df.columns if c not in ["Departamento", self.config.year_column]]
+        cat_cols = [
+            c for c in self.df.columns if c not in ["Departamento", "Año", self.config.year_column]
+        ]
         self.df[cat_cols] = self.df[cat_cols].apply(pd.to_numeric, errors="coerce")
         row_totals = self.df[cat_cols].sum(axis=1)
         # Lo siguiente es como self.df[cat_cols] = self.df[cat_cols] / row_totals * 100 PERO PARA CADA FILA
         self.df[cat_cols] = self.df[cat_cols].div(row_totals, axis=0) * 100
         return self
 
+    @_step
     def filter_by_variable(self) -> Self:
         # self.df = self.df.loc[:, [self.variable_id, "DPTO", "FACTOR"]]
-        self.df = self.df[
-            [self.config.year_column, self.target_variable_id, "DEPARTAMENTO", self.factor_col]
-        ].copy()
+        columns = [self.config.year_column, self.target_variable_id, "Departamento", self.config.factor_column]
+        self.df = self.df[[col for col in columns if col in self.df.columns]]
+        if not self.frugal:
+            self.df = self.df.copy()
         return self
 
+    @_step
     def group_by_departamento(self, with_year=True, with_factor=True) -> Self:
-        self.df[self.target_variable_id] = self.df[self.target_variable_id].astype(
-            "category"
-        )
-        if not with_factor:
-            self.df = (
-                self.df.groupby(by="Departamento")[self.target_variable_id]
-                .value_counts()
-                .unstack()
-                .reset_index()
-            )
-        else:
+        if self.is_aggregated:
+            value_column = self.config.factor_column if with_factor else "count"
+            # Sin factor, las combinaciones sin observaciones son 0 (como en memoria)
             self.df = (
-                self.df.groupby(by=["Departamento", self.target_variable_id])[self.factor_col]
+                self.df.groupby(by=["Departamento", self.target_variable_id], observed=True)[value_column]
                 .sum()
-                .unstack()
+                .unstack(fill_value=None if with_factor else 0)
                 .reset_index()
             )
+            self.df.columns.name = self.target_variable_id
+        else:
+            self._count_by_departamento(self.df["Departamento"], with_factor)
 
         if with_year:
             self.df["Año"] = self.year
@@ -202,6 +591,161 @@ class EncuestaCleaner:
         # self.df.index.name = "DPTO"
         return self
 
+    @_step
+    def _group_by_new_departamentos(self, with_year=True, with_factor=True) -> Self:
+        """
+        `add_departamentos` + `group_by_departamento` fusionados (plan lazy): los
+        departamentos se pasan directo a la agregación sin escribir la columna.
+        """
+        self._count_by_departamento(self._departamentos(), with_factor)
+        if with_year:
+            self.df.insert(1, "Año", self.year)
+        return self
+
+    def _count_by_departamento(self, departamentos: pd.Series, with_factor: bool) -> None:
+        # Una sola pasada con np.bincount sobre la grilla departamento × categoría
+        if with_factor:
+            self._parse_factor()
+        weights = self.df[self.config.factor_column] if with_factor else None
+        grid = count_grid(
+            self.df[self.target_variable_id], groups=departamentos, weights=weights
+        ).observed()
+        if with_factor:
+            # Combinaciones sin observaciones quedan en NaN (como en unstack)
+            values = np.where(grid.counts > 0, grid.weighted, np.nan)
+        else:
+            values = grid.counts
+        self.df = pd.DataFrame(
+            values, columns=pd.Index(grid.categories, name=self.target_variable_id)
+        )
+        self.df.insert(0, "Departamento", labels_like(grid.groups, departamentos))
+
+    def estimate_proportions(
+        self,
+        variables: list[str] | None = None,
+        by: str | None = "Departamento",
+        level: float = 0.95,
+        cv_max: float = 15.0,
+        method: Literal["taylor", "bootstrap"] = "taylor",
+        replicates: int = 200,
+        seed: int | None = None,
+        workers: int | None = None,
+    ) -> Self:
+        """
+        Reemplaza self.df por las proporciones (%) de cada categoría con su error
+        estándar (linealización de Taylor con el estrato y conglomerado de la
+        configuración), intervalo de confianza, CV y marca de estimación referencial.
+
+        Se debe llamar sobre los microdatos (ej. después de `add_departamentos`).
+        Por defecto se estima la variable objetivo; `variables` permite estimar
+        varias a la vez. Con `by=None` se estima a nivel nacional. Con
+        `method="bootstrap"` la varianza sale de `replicates` réplicas Rao-Wu
+        (ver BootstrapReplicates), evaluadas en `workers` procesos.
+        """
+        variables = variables or [self.target_variable_id]
+        self.df = estimate_proportions(
+            self.df,
+            variables,
+            self.config,
+            by=by,
+            level=level,
+            cv_max=cv_max,
+            method=method,
+            replicates=replicates,
+            seed=seed,
+            workers=workers,
+        )
+        return self
+
+    def distribution(
+        self,
+        value_column: str,
+        by: list[str] | None = ("Departamento",),
+        members_column: str | None = None,
+        quantiles: tuple[float, ...] = (0.1, 0.25, 0.5, 0.75, 0.9),
+    ) -> Self:
+        """
+        Reemplaza self.df por estadísticas de distribución ponderadas de
+        `value_column` por grupo: media, cuantiles, Gini, Theil y participación
+        por decil (ver `distribution_stats`). Pensado para la Sumaria de Enaho,
+        con `members_column="MIEPERHO"` para obtener resultados por persona.
+        """
+        self.df = distribution_stats(
+            self.df,
+            value_column,
+            self.config.factor_column,
+            by=list(by or []),
+            members_column=members_column,
+            quantiles=quantiles,
+        )
+        return self
+
+    def poverty_indicators(
+        self,
+        groupings: list[list[str]] | None = None,
+        value_column: str = "GASHOG2D",
+        line_column: str = "LINEA",
+        members_column: str | None = "MIEPERHO",
+        per_capita: bool = True,
+        level: float = 0.95,
+    ) -> Self:
+        """
+        Reemplaza self.df por los indicadores FGT0/1/2 (con errores estándar de
+        diseño) de cada agrupación, ej. `[[], ["Departamento"]]` para el total y
+        por departamento. Ver `poverty_indicators`.
+        """
+        self.df = poverty_indicators(
+            self.df,
+            self.config,
+            groupings=groupings,
+            value_column=value_column,
+            line_column=line_column,
+            members_column=members_column,
+            per_capita=per_capita,
+            level=level,
+        )
+        return self
+
+    def rollup(
+        self,
+        levels: tuple[str, ...] = ("nacional", "departamento", "provincia", "distrito"),
+        with_factor: bool = True,
+        names: bool = True,
+    ) -> Self:
+        """
+        Reemplaza self.df por la distribución de la variable objetivo en cada
+        nivel geográfico (nacional, departamento, provincia, distrito), derivados
+        de una sola agregación por distrito. Ver `geographic_rollup`.
+        """
+        self.df = geographic_rollup(
+            self.df,
+            self.target_variable_id,
+            self.config,
+            levels=levels,
+            with_factor=with_factor,
+            names=names,
+        )
+        return self
+
+    def build_cube(
+        self,
+        dimensions: list[str],
+        bins: dict[str, list[float]] | None = None,
+    ) -> IndicatorCube:
+        """
+        Cubo de la variable objetivo por varias dimensiones a la vez (ej.
+        ["Departamento", "AREA", "P207", "EDAD"]), construido con una sola
+        agregación ponderada. Los cortes y combinaciones se obtienen del cubo
+        sin volver a los microdatos (ver `IndicatorCube`).
+        """
+        return IndicatorCube.build(
+            self.df,
+            self.target_variable_id,
+            dimensions,
+            weight_column=self.config.factor_column,
+            bins=bins,
+        )
+
     def filter_by_departamento(self, dep: str) -> Self:
         dep = ubg.validate_departamento(dep, normalize=True)
         self.df = self.df.query(f"DPTO == '{dep}'")
@@ -216,7 +760,8 @@ class EncuestaCleaner:
     #     return self.df
 
     def get_df(self) -> pd.DataFrame:
-        return self.df
+        # En modo lazy, acá se ejecuta el plan
+        return self.collect().df
 
 # TODO: Probar lo de detect year si no funciona
 # class EnahoCleaner(EncuestaCleaner):
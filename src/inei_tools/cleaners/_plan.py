@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field, replace
+from ..configs.encuesta_config import EncuestaConfig
+
+# Pasos que agregan un mapeo por fila y la columna que producen
+MAPPINGS = {"add_departamentos": "Departamento", "add_provincia": "Provincia"}
+# Pasos que reducen los microdatos a una tabla agregada
+AGGREGATIONS = {"add_factor", "count_categories", "group_by_departamento", "_group_by_new_departamentos"}
+# Pasos por fila que un filtro puede adelantar sin cambiar el resultado
+ROW_WISE = {*MAPPINGS, "filter_by_variable"}
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """Llamada diferida a un paso del cleaner (argumentos ya resueltos por nombre)."""
+
+    name: str
+    kwargs: dict = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        args = ", ".join(
+            f"{key}={value!r}" for key, value in self.kwargs.items() if key != "data_source"
+        )
+        return f"{self.name}({args})"
+
+
+class QueryPlan:
+    """
+    Plan lógico de una cadena de pasos de `EncuestaCleaner` en modo lazy.
+
+    Los pasos se registran sin ejecutarse; `optimize` reescribe el plan antes de
+    correrlo una sola vez:
+
+    1. Los filtros de filas (`remove_nas`) se adelantan a los mapeos, que así
+       solo se calculan sobre las filas que quedan.
+    2. Se eliminan los pasos cuyo resultado no llega a la agregación final
+       (ej. `add_departamentos` antes de `count_categories`, o la proyección
+       de `filter_by_variable` antes de agregar).
+    3. `add_departamentos` seguido de `group_by_departamento` se fusiona en un
+       paso que agrega directamente sobre los departamentos, sin escribir la
+       columna en los microdatos.
+    4. Las columnas que realmente usa el plan se pasan al lector de
+       `initialize`, que solo lee esas columnas.
+
+    Parameters
+    ----------
+    config : EncuestaConfig
+        Configuración de la encuesta (nombres de año, factor y UBIGEO).
+    enapres : bool, default False
+        Si True, los departamentos se obtienen de NOMBREDD/NOMBREPP y no del UBIGEO.
+    steps : list[PlanStep], optional
+        Pasos ya registrados.
+    """
+
+    def __init__(
+        self, config: EncuestaConfig, enapres: bool = False, steps: list[PlanStep] | None = None
+    ):
+        self.config = config
+        self.enapres = enapres
+        self.steps: list[PlanStep] = list(steps or [])
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __str__(self) -> str:
+        return "\n".join(f"{i}. {step}" for i, step in enumerate(self.steps, start=1))
+
+    def add(self, name: str, kwargs: dict) -> None:
+        # initialize empieza un plan nuevo (reemplaza los datos)
+        if name == "initialize":
+            self.steps = []
+        self.steps.append(PlanStep(name, kwargs))
+
+    def inputs(self, step: PlanStep, target: str) -> set[str]:
+        """Columnas de los microdatos que lee un paso."""
+        factor = {self.config.factor_column} if step.kwargs.get("with_factor", True) else set()
+        if step.name == "remove_nas":
+            return {target}
+        if step.name == "add_departamentos":
+            return {"NOMBREDD"} if self.enapres else {self.config.ubigeo_column}
+        if step.name == "add_provincia":
+            return {"NOMBREPP"} if self.enapres else {self.config.ubigeo_column}
+        if step.name in ("add_factor", "count_categories"):
+            return {target} | factor
+        if step.name == "group_by_departamento":
+            return {"Departamento", target} | factor
+        if step.name == "_group_by_new_departamentos":
+            return self.inputs(PlanStep("add_departamentos"), target) | {target} | factor
+        if step.name == "filter_by_variable":
+            return {self.config.year_column, target, "Departamento", self.config.factor_column}
+        return set()
+
+    def optimize(self, target: str) -> "QueryPlan":
+        """Plan reescrito (ver la descripción de la clase); solo si empieza con `initialize`."""
+        steps = list(self.steps)
+        if not steps or steps[0].name != "initialize":
+            return QueryPlan(self.config, self.enapres, steps)
+
+        steps = self._filters_first(steps)
+        steps = self._drop_unused(steps, target)
+        steps = self._fuse(steps)
+        columns = self._pushdown(steps, target)
+        if columns is not None:
+            steps[0] = replace(steps[0], kwargs={**steps[0].kwargs, "columns": columns})
+        return QueryPlan(self.config, self.enapres, steps)
+
+    @staticmethod
+    def _filters_first(steps: list[PlanStep]) -> list[PlanStep]:
+        steps = list(steps)
+        for i in range(1, len(steps)):
+            j = i
+            while j > 0 and steps[j].name == "remove_nas" and steps[j - 1].name in ROW_WISE:
+                steps[j - 1], steps[j] = steps[j], steps[j - 1]
+                j -= 1
+        return steps
+
+    def _drop_unused(self, steps: list[PlanStep], target: str) -> list[PlanStep]:
+        # Se recorre desde el final: `consumed` son las columnas que leen los
+        # pasos siguientes hasta la próxima agregación
+        kept, consumed, aggregated = [], set(), False
+        for step in reversed(steps):
+            if aggregated and step.name == "filter_by_variable":
+                continue
+            if aggregated and step.name in MAPPINGS and MAPPINGS[step.name] not in consumed:
+                continue
+            if step.name in AGGREGATIONS:
+                aggregated, consumed = True, self.inputs(step, target)
+            else:
+                consumed |= self.inputs(step, target)
+            kept.append(step)
+        return kept[::-1]
+
+    @staticmethod
+    def _fuse(steps: list[PlanStep]) -> list[PlanStep]:
+        fused = []
+        for step in steps:
+            previous = fused[-1].name if fused else None
+            if step.name == "group_by_departamento" and previous == "add_departamentos":
+                fused[-1] = PlanStep("_group_by_new_departamentos", step.kwargs)
+            else:
+                fused.append(step)
+        return fused
+
+    def _pushdown(self, steps: list[PlanStep], target: str) -> list[str] | None:
+        # `live` son las columnas necesarias antes de cada paso (None = todas)
+        live: set[str] | None = None
+        for step in reversed(steps[1:]):
+            inputs = self.inputs(step, target)
+            if step.name in AGGREGATIONS:
+                live = inputs
+            elif step.name == "filter_by_variable":
+                live = inputs if live is None else live & inputs
+            elif step.name in MAPPINGS:
+                if live is not None:
+                    live = (live - {MAPPINGS[step.name]}) | inputs
+            elif step.name == "remove_nas":
+                if live is not None:
+                    live |= inputs
+            else:
+                live = None
+        if live is None:
+            return None
+        live -= set(MAPPINGS.values())
+        return list(dict.fromkeys([self.config.year_column, *sorted(live)]))
@@ -0,0 +1,169 @@
+from pathlib import Path
+from typing import Callable
+import pandas as pd
+from ._ubigeo import map_departamentos, map_nombres
+from ..configs.encuesta_config import EncuestaConfig
+from ..utils import sniff_csv
+from ..utils.columns import match_columns, read_column_names
+
+# Valores que `remove_nas` trata como vacíos
+BLANKS = ["", " ", "nan", "NaN"]
+
+
+def import_polars():
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError(
+            "engine='polars' requiere polars; instálalo con `pip install polars`"
+        ) from e
+    return pl
+
+
+def _from_pandas(df: pd.DataFrame):
+    """
+    LazyFrame desde pandas conservando el orden de las categorías (etiquetas de
+    .dta/.sav): las columnas categóricas de texto pasan a `pl.Enum`.
+    """
+    pl = import_polars()
+    frame = pl.from_pandas(df)
+    enums = {
+        col: pl.Enum(list(df[col].cat.categories))
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+        and all(isinstance(c, str) for c in df[col].cat.categories)
+    }
+    return frame.cast(enums).lazy() if enums else frame.lazy()
+
+
+def scan(
+    source: Path | pd.DataFrame,
+    columns: list[str],
+    read_pandas: Callable[[Path, list[str]], pd.DataFrame],
+):
+    """
+    LazyFrame de Polars con solo `columns` (renombradas a los nombres pedidos).
+
+    CSV en UTF-8 y Parquet se escanean en streaming; los CSV en otro encoding
+    se leen con el lector multihilo de Polars (scan_csv solo acepta UTF-8) y
+    los .dta/.sav/.dbf con el lector de pandas del cleaner (`read_pandas`).
+    """
+    pl = import_polars()
+    if isinstance(source, pd.DataFrame):
+        return _from_pandas(source[[col for col in columns if col in source.columns]])
+
+    path = Path(source)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        frame = pl.scan_parquet(path)
+        mapping = match_columns(frame.collect_schema().names(), columns)
+    elif suffix == ".csv":
+        dialect = sniff_csv(path)
+        mapping = match_columns(read_column_names(path), columns)
+        options = dict(
+            separator=dialect.delimiter,
+            quote_char=dialect.quotechar,
+            skip_rows=dialect.header,
+            decimal_comma=dialect.decimal == ",",
+            infer_schema_length=10_000,
+        )
+        if dialect.encoding.lower().replace("-", "") in ("utf8", "ascii"):
+            frame = pl.scan_csv(path, **options)
+        else:
+            frame = pl.read_csv(
+                path, encoding=dialect.encoding, columns=list(mapping), **options
+            ).lazy()
+    else:
+        return _from_pandas(read_pandas(path, columns))
+    return frame.select(list(mapping)).rename(mapping)
+
+
+def _departamentos(encuesta: str):
+    pl = import_polars()
+
+    def mapper(batch):
+        # Cada bloque se resuelve por valor distinto con las tablas memoizadas de _ubigeo
+        series = batch.to_pandas()
+        if encuesta == "enapres":
+            mapped = map_nombres(series, "departamento")
+        else:
+            mapped = map_departamentos(series)
+        return pl.from_pandas(mapped).cast(pl.String)
+
+    return mapper
+
+
+def aggregate(
+    frame,
+    target: str,
+    config: EncuestaConfig,
+    encuesta: str,
+    remove_nas: bool = True,
+    departamentos: bool = False,
+) -> tuple[pd.DataFrame, int]:
+    """
+    Conteos y suma del factor por (Departamento,) categoría en una sola consulta
+    lazy de Polars (multihilo, en streaming cuando el origen lo permite).
+
+    Retorna el mismo formato que `EncuestaCleaner.aggregate_in_chunks`
+    (columnas Departamento, variable, factor y "count") y el año del archivo.
+    """
+    pl = import_polars()
+    schema = frame.collect_schema()
+    categories = None
+    if isinstance(schema[target], (pl.Categorical, pl.Enum)):
+        # Las etiquetas de .dta/.sav se filtran y agrupan como texto; al final se
+        # vuelve a categoría con el orden de origen, como en el flujo de pandas
+        if isinstance(schema[target], pl.Enum):
+            categories = list(schema[target].categories)
+        frame = frame.with_columns(pl.col(target).cast(pl.String))
+        schema = frame.collect_schema()
+    values = pl.col(target)
+    # La proyección omite el factor cuando ningún paso lo usa
+    # (ej. count_categories(with_factor=False))
+    sums = []
+    if config.factor_column in schema:
+        factor = pl.col(config.factor_column)
+        if schema[config.factor_column] == pl.String:
+            factor = factor.str.replace(",", ".", literal=True)
+        sums = [factor.cast(pl.Float64, strict=False).sum().alias(config.factor_column)]
+
+    keys = [target]
+    if departamentos:
+        source = "NOMBREDD" if encuesta == "enapres" else config.ubigeo_column
+        frame = frame.with_columns(
+            pl.col(source)
+            .map_batches(_departamentos(encuesta), return_dtype=pl.String, is_elementwise=True)
+            .alias("Departamento")
+        )
+        keys = ["Departamento", target]
+
+    keep = pl.lit(True)
+    if remove_nas:
+        keep = values.is_not_null()
+        if schema[target] == pl.String:
+            keep = keep & ~values.is_in(BLANKS)
+
+    counts, year, nulls = pl.collect_all(
+        [
+            frame.filter(keep)
+            .group_by(keys)
+            .agg(*sums, pl.len().alias("count"))
+            .sort(keys),
+            frame.select(pl.col(config.year_column).first()),
+            frame.select(values.is_null().sum()),
+        ]
+    )
+    df = counts.to_pandas()
+    if categories is not None:
+        if remove_nas:
+            categories = [c for c in categories if c not in BLANKS]
+        df[target] = pd.Categorical(df[target], categories=categories)
+    if departamentos:
+        # Mismo tipo que `map_departamentos` (categorías en orden alfabético)
+        names = pd.Index(sorted(df["Departamento"].dropna().unique()), dtype=object)
+        df["Departamento"] = pd.Categorical(df["Departamento"], categories=names)
+    # pandas lee una columna de enteros con vacíos como float (1.0, 2.0, ...)
+    if schema[target].is_integer() and nulls.item():
+        df[target] = df[target].astype("float64")
+    return df, int(year.item())
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+from ._aggregation import group_codes, parse_factor, pooled_columns
+from ._design import SurveyDesign, z_value
+from ..configs.encuesta_config import EncuestaConfig
+
+FGT_INDICATORS = ("fgt0", "fgt1", "fgt2")
+
+
+def poverty_indicators(
+    data: pd.DataFrame | list[pd.DataFrame],
+    config: EncuestaConfig,
+    groupings: list[list[str]] | None = None,
+    value_column: str = "GASHOG2D",
+    line_column: str = "LINEA",
+    members_column: str | None = "MIEPERHO",
+    per_capita: bool = True,
+    level: float = 0.95,
+) -> pd.DataFrame:
+    """
+    Indicadores de pobreza FGT (incidencia, brecha y severidad) con errores
+    estándar de diseño, para varias agrupaciones a la vez.
+
+    Los microdatos se recorren una sola vez: se suman pesos e indicadores por
+    celda más fina (combinación de todas las columnas de agrupación) y
+    conglomerado. Cada agrupación se obtiene sumando esas celdas, incluida la
+    varianza de linealización de Taylor de cada razón.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | list[pd.DataFrame]
+        Sumaria de Enaho (o equivalente). Con una lista (ej. años combinados)
+        solo se unen las columnas usadas y cada DataFrame se trata como una
+        muestra independiente (sus estratos no se mezclan).
+    config : EncuestaConfig
+        Nombres del factor, estrato y conglomerado.
+    groupings : list[list[str]], optional
+        Agrupaciones a calcular, ej. [[], ["AÑO"], ["AÑO", "Departamento"]].
+        La lista vacía es el total. Por defecto solo el total.
+    value_column : str, default "GASHOG2D"
+        Gasto (o ingreso) del hogar.
+    line_column : str, default "LINEA"
+        Línea de pobreza mensual per cápita.
+    members_column : str, optional, default "MIEPERHO"
+        Miembros del hogar: el factor se multiplica por esta columna para que
+        los indicadores sean de personas.
+    per_capita : bool, default True
+        Si True, `value_column` es anual del hogar y se convierte a mensual per
+        cápita (÷ 12 · miembros) antes de compararlo con la línea.
+    level : float, default 0.95
+        Nivel de confianza de los intervalos.
+
+    Returns
+    -------
+    pd.DataFrame
+        Una fila por agrupación, grupo e indicador (fgt0, fgt1, fgt2), con n,
+        poblacion, estimado (%), error_estandar, ic_inferior, ic_superior y cv.
+    """
+    groupings = [list(grouping) for grouping in (groupings or [[]])]
+    keys = list(dict.fromkeys(col for grouping in groupings for col in grouping))
+    pooled = not isinstance(data, pd.DataFrame) and len(data) > 1
+    pool_column = "_muestra" if pooled else None
+    df = pooled_columns(
+        data,
+        [
+            *keys, value_column, line_column, members_column,
+            config.factor_column, config.strata_column, config.psu_column,
+        ],
+        source_column=pool_column,
+    )
+
+    members = parse_factor(df[members_column]).to_numpy(np.float64) if members_column else 1.0
+    weights = np.nan_to_num(parse_factor(df[config.factor_column]).to_numpy(np.float64) * members)
+    value = pd.to_numeric(df[value_column], errors="coerce").to_numpy(np.float64)
+    if per_capita:
+        value = value / (12 * members)
+    line = pd.to_numeric(df[line_column], errors="coerce").to_numpy(np.float64)
+
+    # FGT_a = (1 - y/z)^a para los pobres (y < z), 0 para el resto
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = np.where(value < line, 1 - value / line, 0.0)
+    fgt = np.stack([(value < line).astype(np.float64), gap, gap**2], axis=1)
+
+    design = SurveyDesign.from_frame(df, config, weights=weights, pool_column=pool_column)
+    cell_codes, cell_labels = group_codes(df, keys)
+    valid = (cell_codes >= 0) & np.isfinite(value) & np.isfinite(line) & (weights > 0)
+
+    # Única pasada por los microdatos: totales por (celda más fina, UPM)
+    n_psu = design.n_psu
+    pairs, pair_index = np.unique(
+        cell_codes[valid] * n_psu + design.psu[valid], return_inverse=True
+    )
+    pair_weight = np.bincount(pair_index, weights[valid])
+    pair_count = np.bincount(pair_index)
+    pair_fgt = np.stack(
+        [np.bincount(pair_index, weights[valid] * fgt[valid, k]) for k in range(3)], axis=1
+    )
+    pair_cell, pair_psu = pairs // n_psu, pairs % n_psu
+    cells = cell_labels.to_frame(index=False) if keys else pd.DataFrame(index=range(1))
+
+    z = z_value(level)
+    tables = []
+    for grouping in groupings:
+        codes, labels = group_codes(cells, grouping)
+        n_groups = len(labels)
+        pair_group = codes[pair_cell]
+
+        population = np.bincount(pair_group, pair_weight, minlength=n_groups)
+        counts = np.bincount(pair_group, pair_count, minlength=n_groups).astype(np.int64)
+        totals = np.stack(
+            [np.bincount(pair_group, pair_fgt[:, k], minlength=n_groups) for k in range(3)],
+            axis=1,
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            estimate = totals / population[:, None]
+
+        # Totales por (grupo, UPM) de la variable linealizada de cada razón
+        group_pairs, group_index = np.unique(pair_group * n_psu + pair_psu, return_inverse=True)
+        groups, psu = group_pairs // n_psu, group_pairs % n_psu
+        weight_psu = np.bincount(group_index, pair_weight)
+        fgt_psu = np.stack(
+            [np.bincount(group_index, pair_fgt[:, k]) for k in range(3)], axis=1
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lin = (fgt_psu - estimate[groups] * weight_psu[:, None]) / population[groups, None]
+            se = np.sqrt(design.domain_variance(groups, psu, lin, n_groups))
+            cv = se / estimate * 100
+
+        table = pd.DataFrame(
+            {
+                "nivel": " × ".join(grouping) or "Total",
+                "indicador": np.tile(FGT_INDICATORS, n_groups),
+                "n": np.repeat(counts, 3),
+                "poblacion": np.repeat(population, 3),
+                "estimado": estimate.ravel() * 100,
+                "error_estandar": se.ravel() * 100,
+                "cv": cv.ravel(),
+            }
+        )
+        if grouping:
+            key_values = labels.to_frame(index=False)
+            for col in grouping:
+                table[col] = np.repeat(key_values[col].to_numpy(), 3)
+        table["ic_inferior"] = table["estimado"] - z * table["error_estandar"]
+        table["ic_superior"] = table["estimado"] + z * table["error_estandar"]
+        tables.append(table)
+
+    columns = [
+        "nivel", *keys, "indicador", "n", "poblacion", "estimado", "error_estandar",
+        "ic_inferior", "ic_superior", "cv",
+    ]
+    return pd.concat(tables, ignore_index=True).reindex(columns=columns)
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+from ._aggregation import count_grid, parse_factor
+from ._design import clean_categories
+from ._ubigeo import LIMA_METROPOLITANA, map_departamentos, nombre_ubigeo, normalize_ubigeo
+from ..configs.encuesta_config import EncuestaConfig
+
+# Largo del prefijo de UBIGEO que identifica cada nivel (en "departamento",
+# Lima Metropolitana usa su provincia: ver `_unit_code`)
+ROLLUP_LEVELS = {"nacional": 0, "departamento": 2, "provincia": 4, "distrito": 6}
+
+
+def _distritos(ubigeos: pd.Series) -> pd.Series:
+    """UBIGEO de 6 dígitos de cada fila como categoría ordenada (normaliza cada valor distinto)."""
+    row_codes, uniques = pd.factorize(ubigeos, use_na_sentinel=True)
+    normalized = pd.Series([normalize_ubigeo(value) for value in uniques], dtype=object)
+    label_codes, labels = pd.factorize(normalized, sort=True, use_na_sentinel=True)
+    label_codes = np.append(label_codes, -1)  # posición extra para los NA de la fila
+    return pd.Series(
+        pd.Categorical.from_codes(label_codes.take(row_codes), categories=labels),
+        index=ubigeos.index,
+    )
+
+
+def _unit_code(code: str, level: str) -> str:
+    """
+    Prefijo de la unidad de un distrito. Los departamentos son los de
+    `map_departamentos`: Lima Metropolitana ("1501") y Lima Región ("15").
+    """
+    if level == "departamento" and code.startswith(LIMA_METROPOLITANA):
+        return LIMA_METROPOLITANA
+    return code[:ROLLUP_LEVELS[level]]
+
+
+def geographic_rollup(
+    df: pd.DataFrame,
+    variable: str,
+    config: EncuestaConfig,
+    levels: tuple[str, ...] = ("nacional", "departamento", "provincia", "distrito"),
+    with_factor: bool = True,
+    names: bool = True,
+) -> pd.DataFrame:
+    """
+    Distribución de `variable` en varios niveles geográficos a partir de una
+    sola agregación por distrito.
+
+    Los conteos (y sumas de factor) se calculan una vez por distrito × categoría;
+    como los distritos quedan ordenados por UBIGEO, cada provincia (4 dígitos)
+    y departamento (2 dígitos; Lima Metropolitana y Lima Región por separado,
+    como en `map_departamentos`) es un bloque contiguo y sus totales salen de
+    sumar esos bloques (`np.add.reduceat`), sin volver a los microdatos.
+
+    Requiere la columna UBIGEO de 6 dígitos (no aplica a Enapres, que solo
+    tiene nombres de departamento y provincia).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Microdatos con la columna UBIGEO, el factor y la variable.
+    variable : str
+        Variable categórica a distribuir.
+    config : EncuestaConfig
+        Configuración de la encuesta (UBIGEO y factor).
+    levels : tuple[str, ...]
+        Niveles a retornar: "nacional", "departamento", "provincia" y/o "distrito".
+    with_factor : bool, default True
+        Si True, los porcentajes usan el factor de expansión.
+    names : bool, default True
+        Si True, agrega el nombre de cada unidad (se busca una vez por código).
+
+    Returns
+    -------
+    pd.DataFrame
+        Columnas: nivel, ubigeo, nombre, `variable`, n, total y porcentaje
+        (respecto del total de la unidad geográfica).
+    """
+    unknown = set(levels) - set(ROLLUP_LEVELS)
+    if unknown:
+        raise ValueError(f"Niveles no válidos: {sorted(unknown)}. Use {list(ROLLUP_LEVELS)}")
+
+    weights = parse_factor(df[config.factor_column]) if with_factor else None
+    distritos = _distritos(df[config.ubigeo_column])
+    grid = count_grid(clean_categories(df[variable]), groups=distritos, weights=weights).observed()
+    values = grid.weighted if with_factor else grid.counts.astype(np.float64)
+    codes = np.asarray(grid.groups, dtype=str)
+    n_cat = len(grid.categories)
+
+    tables = []
+    for level in levels:
+        length = ROLLUP_LEVELS[level]
+        prefixes = np.array([_unit_code(code, level) for code in codes], dtype=object)
+        if not len(prefixes):
+            continue
+        starts = np.flatnonzero(np.r_[True, prefixes[1:] != prefixes[:-1]])
+        totals = np.add.reduceat(values, starts, axis=0)
+        counts = np.add.reduceat(grid.counts, starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = totals / totals.sum(axis=1, keepdims=True) * 100
+
+        units = prefixes[starts] if length else np.array([None], dtype=object)
+        table = pd.DataFrame(
+            {
+                "nivel": level,
+                "ubigeo": np.repeat(units, n_cat),
+                variable: np.tile(np.asarray(grid.categories, dtype=object), len(units)),
+                "n": counts.ravel(),
+                "total": totals.ravel(),
+                "porcentaje": shares.ravel(),
+            }
+        )
+        if names and level == "departamento":
+            # Mismos nombres que `map_departamentos` (tabla por prefijo de provincia)
+            first_distritos = pd.Series(codes[starts], dtype=object)
+            unit_names = list(map_departamentos(first_distritos).astype(object))
+        elif names:
+            unit_names = [nombre_ubigeo(code) if code else "Nacional" for code in units]
+        if names:
+            table.insert(2, "nombre", np.repeat(np.array(unit_names, dtype=object), n_cat))
+        tables.append(table)
+
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,173 @@
+import logging
+from contextlib import closing
+from typing import Callable, Literal
+import numpy as np
+import pandas as pd
+import ubigeos_peru as ubg
+from ..utils.cache import connect_cache
+
+# Tablas de búsqueda por prefijo de UBIGEO (4 dígitos = provincia).
+# El departamento también se resuelve por provincia porque Lima Metropolitana
+# (1501) y Lima Región (resto de 15xx) se separan.
+# Se llenan a demanda y se reutilizan entre años y archivos.
+_DEPARTAMENTOS: dict[str, str] = {}
+# Provincia que forma el departamento "Lima Metropolitana"
+LIMA_METROPOLITANA = "1501"
+_PROVINCIAS: dict[str, str] = {}
+
+# Nombres escritos a mano (NOMBREDD/NOMBREPP de Enapres) -> nombre validado.
+# Se guardan en la caché persistente para no repetir la validación difusa.
+_NOMBRES: dict[str, dict[str, str]] = {}
+
+
+def normalize_ubigeo(value) -> str | None:
+    """Convierte 10101, 10101.0, '10101' o '010101' en '010101' (None si está vacío)."""
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, (float, np.floating)) and np.isnan(value):
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return f"{int(value):06d}"
+    text = str(value).strip()
+    if not text or text.lower() == "nan":
+        return None
+    if text.endswith(".0"):
+        text = text[:-2]
+    return text.zfill(6)
+
+
+def _departamento(code: str) -> str:
+    return ubg.get_departamento(code, with_lima_metro=True, with_lima_region=True)
+
+
+def _provincia(code: str) -> str:
+    return ubg.get_provincia(code)
+
+
+def nombre_ubigeo(code: str) -> str | None:
+    """
+    Nombre de un código UBIGEO según su largo: 2 dígitos = departamento,
+    4 = provincia y 6 = distrito. Retorna None si el código no existe.
+    """
+    resolvers = {2: ubg.get_departamento, 4: ubg.get_provincia, 6: ubg.get_distrito}
+    try:
+        return resolvers[len(code)](code)
+    except Exception as e:
+        logging.debug(f"No se encontró el UBIGEO {code}: {e}")
+        return None
+
+
+def _map_distinct(
+    series: pd.Series, resolve_uniques: Callable[[np.ndarray], list[str | None]]
+) -> pd.Categorical:
+    # 1) Códigos por fila (enteros) y valores distintos
+    row_codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    # 2) Resolver en Python solo los valores distintos
+    labels = resolve_uniques(np.asarray(uniques, dtype=object))
+
+    # 3) Valor distinto -> categoría y luego `take` sobre los códigos de fila.
+    # Categorías en orden alfabético: el orden de los grupos no depende de qué filas
+    # aparecen primero (ni de qué filas se descartan antes de agrupar)
+    label_codes, categories = pd.factorize(
+        pd.Series(labels, dtype=object), sort=True, use_na_sentinel=True
+    )
+    label_codes = np.append(label_codes, -1)  # posición extra para los NA de la fila
+    return pd.Categorical.from_codes(
+        label_codes.take(row_codes), categories=pd.Index(categories, dtype=object)
+    )
+
+
+def _map_by_prefix(
+    series: pd.Series, table: dict[str, str], resolver: Callable[[str], str]
+) -> pd.Categorical:
+    def resolve_uniques(uniques: np.ndarray) -> list[str | None]:
+        labels = []
+        for value in uniques:
+            code = normalize_ubigeo(value)
+            if code is None:
+                labels.append(None)
+                continue
+            # Solo se llama a ubigeos_peru para prefijos que aún no están en la tabla
+            prefix = code[:4]
+            if prefix not in table:
+                table[prefix] = resolver(code)
+            labels.append(table[prefix])
+        return labels
+
+    return _map_distinct(series, resolve_uniques)
+
+
+def map_departamentos(series: pd.Series) -> pd.Series:
+    """Departamento (con Lima Metropolitana y Lima Región) de cada UBIGEO, como categoría."""
+    return pd.Series(
+        _map_by_prefix(series, _DEPARTAMENTOS, _departamento), index=series.index
+    )
+
+
+def map_provincias(series: pd.Series) -> pd.Series:
+    """Provincia de cada UBIGEO, como categoría."""
+    return pd.Series(_map_by_prefix(series, _PROVINCIAS, _provincia), index=series.index)
+
+
+def _validate_nombre(raw: str, kind: Literal["departamento", "provincia"]) -> str:
+    if kind == "departamento":
+        return ubg.validate_departamento(raw)
+    return ubg.validate_ubicacion(raw, on_error="capitalize")
+
+
+def _load_nombres(kind: str) -> dict[str, str]:
+    if kind not in _NOMBRES:
+        _NOMBRES[kind] = {}
+        try:
+            with closing(connect_cache()) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS nombres_ubicacion ("
+                    "kind TEXT, raw TEXT, normalized TEXT, PRIMARY KEY (kind, raw))"
+                )
+                rows = conn.execute(
+                    "SELECT raw, normalized FROM nombres_ubicacion WHERE kind = ?", (kind,)
+                ).fetchall()
+            _NOMBRES[kind].update(rows)
+        except Exception as e:
+            logging.debug(f"No se pudo leer la tabla de nombres normalizados: {e}")
+    return _NOMBRES[kind]
+
+
+def _save_nombres(kind: str, new_rows: list[tuple[str, str]]) -> None:
+    try:
+        with closing(connect_cache()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO nombres_ubicacion VALUES (?, ?, ?)",
+                [(kind, raw, normalized) for raw, normalized in new_rows],
+            )
+    except Exception as e:
+        logging.debug(f"No se pudo guardar la tabla de nombres normalizados: {e}")
+
+
+def map_nombres(
+    series: pd.Series, kind: Literal["departamento", "provincia"]
+) -> pd.Series:
+    """
+    Valida nombres de ubicación escritos a mano (ej. NOMBREDD, NOMBREPP de Enapres)
+    una sola vez por escritura distinta y retorna el resultado como categoría.
+
+    Las validaciones se guardan en una tabla persistente, así que los mismos
+    nombres en otros años o archivos no se vuelven a validar.
+    """
+    table = _load_nombres(kind)
+
+    def resolve_uniques(uniques: np.ndarray) -> list[str | None]:
+        labels = []
+        new_rows = []
+        for value in uniques:
+            raw = str(value)
+            if raw not in table:
+                table[raw] = _validate_nombre(raw, kind)
+                new_rows.append((raw, table[raw]))
+            labels.append(table[raw])
+        if new_rows:
+            _save_nombres(kind, new_rows)
+        return labels
+
+    return pd.Series(_map_distinct(series, resolve_uniques), index=series.index)
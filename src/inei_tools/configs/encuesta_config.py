@@ -1,4 +1,3 @@
-
 from abc import ABC
 from dataclasses import dataclass, field
 from enum import Enum
@@ -7,29 +6,58 @@ from typing import Any
 @dataclass
 class EncuestaConfig(ABC):
     """Configuración base para todas las encuestas"""
-    target_variable: str
+    target_variable: str = ""
     #modules: List[Union[Enaho, Enapres, Endes]] = field(default_factory=list)
-    
+
     # Columnas estándar (se pueden override por encuesta)
     factor_column: str = "FACTOR"
     year_column: str = "AÑO"
     ubigeo_column: str = "UBIGEO"
-    
+    # Diseño muestral: estrato y conglomerado (UPM), para errores estándar
+    strata_column: str = "ESTRATO"
+    psu_column: str = "CONGLOME"
+    # Columnas adicionales que usa el cleaner (ej. NOMBREPP en Enapres)
+    extra_columns: tuple[str, ...] = ()
+
     # Configuraciones específicas por encuesta
     _survey_specific: dict[str, Any] = field(default_factory=dict)
 
+    def required_columns(self, *target_variables: str) -> list[str]:
+        """
+        Columnas mínimas que se deben leer de un archivo para calcular
+        tendencias de las variables objetivo (sin duplicados y en orden).
+        """
+        targets = target_variables or (self.target_variable,)
+        columns = [
+            self.year_column,
+            self.ubigeo_column,
+            self.factor_column,
+            self.strata_column,
+            self.psu_column,
+            *self.extra_columns,
+            *targets,
+        ]
+        return [col for col in dict.fromkeys(columns) if col]
+
 
+@dataclass
 class EnahoConfig(EncuestaConfig):
-    factor_column = "FACTOR07" # Considerar también FACTORA07
+    factor_column: str = "FACTOR07" # Considerar también FACTORA07
 
+@dataclass
 class EnapresConfig(EncuestaConfig):
-    year_column = "ANIO"
-    ubigeo_column = "NOMBREDD"
+    year_column: str = "ANIO"
+    ubigeo_column: str = "NOMBREDD"
+    psu_column: str = "CONGLOMERADO"
+    extra_columns: tuple[str, ...] = ("NOMBREPP",)
 
+@dataclass
 class EndesConfig(EncuestaConfig):
-    year_column = "ID1"
+    year_column: str = "ID1"
+    strata_column: str = "HV022"
+    psu_column: str = "HV001"
 
 class EncuestaType(Enum):
     ENAHO = "enaho"
-    ENAPRES = "enapres" 
-    ENDES = "endes"
\ No newline at end of file
+    ENAPRES = "enapres"
+    ENDES = "endes"
@@ -0,0 +1,104 @@
+import logging
+from pathlib import Path
+import pandas as pd
+
+# Partición de cada módulo y año dentro de output_dir
+PARTITION = "encuesta={encuesta}/modulo={modulo}/anio={anio}"
+# Filas por row group: cada uno guarda min/max por columna para filtrar sin leerlo
+ROW_GROUP_SIZE = 64_000
+# Valor de partición para filas sin departamento (convención de Hive)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "layout='hive' requiere pyarrow; instálalo con `pip install pyarrow`"
+        ) from e
+    return pa, pq
+
+
+def partition_dir(root: Path, encuesta: str, modulo: str, anio: str | int) -> Path:
+    return Path(root) / PARTITION.format(
+        encuesta=encuesta.lower().replace(" ", "_"), modulo=modulo, anio=anio
+    )
+
+
+def departamento_keys(values: pd.Series) -> pd.Series:
+    """
+    Valor de la partición `departamento=` de cada fila: los 2 primeros dígitos
+    del UBIGEO, o el nombre en mayúsculas si la columna tiene nombres (Enapres).
+    """
+    text = values.astype("string").str.strip().str.replace(r"\.0$", "", regex=True)
+    if text.str.fullmatch(r"\d+").all(skipna=True):
+        text = text.str.zfill(6).str[:2]
+    else:
+        text = text.str.upper()
+    return text.fillna(NULL_PARTITION)
+
+
+def _write_file(df: pd.DataFrame, path: Path) -> None:
+    pa, pq = _import_pyarrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table, path, row_group_size=ROW_GROUP_SIZE, write_statistics=True, compression="zstd"
+    )
+
+
+def write_partition(
+    df: pd.DataFrame,
+    directory: Path,
+    part: str = "part-0",
+    departamento_column: str | None = None,
+) -> list[Path]:
+    """
+    Escribe un DataFrame en `directory` como Parquet; con `departamento_column`,
+    un archivo por departamento en subcarpetas `departamento=XX`.
+    """
+    directory = Path(directory)
+    if not departamento_column:
+        path = directory / f"{part}.parquet"
+        _write_file(df, path)
+        return [path]
+
+    paths = []
+    keys = departamento_keys(df[departamento_column])
+    for key, rows in df.groupby(keys, sort=True).indices.items():
+        path = directory / f"departamento={key}" / f"{part}.parquet"
+        _write_file(df.iloc[rows], path)
+        paths.append(path)
+    return paths
+
+
+def write_metadata(directory: Path, files: list[Path] | None = None) -> bool:
+    """
+    Escribe `directory/_metadata` con los row groups (y sus estadísticas) de
+    todos los Parquet debajo de la carpeta, para que los lectores planifiquen
+    sin abrir cada archivo. Solo es posible si todos comparten el mismo
+    esquema; si no, no se escribe (y se elimina el de una ejecución anterior,
+    que ya no describe los archivos) y retorna False.
+    """
+    _, pq = _import_pyarrow()
+    directory = Path(directory)
+    files = sorted(files if files is not None else directory.rglob("*.parquet"))
+    if not files:
+        return False
+
+    metadata = None
+    for file in files:
+        file_metadata = pq.read_metadata(file)
+        file_metadata.set_file_path(file.relative_to(directory).as_posix())
+        if metadata is None:
+            metadata = file_metadata
+        elif not file_metadata.schema.equals(metadata.schema):
+            logging.info(f"No se escribe {directory / '_metadata'}: los archivos tienen esquemas distintos")
+            (directory / "_metadata").unlink(missing_ok=True)
+            return False
+        else:
+            metadata.append_row_groups(file_metadata)
+    metadata.write_metadata_file(directory / "_metadata")
+    return True
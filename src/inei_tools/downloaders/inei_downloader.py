@@ -14,6 +14,10 @@ from requests.exceptions import Timeout, ConnectionError
 from ..encuestas import Encuesta, Endes
 from .exceptions import NoFilesExtractedError, FormatoNoDisponibleError
 from .db_manager import DBManager, Queries
+from ._hive import partition_dir, write_metadata, write_partition
+from ..configs.encuesta_config import EnahoConfig, EnapresConfig, EndesConfig
+from ..utils.columns import match_columns
+from ..utils.reading import read_table
 
 # Para forzar conexiones IPv4
 requests.packages.urllib3.util.connection.HAS_IPV6 = False
@@ -71,6 +75,17 @@ class Downloader:
         - Si **True**, se configura un logger básico con nivel INFO y salida a consola.
         - Si se pasa una instancia de `logging.Logger`, se usará dicho logger personalizado.
         Por defecto: True.
+    layout : {"flat", "hive"}, optional
+        Organización de los archivos en `output_dir`:
+        - **"flat"**: nombres como `enaho_85_2023.dta` (por defecto).
+        - **"hive"**: cada archivo de datos se convierte a Parquet en
+          `encuesta=…/modulo=…/anio=…/part-0.parquet`, con row groups con
+          estadísticas y un archivo `_metadata` por partición, para que los
+          lectores (DuckDB, Polars, pyarrow) descarten años, módulos y
+          departamentos sin abrir archivos. Requiere pyarrow y activa `data_only`.
+    partition_by_departamento : bool, optional
+        Con `layout="hive"`, agrega una subpartición `departamento=XX` (2 primeros
+        dígitos del UBIGEO). Por defecto: False.
 
     Attributes
     ---------
@@ -152,6 +167,8 @@ class Downloader:
         overwrite: bool = False,
         parallel_downloads: bool = False,
         logger: Union[bool, logging.Logger] = True,
+        layout: Literal["flat", "hive"] = "flat",
+        partition_by_departamento: bool = False,
     ):
         self.modulos = modulos
         self.anios = anios if anios is not None else []
@@ -162,6 +179,8 @@ class Downloader:
         self.file_type = file_type.lower()
         self.data_only = data_only
         self.encuesta = None
+        self.layout = layout
+        self.partition_by_departamento = partition_by_departamento
 
         # Configuración de logger según lo que pase el usuario
         if isinstance(logger, logging.Logger):
@@ -197,6 +216,16 @@ class Downloader:
             )
             self.descomprimir = True
 
+        # Layout hive: se parte de los archivos de datos extraídos
+        if self.layout not in ("flat", "hive"):
+            raise ValueError("`layout` debe ser 'flat' o 'hive'")
+        if self.layout == "hive" and not self.data_only:
+            warnings.warn(
+                "Opción layout='hive' activada: se habilitó 'data_only' para convertir los archivos de datos a Parquet."
+            )
+            self.data_only = True
+            self.descomprimir = True
+
 
         # Años
         if self.anios:
@@ -359,13 +388,20 @@ class Downloader:
         if no_disponible:
             raise FormatoNoDisponibleError(no_disponible)
 
+        if self.layout == "hive":
+            self._assert_partitions()
         self._assert_overwrite()
         # ic(self.archivos_a_descargar)
 
-        if self.parallel_downloads:
-            self._download_parallel()
-        else:
-            self._download_sequential()
+        pending = any(archivo.status == "download" for archivo in self.archivos_a_descargar)
+        if self.layout == "flat" or pending:
+            if self.parallel_downloads:
+                self._download_parallel()
+            else:
+                self._download_sequential()
+
+        if self.layout == "hive":
+            return self._write_partitions()
 
         downloaded_files = list(self.downloaded_files)
         downloaded_files.sort(reverse=False)
@@ -432,6 +468,64 @@ class Downloader:
                     )
                 )
 
+    def _partition_dir(self, archivo_inei: ArchivoINEI) -> Path:
+        return partition_dir(
+            self.output_dir, archivo_inei.encuesta_name, archivo_inei.modulo, archivo_inei.año
+        )
+
+    def _assert_partitions(self):
+        # Igual que _assert_overwrite, pero sobre las particiones ya escritas
+        for archivo_inei in self.archivos_a_descargar:
+            directory = self._partition_dir(archivo_inei)
+            if not any(directory.rglob("*.parquet")):
+                continue
+            if self.overwrite:
+                shutil.rmtree(directory)
+            else:
+                logging.info(
+                    f"Partición '{directory}' ya existe y overwrite=False. No se descargará de nuevo."
+                )
+                archivo_inei.status = "exists"
+
+    def _write_partitions(self) -> list[Path]:
+        """
+        Convierte los archivos de datos descargados a Parquet en su partición
+        `encuesta=…/modulo=…/anio=…` (y `departamento=…` si se pidió), elimina
+        los archivos planos y escribe los `_metadata`. Retorna las particiones.
+        """
+        configs = {"enaho": EnahoConfig, "enapres": EnapresConfig, "endes": EndesConfig}
+        partitions = []
+        for archivo_inei in self.archivos_a_descargar:
+            directory = self._partition_dir(archivo_inei)
+            partitions.append(directory)
+            base_name = archivo_inei.file_path.stem
+            sources = sorted(
+                path
+                for path in self.downloaded_files
+                if path.stem == base_name or path.stem.startswith(base_name + "_")
+            )
+            if not sources:
+                continue
+
+            config = configs.get(archivo_inei.encuesta_name.lower(), EnahoConfig)()
+            for part, source in enumerate(sources):
+                df = read_table(source)
+                column = None
+                if self.partition_by_departamento:
+                    column = next(iter(match_columns(df.columns, [config.ubigeo_column])), None)
+                    if column is None:
+                        logging.warning(
+                            f"{source.name} no tiene la columna {config.ubigeo_column}: no se particiona por departamento"
+                        )
+                write_partition(df, directory, part=f"part-{part}", departamento_column=column)
+                source.unlink()
+                self.downloaded_files.discard(source)
+            write_metadata(directory)
+
+        # _metadata de todo el conjunto, si los módulos y años comparten esquema
+        write_metadata(self.output_dir, list(self.output_dir.glob("encuesta=*/**/*.parquet")))
+        return sorted(set(partitions))
+
     def _download_parallel(self):
         completed = 0
         if all(archivo_inei.status == "exists" for archivo_inei in self.archivos_a_descargar):
@@ -0,0 +1 @@
+from .survey_lake import SurveyLake, parse_file_name
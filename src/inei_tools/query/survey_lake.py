@@ -0,0 +1,293 @@
+import hashlib
+import json
+import logging
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+import pandas as pd
+from ..downloaders import Downloader
+from ..utils import sniff_csv
+from ..utils.cache import cache_dir, file_hash, file_signature
+from ..utils.reading import read_table
+from ..utils.table_cache import TableCache
+
+# Nombre de los archivos del Downloader: "{encuesta}_{modulo}_{anio}{ext}", con
+# un sufijo "_1", "_2"... cuando el INEI divide el módulo en varios archivos
+FILE_NAME = re.compile(r"^(?P<encuesta>[a-z_]+?)_(?P<modulo>\d[0-9a-z]*)_(?P<anio>20\d\d)(?:_\d+)?$")
+# Carpetas del layout hive del Downloader: encuesta=…/modulo=…/anio=…[/departamento=…]
+HIVE_KEYS = ("encuesta", "modulo", "anio")
+DATA_SUFFIXES = (".parquet", ".csv", ".dta", ".sav", ".zsav", ".dbf")
+# Encodings de CSV que DuckDB lee directamente. cp1252 no es latin-1 (ej. "€",
+# las comillas tipográficas): esos CSV se convierten a Parquet con `read_table`
+_DUCKDB_ENCODINGS = {
+    "utf8": "utf-8", "utf8sig": "utf-8", "ascii": "utf-8",
+    "latin1": "latin-1", "iso88591": "latin-1",
+}
+
+
+@dataclass(frozen=True)
+class LakeFile:
+    """Archivo de un módulo registrado en el lago."""
+
+    path: Path
+    encuesta: str
+    modulo: str
+    anio: int
+    departamento: str | None = None
+
+    @property
+    def view(self) -> str:
+        return f"{self.encuesta}.m{self.modulo}"
+
+
+def parse_file_name(path: Path) -> LakeFile | None:
+    """
+    Encuesta, módulo y año a partir de las carpetas del layout hive o, si no,
+    del nombre del archivo (None si no sigue ninguno de los dos formatos).
+    """
+    path = Path(path)
+    keys = dict(part.split("=", 1) for part in path.parent.parts if "=" in part)
+    if all(key in keys for key in HIVE_KEYS):
+        return LakeFile(
+            path, keys["encuesta"], keys["modulo"], int(keys["anio"]), keys.get("departamento")
+        )
+    match = FILE_NAME.match(path.stem.lower())
+    if not match:
+        return None
+    return LakeFile(Path(path), match["encuesta"], match["modulo"], int(match["anio"]))
+
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "SurveyLake requiere duckdb; instálalo con `pip install duckdb`"
+        ) from e
+    return duckdb
+
+
+def _literal(path: Path | str) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+class SurveyLake:
+    """
+    Consultas SQL (DuckDB) sobre los módulos descargados o convertidos, sin
+    escribir cadenas de cleaners.
+
+    Cada módulo se registra como una vista `encuesta.m<modulo>` (ej. `enaho.m85`,
+    `enapres.m600`) que une todos sus años. Las columnas virtuales `anio` y
+    `modulo` (y `departamento` en el layout hive particionado) salen del nombre
+    o de las carpetas del archivo, así que un filtro por año descarta los
+    archivos de los otros años sin leerlos. DuckDB lee en paralelo y solo
+    las columnas usadas (en Parquet también filtra por las estadísticas de
+    cada row group).
+
+    Los Parquet y los CSV en UTF-8 o latin-1 se leen directamente; los .dta,
+    .sav, .dbf y los CSV en otros encodings (ej. cp1252) se convierten una vez
+    a Parquet (en la caché, por contenido del archivo).
+
+    Parameters
+    ----------
+    sources : str | Path | list | Downloader, optional
+        Archivos o carpetas a registrar (ver `register`).
+    database : str, default ":memory:"
+        Base de DuckDB donde se crean las vistas.
+    threads : int, optional
+        Hilos de DuckDB. Por defecto, todos los núcleos.
+    cache : bool, default True
+        Si True, los resultados de `sql` se guardan (en memoria y en una
+        `TableCache` en disco) y se reutilizan mientras no cambien la consulta
+        ni los archivos.
+    max_cache_bytes : int, default 1 GB
+        Tamaño máximo de los resultados guardados en disco; al superarlo se
+        eliminan los menos usados (LRU).
+
+    Ejemplos
+    --------
+    >>> lake = SurveyLake("data/")
+    >>> lake.sql('''
+    ...     SELECT anio, "P1$05" AS respuesta, SUM(FACTOR07) AS poblacion
+    ...     FROM enaho.m85
+    ...     WHERE anio BETWEEN 2014 AND 2024
+    ...     GROUP BY ALL ORDER BY ALL
+    ... ''')
+    """
+
+    def __init__(
+        self,
+        sources: str | Path | list[str | Path] | Downloader | None = None,
+        database: str = ":memory:",
+        threads: int | None = None,
+        cache: bool = True,
+        max_cache_bytes: int = 1024**3,
+    ):
+        duckdb = _import_duckdb()
+        self.connection = duckdb.connect(database)
+        if threads:
+            self.connection.execute(f"SET threads = {int(threads)}")
+        self.cache = cache
+        self.max_cache_bytes = max_cache_bytes
+        self._stored: TableCache | None = None
+        self.files: dict[str, list[LakeFile]] = {}
+        self._results: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        if sources is not None:
+            self.register(sources)
+
+    def register(self, sources: str | Path | list[str | Path] | Downloader) -> Self:
+        """
+        Registra archivos y crea (o actualiza) las vistas de sus módulos.
+
+        Acepta rutas de archivos, carpetas (se buscan los archivos de datos
+        recursivamente) o un `Downloader` (se usan los archivos que descarga).
+        Los archivos cuyo nombre no sigue el formato del Downloader se omiten.
+        """
+        if isinstance(sources, Downloader):
+            sources = sources.download_all()
+        elif isinstance(sources, (str, Path)):
+            sources = [sources]
+
+        paths = []
+        for source in map(Path, sources):
+            if source.is_dir():
+                paths.extend(p for p in sorted(source.rglob("*")) if p.suffix.lower() in DATA_SUFFIXES)
+            else:
+                paths.append(source)
+
+        changed = set()
+        for path in paths:
+            lake_file = parse_file_name(path)
+            if lake_file is None:
+                logging.warning(f"Se omite {path.name}: no sigue el formato encuesta_modulo_anio")
+                continue
+            files = self.files.setdefault(lake_file.view, [])
+            if lake_file not in files:
+                files.append(lake_file)
+                changed.add(lake_file.view)
+
+        for view in sorted(changed):
+            self._create_view(view)
+        return self
+
+    def _scan(self, lake_file: LakeFile) -> str:
+        """Expresión de DuckDB que lee un archivo."""
+        path = lake_file.path
+        suffix = path.suffix.lower()
+        if suffix == ".parquet":
+            # Las columnas del layout hive las agrega _create_view como texto;
+            # la detección de DuckDB las duplicaría como enteros ("01" -> 1)
+            return f"read_parquet({_literal(path)}, hive_partitioning=false)"
+        if suffix == ".csv":
+            dialect = sniff_csv(path)
+            encoding = _DUCKDB_ENCODINGS.get(dialect.encoding.lower().replace("-", "").replace("_", ""))
+            if encoding:
+                return (
+                    f"read_csv({_literal(path)}, delim={_literal(dialect.delimiter)}, "
+                    f"quote={_literal(dialect.quotechar)}, skip={dialect.header}, header=true, "
+                    f"decimal_separator={_literal(dialect.decimal)}, encoding={_literal(encoding)})"
+                )
+        return f"read_parquet({_literal(self._to_parquet(path))})"
+
+    def _to_parquet(self, path: Path) -> Path:
+        """Convierte un archivo que DuckDB no lee a Parquet (una vez por contenido)."""
+        target = cache_dir() / "lake" / f"{file_hash(path)}.parquet"
+        if target.exists():
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        logging.info(f"📦 Convirtiendo {path.name} a Parquet")
+        df = read_table(path)
+
+        tmp = target.with_suffix(".tmp")
+        self.connection.register("_lake_conversion", df)
+        try:
+            self.connection.execute(
+                f"COPY _lake_conversion TO {_literal(tmp)} (FORMAT parquet)"
+            )
+        finally:
+            self.connection.unregister("_lake_conversion")
+        tmp.replace(target)
+        return target
+
+    def _create_view(self, view: str) -> None:
+        files = sorted(self.files[view], key=lambda f: (f.anio, f.path.name))
+        schema = view.split(".")[0]
+        self.connection.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        # Un SELECT por archivo con año y módulo constantes: un filtro por año
+        # elimina las ramas de los otros años antes de leerlas
+        selects = []
+        for f in files:
+            columns = f"{f.anio} AS anio, {_literal(f.modulo)} AS modulo"
+            if f.departamento is not None:
+                columns += f", {_literal(f.departamento)} AS departamento"
+            selects.append(f"SELECT *, {columns} FROM {self._scan(f)}")
+        self.connection.execute(
+            f"CREATE OR REPLACE VIEW {view} AS " + " UNION ALL BY NAME ".join(selects)
+        )
+
+    @property
+    def views(self) -> pd.DataFrame:
+        """Vistas registradas con sus años y número de archivos."""
+        return pd.DataFrame(
+            [
+                {
+                    "vista": view,
+                    "anios": sorted({f.anio for f in files}),
+                    "archivos": len(files),
+                }
+                for view, files in sorted(self.files.items())
+            ],
+            columns=["vista", "anios", "archivos"],
+        )
+
+    def _result_key(self, query: str, params: list | None) -> str:
+        sources = sorted(
+            file_signature(f.path) for files in self.files.values() for f in files
+        )
+        payload = json.dumps(
+            {"sql": " ".join(query.split()), "params": params, "sources": sources},
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def sql(self, query: str, params: list | None = None, cache: bool | None = None) -> pd.DataFrame:
+        """
+        Ejecuta una consulta sobre las vistas y retorna un DataFrame.
+
+        Con caché, el resultado se reutiliza mientras la consulta, los parámetros
+        y los archivos registrados (ruta, tamaño y fecha) sean los mismos.
+        """
+        cache = self.cache if cache is None else cache
+        if not cache:
+            return self.connection.execute(query, params).df()
+
+        key = self._result_key(query, params)
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key].copy()
+
+        if self._stored is None:
+            self._stored = TableCache(
+                cache_dir() / "lake" / "results", max_bytes=self.max_cache_bytes
+            )
+        result = self._stored.get(key)
+        if result is None:
+            result = self.connection.execute(query, params).df()
+            self._stored.put(key, result)
+
+        self._results[key] = result
+        if len(self._results) > 32:
+            self._results.popitem(last=False)
+        return result.copy()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
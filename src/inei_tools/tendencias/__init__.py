@@ -1,4 +1,5 @@
 from .question_type import Dummy, Confidence
 from .tendencias import Tendencias
+from ._results_store import ResultsStore
 
 #__all__ = ["enahodata", "Modulo", "ModuloPanel"]
\ No newline at end of file
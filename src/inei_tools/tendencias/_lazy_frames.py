@@ -0,0 +1,74 @@
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable, Iterator
+import pandas as pd
+
+
+class LazyFrames(Mapping):
+    """
+    Diccionario {ruta_del_archivo: DataFrame} que lee cada archivo recién
+    cuando se accede a él. Las claves son las rutas completas: archivos con el
+    mismo nombre en carpetas distintas son años distintos.
+
+    Los DataFrames leídos se mantienen en memoria mientras su tamaño total no
+    supere `memory_budget` (en bytes); al superarlo se liberan los menos usados.
+    Con `memory_budget=0` solo queda residente el año que se está procesando.
+
+    Parameters
+    ----------
+    paths : list[Path]
+        Archivos fuente, en el orden en que se deben recorrer.
+    loader : Callable[[Path], pd.DataFrame]
+        Función que lee un archivo (ej. `EncuestaCleaner._load_into_memory`).
+    memory_budget : int, default 0
+        Memoria máxima (bytes) que pueden ocupar los años residentes.
+    """
+
+    def __init__(
+        self,
+        paths: list[Path],
+        loader: Callable[[Path], pd.DataFrame],
+        memory_budget: int = 0,
+    ):
+        self.paths: dict[Path, Path] = {Path(path): Path(path) for path in paths}
+        self.loader = loader
+        self.memory_budget = memory_budget
+        self._resident: OrderedDict[Path, pd.DataFrame] = OrderedDict()
+        self._sizes: dict[Path, int] = {}
+
+    def __getitem__(self, name: str | Path) -> pd.DataFrame:
+        name = Path(name)
+        if name in self._resident:
+            self._resident.move_to_end(name)
+            return self._resident[name]
+
+        df = self.loader(self.paths[name])
+        self._resident[name] = df
+        self._sizes[name] = int(df.memory_usage(deep=True).sum())
+        self._evict(keep=name)
+        return df
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._sizes[name] for name in self._resident)
+
+    def trim(self) -> None:
+        """Libera los años residentes que no caben en el presupuesto de memoria."""
+        self._evict()
+
+    def _evict(self, keep: Path | None = None) -> None:
+        for name in list(self._resident):
+            if self.resident_bytes <= self.memory_budget:
+                break
+            if name == keep:
+                continue
+            logging.debug(f"Liberando {name.name} de la memoria")
+            del self._resident[name]
@@ -0,0 +1,169 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Literal
+import pandas as pd
+from ..query import parse_file_name
+from ..utils.cache import cache_dir, file_hash, file_signature
+
+# Versión del formato de los resultados: se incrementa cuando cambia el
+# DataFrame que produce un año, para no reutilizar los de versiones anteriores
+RESULT_VERSION = 2
+
+
+def _plain(value):
+    # Etiquetas de numpy (np.int64, np.float64) como int/float de Python para JSON
+    return value.item() if hasattr(value, "item") else value
+
+
+def _to_ipc(df: pd.DataFrame) -> bytes:
+    """
+    DataFrame como bytes Arrow IPC (sin pickle: el archivo puede editarse desde
+    fuera). Las etiquetas de columna (ej. años como int, categorías como float)
+    y las categorías de texto en object se guardan en los metadatos.
+    """
+    import pyarrow as pa
+
+    frame = df.set_axis([str(i) for i in range(df.shape[1])], axis=1)
+    object_categories = [
+        str(i) for i, dtype in enumerate(df.dtypes)
+        if isinstance(dtype, pd.CategoricalDtype) and dtype.categories.dtype == object
+    ]
+    table = pa.Table.from_pandas(frame)
+    metadata = {
+        **table.schema.metadata,
+        b"inei_tools": json.dumps(
+            {
+                "columns": [_plain(col) for col in df.columns],
+                "columns_name": _plain(df.columns.name),
+                "object_categories": object_categories,
+            }
+        ).encode(),
+    }
+    table = table.replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _from_ipc(data: bytes) -> pd.DataFrame:
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.py_buffer(data)).read_all()
+    info = json.loads(table.schema.metadata[b"inei_tools"])
+    df = table.to_pandas()
+    for col in info["object_categories"]:
+        df[col] = df[col].cat.set_categories(df[col].cat.categories.astype(object))
+    df.columns = pd.Index(info["columns"], name=info["columns_name"])
+    return df
+
+
+class ResultsStore:
+    """
+    Resultados por año de `Tendencias`, guardados en SQLite y reutilizados
+    entre ejecuciones.
+
+    Cada resultado se indexa por (encuesta, módulo, variable, método, engine
+    del cleaner, versión del formato, hash del archivo fuente). Si el INEI
+    publica un año nuevo solo ese año se calcula; si un archivo cambia (otro
+    hash), su resultado anterior se reemplaza.
+
+    Cada DataFrame se guarda como Arrow IPC (requiere pyarrow), no con pickle:
+    leer la base no ejecuta código aunque alguien la haya modificado.
+
+    Parameters
+    ----------
+    path : str | Path, optional
+        Archivo SQLite. Por defecto: `<cache_dir()>/tendencias.sqlite`.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "ResultsStore requiere pyarrow; instálalo con `pip install pyarrow`"
+            ) from e
+
+        self.path = Path(path) if path else cache_dir() / "tendencias.sqlite"
+        with closing(self._connect()) as conn, conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(results)")]
+            if columns and "version" not in columns:
+                # Tabla de una versión sin engine ni versión en la clave
+                conn.execute("DROP TABLE results")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "encuesta TEXT, modulo TEXT, variable TEXT, method TEXT, engine TEXT, "
+                "version INTEGER, file_hash TEXT, source TEXT, result BLOB, created REAL, "
+                "PRIMARY KEY (encuesta, modulo, variable, method, engine, version, file_hash))"
+            )
+            # Resultados de otros formatos (ej. pickle en la versión 1) no se leen más
+            conn.execute("DELETE FROM results WHERE version != ?", (RESULT_VERSION,))
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _source_key(path: Path) -> tuple[str, str, str]:
+        """(ruta absoluta del archivo, módulo, hash del contenido)."""
+        parsed = parse_file_name(path)
+        return file_signature(path)[0], parsed.modulo if parsed else "", file_hash(path)
+
+    def get(
+        self,
+        encuesta: str,
+        path: Path,
+        variables: list[str],
+        method: Literal["national", "department"],
+        engine: str = "c",
+    ) -> dict[str, pd.DataFrame]:
+        """Resultados guardados del archivo para las variables que ya se calcularon."""
+        _, modulo, content_hash = self._source_key(path)
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                f"SELECT variable, result FROM results WHERE encuesta = ? AND modulo = ? "
+                f"AND method = ? AND engine = ? AND version = ? AND file_hash = ? "
+                f"AND variable IN ({', '.join('?' * len(variables))})",
+                (encuesta, modulo, method, engine, RESULT_VERSION, content_hash, *variables),
+            ).fetchall()
+        return {variable: _from_ipc(result) for variable, result in rows}
+
+    def put(
+        self,
+        encuesta: str,
+        path: Path,
+        results: dict[str, pd.DataFrame],
+        method: Literal["national", "department"],
+        engine: str = "c",
+    ) -> None:
+        """
+        Guarda los resultados del archivo y elimina los de versiones anteriores
+        del mismo (otro contenido u otra versión del formato).
+        """
+        source, modulo, content_hash = self._source_key(path)
+        with closing(self._connect()) as conn, conn:
+            for variable, df in results.items():
+                conn.execute(
+                    "DELETE FROM results WHERE encuesta = ? AND modulo = ? AND variable = ? "
+                    "AND method = ? AND engine = ? AND source = ? "
+                    "AND (file_hash != ? OR version != ?)",
+                    (
+                        encuesta, modulo, variable, method, engine, source,
+                        content_hash, RESULT_VERSION,
+                    ),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        encuesta, modulo, variable, method, engine, RESULT_VERSION,
+                        content_hash, source, _to_ipc(df), time.time(),
+                    ),
+                )
+
+    def clear(self) -> None:
+        """Elimina todos los resultados guardados."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM results")
@@ -1,23 +1,87 @@
-from typing import Literal, Optional, OrderedDict
+from typing import Literal, Optional
 from functools import reduce
+import copy
 import pandas as pd
 from pathlib import Path
 import logging
 from ..downloaders import Downloader
 from .question_type import Dummy, Confidence
 from ..cleaners import EncuestaCleaner
+from ._lazy_frames import LazyFrames
+from ._results_store import ResultsStore
+from ..utils.memory import copy_on_write
+from ..utils.parallel import process_pool
 from functools import wraps
 
 def deactivate_warnings(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        pd.options.mode.copy_on_write = True
-        try:
+        # Copy-on-write solo durante la llamada (no cambia la opción global)
+        with copy_on_write():
             return func(*args, **kwargs)
-        finally:
-            pd.options.mode.copy_on_write = False
     return wrapper
-    
+
+
+@deactivate_warnings
+def _clean_year(
+    cleaner: EncuestaCleaner,
+    source: Path | pd.DataFrame,
+    variables: list[str],
+    method: Literal["national", "department"],
+) -> dict[str, pd.DataFrame]:
+    """
+    Limpia y agrega un año para todas las variables objetivo. Se ejecuta en el
+    proceso principal o en un worker.
+
+    El archivo se lee (con la unión de columnas) y los departamentos se asignan
+    una sola vez; luego cada variable se procesa sobre sus propias columnas.
+    """
+    # Cada variable pasa por cleaner.target_variable_id; al final se restaura
+    target_variable_id = cleaner.target_variable_id
+    try:
+        return _clean_variables(cleaner, source, variables, method)
+    finally:
+        cleaner.target_variable_id = target_variable_id
+
+
+def _clean_variables(
+    cleaner: EncuestaCleaner,
+    source: Path | pd.DataFrame,
+    variables: list[str],
+    method: Literal["national", "department"],
+) -> dict[str, pd.DataFrame]:
+    config = cleaner.config
+    if cleaner.engine == "polars":
+        # Un plan lazy por variable: Polars escanea solo las columnas de cada una
+        results = {}
+        for variable in variables:
+            cleaner.target_variable_id = variable
+            cleaner.initialize(source).remove_nas()
+            if method == "national":
+                cleaner.count_categories(with_factor=False)
+            else:
+                cleaner.add_departamentos().group_by_departamento().to_row_percentage()
+            results[variable] = cleaner.get_df()
+        return results
+
+    if isinstance(source, Path):
+        source = cleaner._load_into_memory(source, config.required_columns(*variables))
+    cleaner.initialize(source).add_departamentos()
+    year_df = cleaner.df
+
+    results = {}
+    for variable in variables:
+        cleaner.target_variable_id = variable
+        columns = [config.year_column, variable, "Departamento", config.factor_column]
+        cleaner.df = year_df[[col for col in columns if col in year_df.columns]]
+        cleaner.remove_nas()
+        if method == "national":
+            cleaner.filter_by_variable().count_categories(with_factor=False)
+        else:
+            cleaner.group_by_departamento().to_row_percentage()
+        results[variable] = cleaner.df
+    return results
+
 
 # TODO: Rust script for File Manager
 # TODO: Evaluate data_source as list[pd.DataFrame] (drawback: no filenames to extract years)
@@ -33,16 +97,46 @@ class Tendencias:
 
     Parameters
     ----------
-    data_source : list[str | Path]
-        Rutas de las bases de datos utilizada para calcular las tendencias.
-    target_variable_id : str
-        ID de la variable objetivo sobre la cual se generan las tendencias.
+    data_source : list[str | Path] | Downloader
+        Rutas de las bases de datos utilizada para calcular las tendencias, o un
+        `Downloader` con layout="flat" que las descarga.
+    target_variable_id : str | list[str]
+        ID de la variable objetivo sobre la cual se generan las tendencias. Con una
+        lista de variables cada archivo se lee y limpia una sola vez para todas, y
+        los métodos `get_*_trends` retornan un diccionario {variable: DataFrame}.
     question_type : str
         Tipo de pregunta asociada a la variable objetivo.
     output_dir : str | Path, optional
         Directorio de salida para almacenar los resultados generados.
     encuesta : {"enapres", "enaho"}, default="enapres"
         Tipo de encuesta a procesar.
+    engine : {"c", "pyarrow", "polars"}, default="c"
+        Parser para los CSV. "pyarrow" lee en paralelo, lo que reduce el tiempo
+        de carga; los tipos y los resultados son los mismos que con "c".
+        "polars" (requiere polars) lee, filtra y agrega cada año con una
+        consulta lazy multihilo de Polars; el resultado es el mismo DataFrame.
+    read_workers : int, optional
+        Número de procesos para leer archivos .dta/.sav grandes por rangos de filas.
+        Por defecto se leen en un solo proceso.
+    cache : bool, default=False
+        Si True, guarda las tablas ya leídas en una caché persistente (Arrow IPC)
+        para que volver a analizar los mismos años no repita el parseo.
+    memory_budget_mb : float, default=0
+        Memoria máxima (MB) que pueden ocupar los años ya leídos. Cada archivo se
+        lee recién cuando se procesa; con 0 se libera apenas se obtiene su resultado.
+    workers : int, optional
+        Número de procesos para limpiar y agregar los años en paralelo. Cada proceso
+        usa su propio cleaner y solo devuelve el resultado agregado del año. Los
+        procesos arrancan con "spawn": en un script, crea `Tendencias` dentro de
+        `if __name__ == "__main__":`.
+    frugal : bool, default=False
+        Si True, el cleaner trabaja en modo frugal: no guarda una copia de cada
+        año leído ni copia las columnas al filtrar (ver `EncuestaCleaner`).
+    store : bool | ResultsStore, default=False
+        Si True (o un `ResultsStore`), guarda el resultado de cada año por
+        (encuesta, módulo, variable, método, engine, hash del archivo). En las
+        siguientes ejecuciones solo se calculan los años nuevos o cuyos archivos
+        cambiaron y se vuelven a unir con los ya guardados.
 
     Methods
     -------
@@ -55,32 +149,54 @@ class Tendencias:
         self,
         encuesta: Literal["enaho", "enapres", "endes"],
         data_source: list[Path] | Downloader | None = None,
-        target_variable_id: str = "",
+        target_variable_id: str | list[str] = "",
         # question_type: Literal["dummy", "confidence"] = "dummy",
         output_dir: str = ".",
+        engine: Literal["c", "pyarrow", "polars"] = "c",
+        read_workers: Optional[int] = None,
+        cache: bool = False,
+        memory_budget_mb: float = 0,
+        workers: Optional[int] = None,
+        frugal: bool = False,
+        store: bool | ResultsStore = False,
     ):
         self.data_source = data_source
-        self.variable_id = target_variable_id.upper()
+        if isinstance(target_variable_id, str):
+            target_variable_id = [target_variable_id]
+        self.variable_ids = [variable.upper() for variable in target_variable_id]
+        self.variable_id = self.variable_ids[0] if self.variable_ids else ""
         
         self.question_type = None
         self.output_dir = Path(output_dir)
 
-        self.cleaner = EncuestaCleaner(encuesta)
+        self.cleaner = EncuestaCleaner(
+            encuesta, engine=engine, read_workers=read_workers, cache=cache, frugal=frugal
+        )
         self.cleaner.target_variable_id= self.variable_id
 
-        self.filename_df_dict = OrderedDict()
+        if store is True:
+            self.store = ResultsStore()
+        else:
+            self.store = store or None
+        self.memory_budget = int(memory_budget_mb * 1024**2)
+        self.workers = workers
+        self.filename_df_dict: LazyFrames | dict = {}
         self.downloader = None
-        self.df_list_clean = []
+        # {variable: [DataFrame por año]}
+        self.df_list_clean: dict[str, list[pd.DataFrame]] = {}
 
     def _obtain_data_if_needed(self):
-
         if isinstance(self.data_source, Downloader):
+            if self.data_source.layout == "hive":
+                # download_all retorna carpetas de partición (Parquet), no un archivo por año
+                raise ValueError(
+                    "Tendencias no admite un Downloader con layout='hive': usa "
+                    "layout='flat' o consulta las particiones con SurveyLake"
+                )
             self.downloader = self.data_source
             self.downloader.overwrite = False
             path_list = self.downloader.download_all()
-            self.filename_df_dict = {
-                path.name: self.cleaner._load_into_memory(path) for path in path_list
-            }
+            self.filename_df_dict = self._lazy_frames(path_list)
 
         elif (
             isinstance(self.data_source, list)
@@ -94,10 +210,7 @@ class Tendencias:
                 self.data_source = [Path(data) for data in self.data_source]
 
             if all(isinstance(data, Path) for data in self.data_source):
-                self.filename_df_dict = {
-                    path.name: self.cleaner._load_into_memory(path)
-                    for path in self.data_source
-                }
+                self.filename_df_dict = self._lazy_frames(self.data_source)
             # elif all(isinstance(data, pd.DataFrame) for data in self.data_source):
 
         else:
@@ -107,12 +220,106 @@ class Tendencias:
             )
 
 
-    def _merge_dfs(self, df_list: list[pd.DataFrame]) -> pd.DataFrame:
+    def _lazy_frames(self, paths: list[Path]) -> LazyFrames:
+        # Solo se leen las columnas que usa el cleaner (año, ubigeo, factor y variables)
+        columns = None
+        if any(self.variable_ids):
+            columns = self.cleaner.config.required_columns(*self.variable_ids)
+        return LazyFrames(
+            paths,
+            loader=lambda path: self.cleaner._load_into_memory(path, columns),
+            memory_budget=self.memory_budget,
+        )
+
+    def _clean_all(
+        self, method: Literal["national", "department"]
+    ) -> dict[str, list[pd.DataFrame]]:
+        if not self.filename_df_dict:
+            self._obtain_data_if_needed()
+
+        # Resultados ya guardados: solo quedan pendientes los años nuevos o modificados
+        year_results = {filename: {} for filename in self.filename_df_dict}
+        use_store = self.store is not None and isinstance(self.filename_df_dict, LazyFrames)
+        if use_store:
+            for filename, path in self.filename_df_dict.paths.items():
+                year_results[filename] = self.store.get(
+                    self.cleaner.encuesta, path, self.variable_ids, method, self.cleaner.engine
+                )
+        pending = {
+            filename: [v for v in self.variable_ids if v not in results]
+            for filename, results in year_results.items()
+        }
+        pending = {filename: variables for filename, variables in pending.items() if variables}
+        if use_store:
+            logging.info(f"{len(pending)}/{len(year_results)} archivos por calcular")
+
+        if self.workers and self.workers > 1 and isinstance(self.filename_df_dict, LazyFrames):
+            computed = self._clean_parallel(method, pending)
+        else:
+            computed = {}
+            # Se itera por nombre para que cada año se lea recién aquí (ver LazyFrames)
+            for filename, variables in pending.items():
+                logging.info(f"Cleaning {filename}")
+                if self.cleaner.engine == "polars" and isinstance(self.filename_df_dict, LazyFrames):
+                    # Polars lee el archivo por su cuenta (sin cargarlo antes en pandas)
+                    source = self.filename_df_dict.paths[filename]
+                else:
+                    source = self.filename_df_dict[filename]
+                computed[filename] = _clean_year(self.cleaner, source, variables, method)
+                self._release()
+
+        for filename, results in computed.items():
+            year_results[filename].update(results)
+            if use_store:
+                self.store.put(
+                    self.cleaner.encuesta,
+                    self.filename_df_dict.paths[filename],
+                    results,
+                    method,
+                    self.cleaner.engine,
+                )
+
+        return {
+            variable: [results[variable] for results in year_results.values()]
+            for variable in self.variable_ids
+        }
+
+    def _clean_parallel(
+        self, method: Literal["national", "department"], pending: dict[str, list[str]]
+    ) -> dict[str, dict[str, pd.DataFrame]]:
+        if not pending:
+            return {}
+        # Cada worker recibe una copia del cleaner sin datos (estado aislado)
+        # y lee su archivo por su cuenta; al proceso principal solo vuelve el agregado
+        worker_cleaner = copy.copy(self.cleaner)
+        worker_cleaner.df = None
+        worker_cleaner.df_original = None
+        worker_cleaner.read_workers = None
+
+        paths = self.filename_df_dict.paths
+        logging.info(f"Cleaning {len(pending)} archivos con {self.workers} procesos")
+        with process_pool(min(self.workers, len(pending))) as executor:
+            futures = {
+                filename: executor.submit(
+                    _clean_year, worker_cleaner, paths[filename], variables, method
+                )
+                for filename, variables in pending.items()
+            }
+            return {filename: future.result() for filename, future in futures.items()}
+
+    def _release(self):
+        # El resultado del año ya se obtuvo: liberar los datos fuente
+        self.cleaner.df = None
+        self.cleaner.df_original = None
+        if isinstance(self.filename_df_dict, LazyFrames):
+            self.filename_df_dict.trim()
+
+    def _merge_dfs(self, df_list: list[pd.DataFrame], variable_id: str) -> pd.DataFrame:
         # for i, df in enumerate(df_list, start=1):
         #     print(f"DF {i} columnas: {df.columns.tolist()}")
         merged_df = reduce(
-            lambda left, right: pd.merge(left, right, on=self.variable_id),
-            self.df_list_clean,
+            lambda left, right: pd.merge(left, right, on=variable_id),
+            df_list,
         )
         return merged_df
 
@@ -135,39 +342,44 @@ class Tendencias:
         elif self.question_type == "confidence":
             return Confidence(df, self.variable_id)
 
-    def _export_to_excel(self, output_path: Path, merged_df: pd.DataFrame):
-        file_name = f"confianza_{self.variable_id}"
+    def _export_to_excel(self, output_path: Path, merged_df: pd.DataFrame, variable_id: str):
+        file_name = f"confianza_{variable_id}"
         file_path = output_path / f"{file_name}.xlsx"
         merged_df.to_excel(file_path, index=False)
         logging.info(f"Se ha guardado el archivo en {file_name}")
 
     @deactivate_warnings
     def get_national_trends(self, output_path: Optional[Path] = None):
-        for filename, df in self.filename_df_dict.items():
-            logging.info(f"Cleaning {filename}")
-            self.cleaner.initialize(df).remove_nas().add_departamentos().filter_by_variable().count_categories(with_factor=False)
-           
-            self.df_list_clean.append(self.cleaner.df)
-        
-        merged_df = self._merge_dfs(self.df_list_clean)
+        self.df_list_clean = self._clean_all("national")
+
+        trends = {
+            variable: self._merge_dfs(df_list, variable)
+            for variable, df_list in self.df_list_clean.items()
+        }
 
         #final_df = transpose(final_df)
-        if output_path:
-            self._export_to_excel(output_path, merged_df)
-        return merged_df
+        return self._output(trends, output_path)
     
     @deactivate_warnings
     def get_department_trends(self, output_path: Optional[Path] = None):
-        for filename, df in self.filename_df_dict.items():
-            logging.info(f"Cleaning {filename}")
-            self.cleaner.initialize(df).remove_nas().add_departamentos().group_by_departamento().to_row_percentage()
-           
-            self.df_list_clean.append(self.cleaner.df)
-        
-        merged_df = self._concat_dfs(self.df_list_clean)
+        self.df_list_clean = self._clean_all("department")
+
+        trends = {
+            variable: self._concat_dfs(df_list)
+            for variable, df_list in self.df_list_clean.items()
+        }
 
         # #final_df = transpose(final_df)
+        return self._output(trends, output_path)
+
+    def _output(
+        self, trends: dict[str, pd.DataFrame], output_path: Optional[Path]
+    ) -> pd.DataFrame | dict[str, pd.DataFrame]:
         if output_path:
-            self._export_to_excel(output_path, merged_df)
-        return merged_df
+            for variable, merged_df in trends.items():
+                self._export_to_excel(output_path, merged_df, variable)
+        # Con una sola variable se mantiene la salida de siempre (un DataFrame)
+        if len(trends) == 1:
+            return trends[self.variable_id]
+        return trends
 
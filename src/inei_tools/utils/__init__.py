@@ -1,4 +1,5 @@
 from .file_manager import FileManager
-from .csv_tools import detect_delimiter, detect_encoding
+from .csv_tools import detect_delimiter, detect_encoding, sniff_csv, CsvDialect
+from .table_cache import TableCache
 
 #__all__ = ["enahodata", "Modulo", "ModuloPanel"]
\ No newline at end of file
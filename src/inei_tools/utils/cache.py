@@ -0,0 +1,61 @@
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Carpeta donde inei_tools guarda sus cachés persistentes.
+    Se puede cambiar con la variable de entorno `INEI_TOOLS_CACHE_DIR`.
+    """
+    path = os.environ.get("INEI_TOOLS_CACHE_DIR")
+    path = Path(path) if path else Path.home() / ".cache" / "inei_tools"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def connect_cache(db_name: str = "cache") -> sqlite3.Connection:
+    """Abre (o crea) la base SQLite de caché `db_name` dentro de `cache_dir()`."""
+    conn = sqlite3.connect(cache_dir() / f"{db_name}.sqlite", timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def file_signature(path: Path) -> tuple[str, int, int]:
+    """Identifica una versión de un archivo por (ruta absoluta, tamaño, mtime)."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    return str(path), stat.st_size, stat.st_mtime_ns
+
+
+def file_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Hash (blake2b) del contenido de un archivo. Se calcula una sola vez por
+    versión del archivo (ruta, tamaño, mtime) y se guarda en la caché.
+    """
+    key = file_signature(path)
+    conn = connect_cache()
+    try:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS file_hashes ("
+            "path TEXT, size INTEGER, mtime INTEGER, hash TEXT, "
+            "PRIMARY KEY (path, size, mtime))"
+        )
+        row = conn.execute(
+            "SELECT hash FROM file_hashes WHERE path = ? AND size = ? AND mtime = ?", key
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+        content_hash = digest.hexdigest()
+        conn.execute("DELETE FROM file_hashes WHERE path = ?", key[:1])
+        conn.execute("INSERT INTO file_hashes VALUES (?, ?, ?, ?)", (*key, content_hash))
+        conn.commit()
+        return content_hash
+    finally:
+        conn.close()
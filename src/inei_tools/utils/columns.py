@@ -0,0 +1,67 @@
+import logging
+from pathlib import Path
+from typing import Iterable
+import pandas as pd
+from .csv_tools import sniff_csv
+from .dbf import read_dbf_header
+
+
+def normalize_column_name(name: str) -> str:
+    """
+    Normaliza el nombre de una columna para compararlo entre formatos.
+    El INEI publica la misma variable como `P1$05` (csv/dbf), `p1_05` (stata)
+    o `P1_05` (spss), así que se ignoran mayúsculas y se iguala `$` con `_`.
+    """
+    return str(name).strip().upper().replace("$", "_")
+
+
+def match_columns(available: Iterable[str], wanted: Iterable[str]) -> dict[str, str]:
+    """
+    Empareja las columnas pedidas con las columnas reales de un archivo.
+
+    Retorna
+    -------
+    dict[str, str]
+        Diccionario {nombre_en_archivo: nombre_pedido}. Las columnas pedidas
+        que no existen en el archivo se omiten (y se registran en el log).
+    """
+    available = list(available)
+    normalized = {}
+    for col in available:
+        normalized.setdefault(normalize_column_name(col), col)
+
+    mapping: dict[str, str] = {}
+    missing = []
+    for col in wanted:
+        if col in available:
+            mapping[col] = col
+        elif normalize_column_name(col) in normalized:
+            mapping[normalized[normalize_column_name(col)]] = col
+        else:
+            missing.append(col)
+
+    if missing:
+        logging.info(f"Columnas no encontradas en el archivo: {missing}")
+    return mapping
+
+
+def read_column_names(path: Path) -> list[str]:
+    """Retorna los nombres de columnas de un archivo sin cargar sus datos."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return list(
+            pd.read_csv(path, **sniff_csv(path).read_csv_kwargs(), nrows=0).columns
+        )
+    elif suffix == ".dta":
+        with pd.read_stata(path, iterator=True) as reader:
+            return list(reader.variable_labels())
+    elif suffix in (".sav", ".zsav"):
+        import pyreadstat
+
+        _, meta = pyreadstat.read_sav(str(path), metadataonly=True)
+        return list(meta.column_names)
+    elif suffix == ".dbf":
+        return [field.name for field in read_dbf_header(path).fields]
+
+    raise ValueError(f"Formato no soportado: {path.suffix}")
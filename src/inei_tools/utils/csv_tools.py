@@ -1,20 +1,104 @@
-
 import csv
+import logging
+import re
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from .cache import connect_cache, file_signature
 
+DELIMITER_CANDIDATES = (",", ";", "|", "\t")
+ENCODING_CANDIDATES = ("utf-8", "utf-8-sig", "cp1252", "latin1")
+SNIFF_BYTES = 256 * 1024
 
-@staticmethod
-def detect_delimiter(
-    path: Path,
-    *,
-    encoding="latin1",
-    candidates=(",", ";", "|", "\t"),
-    sample_bytes=64 * 1024,
+
+@dataclass(frozen=True)
+class CsvDialect:
+    """Resultado de `sniff_csv`: todo lo necesario para leer el CSV con pandas."""
+    encoding: str
+    delimiter: str
+    decimal: str = "."
+    header: int = 0
+    quotechar: str = '"'
+    quoting: int = csv.QUOTE_MINIMAL
+
+    def read_csv_kwargs(self) -> dict:
+        """Argumentos equivalentes para `pd.read_csv`."""
+        return {
+            "encoding": self.encoding,
+            "sep": self.delimiter,
+            "decimal": self.decimal,
+            "header": self.header,
+            "quotechar": self.quotechar,
+            "quoting": self.quoting,
+        }
+
+
+def _encoding_from_bytes(
+    raw: bytes,
+    candidates: tuple[str, ...] = ENCODING_CANDIDATES,
+    truncated: bool | None = None,
 ) -> str:
-    # Read a small text sample
-    with open(path, "r", encoding=encoding, newline="") as f:
-        sample = f.read(sample_bytes)
+    """
+    Encoding de una muestra de bytes. `truncated` indica si la muestra es solo
+    el inicio del archivo (por defecto, si tiene SNIFF_BYTES bytes).
+    """
+    if truncated is None:
+        truncated = len(raw) >= SNIFF_BYTES
+    # --- BOMs frecuentes (los de 4 bytes antes que los de 2)
+    boms = {
+        b"\xff\xfe\x00\x00": "utf-32-le",
+        b"\x00\x00\xfe\xff": "utf-32-be",
+        b"\xef\xbb\xbf": "utf-8-sig",
+        b"\xff\xfe": "utf-16-le",
+        b"\xfe\xff": "utf-16-be",
+    }
+    for bom, enc in boms.items():
+        if raw.startswith(bom):
+            return enc
 
+    # --- Probar candidatos "duros" (sin errores)
+    for enc in candidates:
+        try:
+            raw.decode(enc, errors="strict")
+            return enc
+        except UnicodeDecodeError as e:
+            # Una muestra cortada puede partir un carácter multibyte al final: solo
+            # se acepta si el único error es esa secuencia incompleta (un byte
+            # cp1252 suelto cerca del final es otro error). Si es el archivo
+            # completo, esos bytes finales sí cuentan
+            if (
+                truncated
+                and enc.startswith("utf-8")
+                and e.start >= len(raw) - 3
+                and e.reason == "unexpected end of data"
+            ):
+                return enc
+            continue
+
+    # --- Fallback “inteligente” con charset-normalizer o chardet (si existen)
+    try:
+        from charset_normalizer import from_bytes  # type: ignore
+        res = from_bytes(raw)
+        best = res.best()
+        if best and best.encoding:
+            return best.encoding
+    except Exception:
+        pass
+
+    try:
+        import chardet  # type: ignore
+        guess = chardet.detect(raw)
+        if guess and guess.get("encoding"):
+            return guess["encoding"]
+    except Exception:
+        pass
+
+    # --- Último recurso: latin1 nunca falla al decodificar bytes 0x00-0xFF
+    return "latin1"
+
+
+def _delimiter_from_text(
+    sample: str, candidates: tuple[str, ...] = DELIMITER_CANDIDATES
+) -> str:
     # Excel hint: first line like "sep=;"
     lines = sample.splitlines()
     if lines:
@@ -38,12 +122,135 @@ def detect_delimiter(
         scores = {c: sum(ln.count(c) for ln in probe) for c in candidates}
         return max(scores, key=scores.get)
 
+
+def _decimal_from_rows(rows: list[list[str]], delimiter: str) -> str:
+    """
+    Detecta coma decimal (ej. FACTOR07 = '123,45') en archivos no separados por coma.
+    Solo se asume coma si ningún valor usa punto, para no convertir en texto
+    columnas numéricas escritas con punto.
+    """
+    if delimiter == ",":
+        return "."
+    comma = re.compile(r"^\s*-?\d+,\d+\s*$")
+    dot = re.compile(r"^\s*-?\d+\.\d+\s*$")
+    n_comma = n_dot = 0
+    for row in rows:
+        for value in row:
+            if comma.match(value):
+                n_comma += 1
+            elif dot.match(value):
+                n_dot += 1
+    return "," if n_comma and not n_dot else "."
+
+
+def _sniff_bytes(raw: bytes) -> CsvDialect:
+    encoding = _encoding_from_bytes(raw)
+    text = raw.decode(encoding, errors="replace")
+    # Descartar la última línea (probablemente incompleta)
+    if len(raw) >= SNIFF_BYTES and "\n" in text:
+        text = text[: text.rfind("\n")]
+
+    delimiter = _delimiter_from_text(text)
+    lines = text.splitlines()
+    header = 1 if lines and lines[0].strip().lower().startswith("sep=") else 0
+
+    quotechar = '"'
+    try:
+        quotechar = csv.Sniffer().sniff(text, delimiters=delimiter).quotechar or '"'
+    except csv.Error:
+        pass
+
+    rows = list(csv.reader(lines[header + 1 : header + 201], delimiter=delimiter, quotechar=quotechar))
+    decimal = _decimal_from_rows(rows, delimiter)
+    return CsvDialect(
+        encoding=encoding,
+        delimiter=delimiter,
+        decimal=decimal,
+        header=header,
+        quotechar=quotechar,
+    )
+
+
+# Caché en memoria para no consultar SQLite en cada lectura de la misma sesión
+_DIALECT_CACHE: dict[tuple[str, int, int], CsvDialect] = {}
+
+
+def sniff_csv(path: Path, *, use_cache: bool = True) -> CsvDialect:
+    """
+    Detecta en una sola lectura el encoding, delimitador, separador decimal,
+    fila de cabecera y comillas de un CSV.
+
+    El resultado se guarda en una caché persistente indexada por
+    (ruta, tamaño, mtime), así que volver a leer el mismo archivo no vuelve
+    a abrirlo para detectar su formato.
+    """
+    key = file_signature(path)
+    if use_cache and key in _DIALECT_CACHE:
+        return _DIALECT_CACHE[key]
+
+    conn = None
+    if use_cache:
+        try:
+            conn = connect_cache()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS csv_dialects ("
+                "path TEXT, size INTEGER, mtime INTEGER, encoding TEXT, delimiter TEXT, "
+                "decimal TEXT, header INTEGER, quotechar TEXT, quoting INTEGER, "
+                "PRIMARY KEY (path, size, mtime))"
+            )
+            row = conn.execute(
+                "SELECT encoding, delimiter, decimal, header, quotechar, quoting "
+                "FROM csv_dialects WHERE path = ? AND size = ? AND mtime = ?",
+                key,
+            ).fetchone()
+            if row:
+                dialect = CsvDialect(*row)
+                _DIALECT_CACHE[key] = dialect
+                conn.close()
+                return dialect
+        except Exception as e:
+            logging.debug(f"No se pudo usar la caché de dialectos CSV: {e}")
+            conn = None
+
+    with open(path, "rb") as fb:
+        raw = fb.read(SNIFF_BYTES)
+    dialect = _sniff_bytes(raw)
+    logging.info(f"Formato detectado para {Path(path).name}: {dialect}")
+
+    if use_cache:
+        _DIALECT_CACHE[key] = dialect
+        if conn is not None:
+            values = asdict(dialect)
+            conn.execute(
+                "INSERT OR REPLACE INTO csv_dialects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, *values.values()),
+            )
+            conn.commit()
+            conn.close()
+    return dialect
+
+
+@staticmethod
+def detect_delimiter(
+    path: Path,
+    *,
+    encoding=None,
+    candidates=DELIMITER_CANDIDATES,
+    sample_bytes=64 * 1024,
+) -> str:
+    # Si no se indica encoding, se usa el detectado en vez de asumir latin1
+    with open(path, "rb") as fb:
+        raw = fb.read(sample_bytes)
+    encoding = encoding or _encoding_from_bytes(raw, truncated=len(raw) == sample_bytes)
+    sample = raw.decode(encoding, errors="replace")
+    return _delimiter_from_text(sample, candidates)
+
 @staticmethod
 def detect_encoding(
     path: Path,
     *,
-    sample_bytes: int = 256 * 1024,  # 256 KB para decidir bien
-    candidates: tuple[str, ...] = ("utf-8", "utf-8-sig", "cp1252", "latin1"),
+    sample_bytes: int = SNIFF_BYTES,  # 256 KB para decidir bien
+    candidates: tuple[str, ...] = ENCODING_CANDIDATES,
 ) -> str:
     """
     Devuelve un nombre de encoding estimado para el archivo.
@@ -52,48 +259,9 @@ def detect_encoding(
     2) Probar candidatos comunes (utf-8, utf-8-sig, cp1252, latin1) con errors='strict'.
     3) Si hay charset-normalizer o chardet, usarlos como fallback.
     4) Último recurso: 'latin1'.
+
+    Para leer un CSV es preferible `sniff_csv`, que detecta todo en una sola lectura.
     """
-    # --- 1) Leer muestra binaria
     with open(path, "rb") as fb:
         raw = fb.read(sample_bytes)
-
-    # --- 2) BOMs frecuentes
-    boms = {
-        b"\xef\xbb\xbf": "utf-8-sig",
-        b"\xff\xfe": "utf-16-le",
-        b"\xfe\xff": "utf-16-be",
-        b"\xff\xfe\x00\x00": "utf-32-le",
-        b"\x00\x00\xfe\xff": "utf-32-be",
-    }
-    for bom, enc in boms.items():
-        if raw.startswith(bom):
-            return enc
-
-    # --- 3) Probar candidatos "duros" (sin errores)
-    for enc in candidates:
-        try:
-            raw.decode(enc, errors="strict")
-            return enc
-        except UnicodeDecodeError:
-            continue
-
-    # --- 4) Fallback “inteligente” con charset-normalizer o chardet (si existen)
-    try:
-        from charset_normalizer import from_bytes  # type: ignore
-        res = from_bytes(raw)
-        best = res.best()
-        if best and best.encoding:
-            return best.encoding
-    except Exception:
-        pass
-
-    try:
-        import chardet  # type: ignore
-        guess = chardet.detect(raw)
-        if guess and guess.get("encoding"):
-            return guess["encoding"]
-    except Exception:
-        pass
-
-    # --- 5) Último recurso: latin1 nunca falla al decodificar bytes 0x00-0xFF
-    return "latin1"
\ No newline at end of file
+    return _encoding_from_bytes(raw, candidates, truncated=len(raw) == sample_bytes)
@@ -0,0 +1,206 @@
+import logging
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Literal
+import numpy as np
+import pandas as pd
+
+# Byte 29 de la cabecera (language driver) -> codificación
+LANGUAGE_DRIVERS = {
+    0x01: "cp437",
+    0x02: "cp850",
+    0x03: "cp1252",
+    0x57: "cp1252",
+    0x64: "cp852",
+    0x65: "cp866",
+}
+
+
+@dataclass(frozen=True)
+class DbfField:
+    name: str
+    type: str
+    length: int
+    decimals: int
+    offset: int  # posición dentro del registro (el byte 0 es la marca de borrado)
+
+
+@dataclass(frozen=True)
+class DbfHeader:
+    n_records: int
+    header_size: int
+    record_size: int
+    encoding: str | None
+    fields: list[DbfField]
+
+    def record_dtype(self) -> np.dtype:
+        """Tipo estructurado de NumPy que describe un registro completo."""
+        return np.dtype(
+            {
+                "names": ["_deleted"] + [f.name for f in self.fields],
+                "formats": ["S1"] + [f"S{f.length}" for f in self.fields],
+                "offsets": [0] + [f.offset for f in self.fields],
+                "itemsize": self.record_size,
+            }
+        )
+
+
+def read_dbf_header(path: Path) -> DbfHeader:
+    """Lee la cabecera de un .dbf (dBase III/IV, FoxPro) sin leer los registros."""
+    with open(path, "rb") as f:
+        header = f.read(32)
+        n_records, header_size, record_size = struct.unpack("<IHH", header[4:12])
+        descriptors = f.read(header_size - 32)
+
+    encoding = LANGUAGE_DRIVERS.get(header[29])
+    fields = []
+    offset = 1
+    for start in range(0, len(descriptors), 32):
+        descriptor = descriptors[start : start + 32]
+        if len(descriptor) < 32 or descriptor[0] == 0x0D:
+            break
+        name = descriptor[:11].split(b"\x00")[0].decode(encoding or "cp850")
+        length, decimals = descriptor[16], descriptor[17]
+        fields.append(
+            DbfField(
+                name=name,
+                type=chr(descriptor[11]),
+                length=length,
+                decimals=decimals,
+                offset=offset,
+            )
+        )
+        offset += length
+
+    return DbfHeader(
+        n_records=n_records,
+        header_size=header_size,
+        record_size=record_size,
+        encoding=encoding,
+        fields=fields,
+    )
+
+
+def _decode_field(values: np.ndarray, field: DbfField, encoding: str) -> np.ndarray | pd.Series:
+    """Convierte los bytes de ancho fijo de un campo a su tipo, en bloque."""
+    if field.type in ("N", "F"):
+        # np.char.strip y la conversión a float se hacen en C sobre todo el bloque
+        stripped = np.char.strip(values)
+        blank = (stripped == b"") | np.char.startswith(stripped, b"*")
+        result = np.full(len(values), np.nan)
+        result[~blank] = stripped[~blank].astype(np.float64)
+        return result
+    if field.type == "L":
+        upper = np.char.upper(np.char.strip(values))
+        result = np.full(len(values), np.nan, dtype=object)
+        result[np.isin(upper, [b"T", b"Y"])] = True
+        result[np.isin(upper, [b"F", b"N"])] = False
+        return result
+    if field.type == "D":
+        text = pd.Series(values).str.decode("ascii", errors="ignore").str.strip()
+        return pd.to_datetime(text, format="%Y%m%d", errors="coerce").to_numpy()
+
+    # C (texto) y otros: decodificar solo los valores únicos
+    uniques, codes = np.unique(values, return_inverse=True)
+    decoded = np.array(
+        [u.decode(encoding, errors="replace").rstrip(" \x00") for u in uniques],
+        dtype=object,
+    )
+    return decoded[codes.ravel()]
+
+
+def iter_dbf_batches(
+    path: Path,
+    usecols: list[str] | None = None,
+    encoding: str | None = None,
+    batch_rows: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lee un .dbf por bloques de `batch_rows` registros.
+
+    El archivo se mapea en memoria y cada bloque se interpreta como un arreglo
+    estructurado de NumPy, así que solo se copian los campos pedidos en `usecols`.
+    """
+    header = read_dbf_header(path)
+    encoding = encoding or header.encoding or "cp850"
+    fields = header.fields
+    if usecols is not None:
+        wanted = set(usecols)
+        fields = [f for f in fields if f.name in wanted]
+
+    # Un archivo truncado puede declarar más registros de los que contiene
+    available = max(Path(path).stat().st_size - header.header_size, 0) // header.record_size
+    n_records = min(header.n_records, available)
+    if n_records < header.n_records:
+        logging.warning(
+            f"{Path(path).name} declara {header.n_records} registros pero solo "
+            f"contiene {n_records} completos; se leen esos"
+        )
+
+    if n_records == 0:
+        yield pd.DataFrame({f.name: pd.Series(dtype=object) for f in fields})
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        batch = None
+        records = np.frombuffer(
+            mm,
+            dtype=header.record_dtype(),
+            count=n_records,
+            offset=header.header_size,
+        )
+        try:
+            for start in range(0, n_records, batch_rows):
+                batch = records[start : start + batch_rows]
+                keep = batch["_deleted"] != b"*"
+                data = {
+                    field.name: _decode_field(batch[field.name][keep], field, encoding)
+                    for field in fields
+                }
+                yield pd.DataFrame(data)
+        finally:
+            # Liberar las vistas antes de cerrar el mmap
+            del records, batch
+
+
+def _as_integers(df: pd.DataFrame, fields: list[DbfField]) -> pd.DataFrame:
+    # Campos numéricos sin decimales y sin vacíos se devuelven como enteros
+    for field in fields:
+        if field.type == "N" and field.decimals == 0 and field.name in df:
+            col = df[field.name]
+            if len(col) and not col.isna().any():
+                df[field.name] = col.astype(np.int64)
+    return df
+
+
+def read_dbf_native(
+    path: Path,
+    usecols: list[str] | None = None,
+    encoding: str | None = None,
+    output: Literal["pandas", "arrow"] = "pandas",
+):
+    """
+    Lee un .dbf completo en proceso, sin convertirlo antes a CSV.
+
+    Parameters
+    ----------
+    path : str | Path
+        Ruta al archivo .dbf.
+    usecols : list[str], optional
+        Campos a leer. Por defecto, todos.
+    encoding : str, optional
+        Codificación del texto. Por defecto se toma de la cabecera (o cp850).
+    output : {"pandas", "arrow"}, default "pandas"
+        Retorna un `pd.DataFrame` o una `pyarrow.Table`.
+    """
+    header = read_dbf_header(path)
+    batches = list(iter_dbf_batches(path, usecols=usecols, encoding=encoding))
+    df = batches[0] if len(batches) == 1 else pd.concat(batches, ignore_index=True)
+    df = _as_integers(df, header.fields)
+    if output == "arrow":
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df
@@ -0,0 +1,52 @@
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+_PANDAS_MAJOR = int(pd.__version__.split(".")[0])
+
+
+@contextmanager
+def copy_on_write():
+    """
+    Activa copy-on-write mientras dura el bloque y restaura el valor anterior
+    al salir. En pandas >= 3 siempre está activo y no se toca nada.
+
+    En pandas < 3 la opción es global del proceso (pandas no tiene una por
+    hilo): mientras el bloque está abierto también rige para otros hilos que
+    usen pandas. Si ya estaba activa no se cambia.
+    """
+    if _PANDAS_MAJOR >= 3 or pd.get_option("mode.copy_on_write") is True:
+        yield
+        return
+    with pd.option_context("mode.copy_on_write", True):
+        yield
+
+
+class PeakMemory:
+    """
+    Mide con tracemalloc la memoria máxima asignada dentro de un bloque
+    (NumPy y pandas registran sus arreglos en tracemalloc).
+
+    Uso:
+        with PeakMemory() as peak:
+            ...
+        peak.bytes  # pico por encima de la memoria al entrar al bloque
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self._started = False
+        self._baseline = 0
+
+    def __enter__(self) -> "PeakMemory":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.bytes = max(tracemalloc.get_traced_memory()[1] - self._baseline, 0)
+        if self._started:
+            tracemalloc.stop()
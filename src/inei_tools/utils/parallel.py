@@ -0,0 +1,15 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Pool de procesos que arranca cada worker con "spawn".
+
+    Con "fork" (el método por defecto en Linux) el hijo copia la memoria del
+    proceso pero no sus hilos: si el padre ya tenía un pool de hilos (Polars,
+    Arrow, BLAS) con un lock tomado, el worker se bloquea para siempre.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
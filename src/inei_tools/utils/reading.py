@@ -1,36 +1,265 @@
-import subprocess
+import math
+import os
+from pathlib import Path
 import pyreadstat
 import pandas as pd
+from .csv_tools import sniff_csv
+from .dbf import iter_dbf_batches, read_dbf_native
+from .parallel import process_pool
 
-def read_dbf(input_path: str, output_path: str, encoding="cp850", out_encoding="utf8"):
-    cmd = [
-        "dbf2csv",
-        input_path,
-        output_path,
-        "-ie", encoding,
-        "-oe", out_encoding,
-        "-q", "all",
-        "-d", ","
-    ]
-    subprocess.run(cmd, check=True)
+def read_dbf(input_path, usecols=None, encoding=None, output="pandas"):
+    """
+    Lee un archivo DBF (.dbf) en proceso, sin pasar por `dbf2csv` ni por un CSV temporal.
+
+    Parámetros:
+    - input_path (str | Path): Ruta al archivo .dbf
+    - usecols (list[str] | None): Si se especifica, solo se decodifican esas columnas
+    - encoding (str | None): Codificación del texto; por defecto la de la cabecera o cp850
+    - output ("pandas" | "arrow"): Retorna un DataFrame o una tabla de Arrow
 
-def read_spss(path, apply_labels=False):
+    Retorna:
+    - df (DataFrame | pyarrow.Table): Datos
+    """
+    return read_dbf_native(input_path, usecols=usecols, encoding=encoding, output=output)
+
+def read_spss(path, apply_labels=False, usecols=None):
     """
     Lee un archivo SPSS (.sav) y conserva etiquetas.
     
     Parámetros:
     - path (str): Ruta al archivo .sav o .zsav
     - apply_labels (bool): Si True, reemplaza los valores por etiquetas
+    - usecols (list[str] | None): Si se especifica, solo se leen esas columnas
 
     Retorna:
     - df (DataFrame): Datos
     - metadata (dict): Diccionario con value_labels y variable_labels
     """
-    df, meta = pyreadstat.read_sav(path, apply_value_labels=apply_labels)
+    df, meta = pyreadstat.read_sav(
+        path, apply_value_formats=apply_labels, usecols=usecols
+    )
     
     labels = {
         "variable_labels": meta.column_labels,  # nombre descriptivo de variables
         "value_labels": meta.value_labels       # dict con codificación de etiquetas
     }
     
-    return df, labels
\ No newline at end of file
+    return df, labels
+
+def iter_chunks(path, usecols=None, chunksize=100_000, dtype=None):
+    """
+    Lee un archivo (.csv, .dta, .sav, .dbf) por bloques de `chunksize` filas.
+
+    Parámetros:
+    - path (str | Path): Ruta al archivo
+    - usecols (list[str] | None): Columnas a leer (nombres reales del archivo)
+    - chunksize (int): Número de filas por bloque
+    - dtype (dict | None): Tipos fijos por columna para los CSV. pandas infiere los
+      tipos en cada bloque, así que sin ellos una columna puede ser int64 en un
+      bloque y object en otro (y el valor 1 aparecer como 1 y como "1")
+
+    Retorna:
+    - Iterador de DataFrames
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with pd.read_csv(
+            path,
+            **sniff_csv(path).read_csv_kwargs(),
+            usecols=usecols,
+            dtype=dtype,
+            chunksize=chunksize,
+            low_memory=False,
+        ) as reader:
+            yield from reader
+    elif suffix == ".dta":
+        with pd.read_stata(path, columns=usecols, chunksize=chunksize) as reader:
+            yield from reader
+    elif suffix in (".sav", ".zsav"):
+        for df, _ in pyreadstat.read_file_in_chunks(
+            pyreadstat.read_sav, str(path), chunksize=chunksize, usecols=usecols
+        ):
+            yield df
+    elif suffix == ".dbf":
+        yield from iter_dbf_batches(path, usecols=usecols, batch_rows=chunksize)
+    else:
+        raise ValueError(f"Formato no soportado para lectura por bloques: {path.suffix}")
+
+
+def read_csv_arrow(path, dialect=None, usecols=None):
+    """
+    Lee un CSV con el parser multihilo de Arrow y retorna los mismos tipos que
+    `pd.read_csv` (enteros con vacíos como float64, texto como str), para que
+    las categorías y los resultados no dependan del engine.
+
+    El archivo se transcodifica desde su encoding original (cp1252, latin1, ...)
+    mientras se lee, sin pasar por un archivo intermedio.
+
+    Parámetros:
+    - path (str | Path): Ruta al archivo .csv
+    - dialect (CsvDialect | None): Formato del archivo; si es None se detecta con `sniff_csv`
+    - usecols (list[str] | None): Columnas a leer (nombres reales del archivo)
+    """
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError as e:
+        raise ImportError(
+            "engine='pyarrow' requiere pyarrow; instálalo con `pip install pyarrow`"
+        ) from e
+
+    dialect = dialect or sniff_csv(path)
+    read_options = pacsv.ReadOptions(
+        encoding=dialect.encoding, skip_rows=dialect.header, use_threads=True
+    )
+    parse_options = pacsv.ParseOptions(
+        delimiter=dialect.delimiter, quote_char=dialect.quotechar
+    )
+    convert_options = pacsv.ConvertOptions(
+        include_columns=usecols,
+        decimal_point=dialect.decimal,
+        strings_can_be_null=True,
+    )
+    table = pacsv.read_csv(
+        path,
+        read_options=read_options,
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    return table.to_pandas()
+
+
+def _read_rows(path: str, row_offset: int, row_limit: int, usecols=None, apply_value_formats=False):
+    """Lee un rango de filas de un .dta/.sav (se ejecuta en un proceso aparte)."""
+    read_function = pyreadstat.read_dta if path.lower().endswith(".dta") else pyreadstat.read_sav
+    df, _ = read_function(
+        path,
+        usecols=usecols,
+        row_offset=row_offset,
+        row_limit=row_limit,
+        apply_value_formats=apply_value_formats,
+        formats_as_category=True,
+    )
+    return df
+
+
+def read_table(path, usecols=None):
+    """
+    Lee un archivo completo (.csv, .dta, .sav, .dbf) con el lector de su formato.
+
+    Parámetros:
+    - path (str | Path): Ruta al archivo
+    - usecols (list[str] | None): Columnas a leer (nombres reales del archivo)
+
+    Retorna:
+    - df (DataFrame): Datos
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return pd.read_csv(
+            path, **sniff_csv(path).read_csv_kwargs(), usecols=usecols, low_memory=False
+        )
+    elif suffix == ".dta":
+        return pd.read_stata(path, columns=usecols)
+    elif suffix in (".sav", ".zsav"):
+        df, _ = read_spss(str(path), usecols=usecols)
+        return df
+    elif suffix == ".dbf":
+        return read_dbf(path, usecols=usecols)
+    raise ValueError(f"Formato no soportado: {path.suffix}")
+
+
+def _concat_parts(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Une las partes columna por columna: cada columna se copia una sola vez al
+    arreglo final y las partes se liberan en el camino. Las columnas categóricas
+    se unen con `union_categoricals` para que no se conviertan en object.
+    """
+    columns = {}
+    for col in parts[0].columns:
+        values = [part.pop(col) for part in parts]
+        if all(isinstance(v.dtype, pd.CategoricalDtype) for v in values):
+            columns[col] = pd.Series(pd.api.types.union_categoricals(values), name=col)
+        else:
+            columns[col] = pd.concat(values, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _like_read_stata(df: pd.DataFrame, path: str, usecols=None, value_labels=None) -> pd.DataFrame:
+    """
+    Ajusta los tipos que retorna pyreadstat a los de `pd.read_stata`, para que la
+    lectura en paralelo no dependa del tamaño del archivo ni de `read_workers`:
+    categorías ordenadas según el código de su etiqueta (no alfabéticamente),
+    los anchos numéricos de Stata (int8, int16, float32...) y el orden de columnas.
+    """
+    with pd.read_stata(path, columns=usecols, chunksize=1) as reader:
+        reference = reader.read(1).dtypes
+
+    for col, labels in (value_labels or {}).items():
+        if col not in df.columns or not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        codes = {label: code for code, label in labels.items()}
+        present = df[col].cat.remove_unused_categories().cat.categories
+        categories = sorted(present, key=lambda value: codes.get(value, value))
+        df[col] = df[col].cat.set_categories(categories, ordered=True)
+
+    for col, dtype in reference.items():
+        if col not in df.columns or isinstance(dtype, pd.CategoricalDtype) or dtype == df[col].dtype:
+            continue
+        # Como `pd.read_stata`, los enteros con valores faltantes quedan como float64
+        if pd.api.types.is_integer_dtype(dtype) and df[col].isna().any():
+            continue
+        if pd.api.types.is_numeric_dtype(dtype) and pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype(dtype)
+    # pyreadstat respeta el orden del archivo; `pd.read_stata`, el de `columns`
+    return df[list(reference.index)]
+
+
+def read_parallel(path, usecols=None, workers=None, apply_value_formats=None):
+    """
+    Lee un archivo Stata (.dta) o SPSS (.sav) grande repartiendo rangos de filas
+    entre varios procesos (pyreadstat con `row_offset`/`row_limit`).
+
+    Parámetros:
+    - path (str | Path): Ruta al archivo
+    - usecols (list[str] | None): Columnas a leer (nombres reales del archivo)
+    - workers (int | None): Número de procesos; por defecto, os.cpu_count()
+    - apply_value_formats (bool | None): Si True, reemplaza los valores por sus etiquetas
+      (como categorías). Por defecto True para .dta (igual que `pd.read_stata`) y
+      False para .sav (igual que `read_spss`)
+
+    Los .dta con etiquetas retornan los mismos tipos que `pd.read_stata` (ver
+    `_like_read_stata`) y los .sav los mismos que `read_spss`.
+
+    Retorna:
+    - df (DataFrame): Datos
+    """
+    path = str(path)
+    workers = workers or os.cpu_count() or 1
+    is_stata = path.lower().endswith(".dta")
+    read_function = pyreadstat.read_dta if is_stata else pyreadstat.read_sav
+    if apply_value_formats is None:
+        apply_value_formats = is_stata
+    _, meta = read_function(path, metadataonly=True)
+    n_rows = meta.number_rows
+
+    # Algunos .sav no guardan el número de filas: se lee en un solo proceso
+    if not n_rows or workers == 1:
+        df = _read_rows(path, 0, 0, usecols, apply_value_formats)
+    else:
+        rows_per_worker = math.ceil(n_rows / workers)
+        offsets = range(0, n_rows, rows_per_worker)
+        with process_pool(len(offsets)) as executor:
+            futures = [
+                executor.submit(
+                    _read_rows, path, offset, rows_per_worker, usecols, apply_value_formats
+                )
+                for offset in offsets
+            ]
+            parts = [future.result() for future in futures]
+        df = _concat_parts(parts)
+
+    if is_stata and apply_value_formats:
+        df = _like_read_stata(df, path, usecols, meta.variable_value_labels)
+    return df
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+import pandas as pd
+from .cache import cache_dir, file_hash
+
+
+class TableCache:
+    """
+    Caché persistente de tablas ya leídas (formato Arrow IPC sin comprimir).
+
+    Cada entrada se indexa por el hash del contenido del archivo fuente, las
+    opciones de lectura y las columnas proyectadas, así que un archivo que no
+    cambió no se vuelve a parsear. Las lecturas usan memory-map y, cuando el
+    total supera `max_bytes`, se eliminan las entradas menos usadas (LRU).
+
+    Parameters
+    ----------
+    directory : str | Path, optional
+        Carpeta de la caché. Por defecto: `<cache_dir()>/tables`.
+    max_bytes : int, default 5 GB
+        Tamaño máximo total de las tablas guardadas.
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_bytes: int = 5 * 1024**3):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(
+                "La caché de tablas requiere pyarrow; instálalo con `pip install pyarrow`"
+            ) from e
+
+        self.directory = Path(directory) if directory else cache_dir() / "tables"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, file TEXT, size INTEGER, last_access REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.directory / "index.sqlite", timeout=30)
+
+    def key(self, path: Path, **options) -> str:
+        """
+        Clave de la tabla: hash del archivo + opciones de lectura (ej. engine,
+        columns, reader) que cambian el DataFrame resultante.
+        """
+        payload = json.dumps(
+            {"hash": file_hash(path), "suffix": Path(path).suffix.lower(), **options},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str, arrow_dtypes: bool = False) -> pd.DataFrame | None:
+        """Retorna la tabla guardada (o None si no existe)."""
+        import pyarrow as pa
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT file FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            file = self.directory / row[0]
+            if not file.exists():
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+
+        with pa.memory_map(str(file), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        logging.info(f"⚡ Tabla leída desde la caché ({file.name})")
+        if arrow_dtypes:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Guarda la tabla y aplica la política LRU si se supera `max_bytes`."""
+        import pyarrow as pa
+
+        file_name = f"{key}.arrow"
+        tmp_file = self.directory / f"{file_name}.tmp"
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(str(tmp_file), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        except (pa.ArrowException, OSError) as e:
+            # Ej. columnas object con tipos mezclados: la tabla se usa igual, sin caché
+            logging.info(f"No se pudo guardar la tabla en la caché: {e}")
+            tmp_file.unlink(missing_ok=True)
+            return
+        tmp_file.replace(self.directory / file_name)
+
+        size = (self.directory / file_name).stat().st_size
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, file_name, size, time.time()),
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                "SELECT key, file, size FROM entries ORDER BY last_access DESC"
+            ).fetchall()
+            total = 0
+            for key, file_name, size in rows:
+                total += size
+                if total > self.max_bytes:
+                    (self.directory / file_name).unlink(missing_ok=True)
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Elimina todas las tablas guardadas."""
+        with closing(self._connect()) as conn, conn:
+            for (file_name,) in conn.execute("SELECT file FROM entries").fetchall():
+                (self.directory / file_name).unlink(missing_ok=True)
+            conn.execute("DELETE FROM entries")
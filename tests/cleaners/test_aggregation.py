@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners._aggregation import count_grid, parse_factor
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 5_000
+    return pd.DataFrame(
+        {
+            "Departamento": pd.Categorical(rng.choice(["Lima", "Cusco", "Puno"], n)),
+            "P1": pd.Categorical(rng.choice(["1", "2", "3"], n)),
+            "FACTOR07": rng.uniform(10, 300, n),
+        }
+    )
+
+
+class TestParseFactor:
+    def test_decimal_comma(self):
+        """Acepta coma decimal y deja como NaN los valores vacíos."""
+        parsed = parse_factor(pd.Series(["123,5", "10", None]))
+        assert parsed.dtype == "float64"
+        assert parsed.iloc[0] == 123.5
+        assert parsed.iloc[1] == 10.0
+        assert np.isnan(parsed.iloc[2])
+
+    def test_numeric_untouched(self):
+        values = pd.Series([1.5, 2.0])
+        pd.testing.assert_series_equal(parse_factor(values), values)
+
+
+class TestCountGrid:
+    def test_matches_groupby(self, sample: pd.DataFrame):
+        """Los conteos con y sin factor coinciden con groupby + unstack."""
+        grid = count_grid(sample["P1"], groups=sample["Departamento"], weights=sample["FACTOR07"])
+        grouped = sample.groupby(["Departamento", "P1"], observed=True)
+
+        expected_counts = grouped.size().unstack()
+        np.testing.assert_array_equal(grid.counts, expected_counts.to_numpy())
+
+        expected_weighted = grouped["FACTOR07"].sum().unstack()
+        np.testing.assert_allclose(grid.weighted, expected_weighted.to_numpy())
+        assert list(grid.groups) == list(expected_weighted.index)
+        assert list(grid.categories) == list(expected_weighted.columns)
+
+    def test_observed_drops_empty(self, sample: pd.DataFrame):
+        """Grupos y categorías sin filas se eliminan y los NA no se cuentan."""
+        sample["P1"] = sample["P1"].cat.add_categories(["9"])
+        sample.loc[sample["Departamento"] == "Puno", "P1"] = None
+
+        grid = count_grid(sample["P1"], groups=sample["Departamento"]).observed()
+        assert list(grid.groups) == ["Cusco", "Lima"]
+        assert list(grid.categories) == ["1", "2", "3"]
+        assert grid.counts.sum() == (sample["Departamento"] != "Puno").sum()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
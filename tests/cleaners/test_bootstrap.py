@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import BootstrapReplicates, estimate_proportions
+from inei_tools.cleaners._design import SurveyDesign
+from inei_tools.configs.encuesta_config import EnahoConfig
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    psu = np.repeat(np.arange(60), 5)
+    n = len(psu)
+    return pd.DataFrame(
+        {
+            "CONGLOME": psu,
+            "ESTRATO": psu % 3,
+            "FACTOR07": rng.uniform(20, 200, n),
+            "GASTO": np.where(rng.random(n) < 0.05, np.nan, rng.lognormal(7, 1, n)),
+            "POBRE": rng.integers(0, 2, n).astype(float),
+            "Departamento": rng.choice(["Cusco", "Lima"], n),
+            "P1": rng.choice(["1", "2"], n),
+        }
+    )
+
+
+@pytest.fixture
+def replicates(sample: pd.DataFrame) -> BootstrapReplicates:
+    design = SurveyDesign.from_frame(sample, EnahoConfig())
+    return BootstrapReplicates(design, replicates=120, seed=0)
+
+
+def replicate_weights(replicates: BootstrapReplicates, r: int) -> np.ndarray:
+    """Pesos de la réplica r, calculados fila por fila (referencia lenta)."""
+    design = replicates.design
+    return np.array(
+        [
+            np.float32(design.weights[i]) * replicates.multipliers[design.psu[i], r]
+            for i in range(len(design.psu))
+        ],
+        dtype=np.float32,
+    )
+
+
+class TestBootstrapReplicates:
+    def test_weights_and_ratio(self, replicates: BootstrapReplicates, sample: pd.DataFrame):
+        weights = replicates.weights()
+        y, x = sample["POBRE"].to_numpy(), np.ones(len(sample))
+        ratios = replicates.ratio(y, x)
+        for r in range(replicates.replicates):
+            w = replicate_weights(replicates, r)
+            np.testing.assert_array_equal(weights[:, r], w)
+            assert ratios[r] == pytest.approx((w * y).sum() / (w * x).sum(), rel=1e-5)
+
+    def test_quantile(self, replicates: BootstrapReplicates, sample: pd.DataFrame):
+        """Cuantil ponderado: primer valor cuyo peso acumulado alcanza q del total."""
+        values = sample["GASTO"].to_numpy()
+        result = replicates.quantile(values, q=0.5)
+        keep = ~np.isnan(values)
+        order = np.argsort(values[keep], kind="stable")
+        for r in range(replicates.replicates):
+            w = replicate_weights(replicates, r)[keep][order].astype(np.float64)
+            cumulative = np.cumsum(w)
+            expected = values[keep][order][np.argmax(cumulative >= 0.5 * cumulative[-1])]
+            assert result[r] == expected
+
+    def test_workers(self, replicates: BootstrapReplicates, sample: pd.DataFrame):
+        """Con workers > 1 los bloques de réplicas se evalúan en procesos y no cambia nada."""
+        values = sample["GASTO"].to_numpy()
+        cells = (sample["P1"] == "1").to_numpy().astype(np.int64)
+        expected_quantile = replicates.quantile(values, q=0.9)
+        expected_totals = replicates.totals(cells, 2)
+
+        replicates.workers = 2
+        np.testing.assert_array_equal(replicates.quantile(values, q=0.9), expected_quantile)
+        np.testing.assert_allclose(replicates.totals(cells, 2), expected_totals, rtol=1e-6)
+
+        serial = estimate_proportions(
+            sample, ["P1"], EnahoConfig(), method="bootstrap", replicates=120, seed=0
+        )
+        parallel = estimate_proportions(
+            sample, ["P1"], EnahoConfig(), method="bootstrap", replicates=120, seed=0, workers=2
+        )
+        pd.testing.assert_frame_equal(parallel, serial, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
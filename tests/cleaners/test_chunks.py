@@ -0,0 +1,64 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner, _ubigeo
+
+
+@pytest.fixture(autouse=True)
+def resolver(monkeypatch):
+    """Resolución fija de departamentos (sin ubigeos_peru)."""
+    monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+    monkeypatch.setattr(
+        _ubigeo, "_departamento", lambda code: "Lima" if code.startswith("15") else "Amazonas"
+    )
+
+
+def write_csv(path: Path, blank: str | None) -> Path:
+    rng = np.random.default_rng(0)
+    n = 4_000
+    values = rng.choice([1, 2], n).astype(object)
+    if blank is not None:
+        # Un solo vacío en el último bloque: los bloques anteriores se infieren como
+        # int64. Con " " la columna completa es texto; con un campo vacío, float
+        values[3_500] = blank
+    pd.DataFrame(
+        {
+            "AÑO": 2023,
+            "UBIGEO": rng.choice([10101, 150101], n),
+            "FACTOR07": rng.uniform(1, 9, n).round(2),
+            "P1": values,
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def cleaner() -> EncuestaCleaner:
+    cleaner = EncuestaCleaner("enaho")
+    cleaner.target_variable_id = "P1"
+    return cleaner
+
+
+class TestAggregateInChunks:
+    @pytest.mark.parametrize("blank", [" ", "", None])
+    def test_matches_in_memory(self, tmp_path: Path, blank: str | None):
+        """Por bloques da el mismo resultado que leyendo todo el archivo."""
+        path = write_csv(tmp_path / "enaho_85_2023.csv", blank)
+        expected = (
+            cleaner().initialize(path).remove_nas().add_departamentos()
+            .group_by_departamento(with_year=False).get_df()
+        )
+        result = (
+            cleaner().aggregate_in_chunks(path, chunksize=1_000)
+            .group_by_departamento(with_year=False).get_df()
+        )
+        pd.testing.assert_frame_equal(result, expected)
+
+        expected = cleaner().initialize(path).remove_nas().count_categories(with_factor=False)
+        result = cleaner().aggregate_in_chunks(path, chunksize=1_000)
+        result.count_categories(with_factor=False)
+        pd.testing.assert_frame_equal(result.get_df(), expected.get_df())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner, IndicatorCube, _ubigeo
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 4_000
+    return pd.DataFrame(
+        {
+            "Departamento": rng.choice(["Cusco", "Lima", "Puno"], n),
+            "AREA": rng.choice(["Urbana", "Rural"], n),
+            "EDAD": rng.integers(14, 90, n),
+            "AÑO": rng.choice([2022, 2023], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "P1": rng.choice(["1", "2", "3"], n),
+        }
+    )
+
+
+@pytest.fixture
+def cube(sample: pd.DataFrame) -> IndicatorCube:
+    return IndicatorCube.build(
+        sample, "P1", ["Departamento", "AREA", "EDAD", "AÑO"],
+        weight_column="FACTOR07", bins={"EDAD": [0, 29, 59, 120]},
+    )
+
+
+class TestIndicatorCube:
+    def test_shape(self, cube: IndicatorCube):
+        assert cube.shape == (3, 2, 3, 2, 3)
+
+    def test_aggregate_matches_groupby(self, sample: pd.DataFrame, cube: IndicatorCube):
+        """Sumar ejes del cubo da lo mismo que agrupar los microdatos."""
+        result = cube.aggregate("AÑO", "Departamento").to_frame(percentage=False)
+        expected = (
+            sample.groupby(["AÑO", "Departamento", "P1"])["FACTOR07"].sum().unstack().reset_index()
+        )
+        np.testing.assert_allclose(result[["1", "2", "3"]], expected[["1", "2", "3"]])
+        assert list(result["AÑO"]) == list(expected["AÑO"])
+
+    def test_slice(self, sample: pd.DataFrame, cube: IndicatorCube):
+        rural = cube.slice(AREA="Rural", AÑO=[2023]).aggregate("Departamento")
+        table = rural.to_frame(with_factor=False, percentage=False)
+        subset = sample[(sample["AREA"] == "Rural") & (sample["AÑO"] == 2023)]
+        expected = subset.groupby(["Departamento", "P1"]).size().unstack()
+        np.testing.assert_array_equal(table[["1", "2", "3"]], expected.to_numpy())
+
+        percentages = rural.to_frame()
+        np.testing.assert_allclose(percentages[["1", "2", "3"]].sum(axis=1), 100)
+
+    def test_combinations(self, cube: IndicatorCube):
+        tables = cube.combinations(max_dimensions=1)
+        assert set(tables) == {(), ("Departamento",), ("AREA",), ("EDAD",), ("AÑO",)}
+        assert len(tables[()]) == 1
+
+
+class TestCleanerCube:
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_from_path(self, sample: pd.DataFrame, lazy: bool, tmp_path, monkeypatch):
+        """Las dimensiones fuera de las columnas de la variable (ej. AREA) se leen del archivo."""
+        monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+        monkeypatch.setattr(
+            _ubigeo, "_departamento", lambda code: "Lima" if code.startswith("15") else "Cusco"
+        )
+        df = sample.drop(columns="Departamento").assign(
+            UBIGEO=np.where(sample["Departamento"] == "Lima", "150101", "080101")
+        )
+        path = tmp_path / "enaho_85_2023.csv"
+        df.to_csv(path, index=False)
+
+        cleaner = EncuestaCleaner("enaho", lazy=lazy)
+        cleaner.target_variable_id = "P1"
+        cube = cleaner.initialize(path).add_departamentos().build_cube(["Departamento", "AREA"])
+        table = cube.aggregate("Departamento").to_frame(percentage=False)
+        expected = (
+            sample.assign(Departamento=sample["Departamento"].replace("Puno", "Cusco"))
+            .groupby(["Departamento", "P1"])["FACTOR07"].sum().unstack()
+        )
+        assert cube.shape == (2, 2, 3)
+        # El CSV se lee con P1 numérico: las categorías son 1, 2, 3
+        np.testing.assert_allclose(table[[1, 2, 3]], expected[["1", "2", "3"]])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
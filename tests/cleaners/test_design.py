@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner, estimate_proportions
+from inei_tools.configs.encuesta_config import EnahoConfig
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    psu = np.repeat(np.arange(120), 8)
+    n = len(psu)
+    return pd.DataFrame(
+        {
+            "CONGLOME": psu,
+            "ESTRATO": psu % 4,
+            "FACTOR07": rng.uniform(20, 200, n),
+            "Departamento": rng.choice(["Cusco", "Lima"], n),
+            "P1": rng.choice(["1", "2", " "], n, p=[0.6, 0.35, 0.05]),
+        }
+    )
+
+
+def naive_se(df: pd.DataFrame, departamento: str, categoria: str) -> float:
+    """Linealización de Taylor celda por celda (referencia lenta)."""
+    df = df[df["P1"].str.strip() != ""]
+    w = df["FACTOR07"] * (df["Departamento"] == departamento)
+    y = w * (df["P1"] == categoria)
+    p = y.sum() / w.sum()
+    z = ((y - p * w) / w.sum()).groupby([df["ESTRATO"], df["CONGLOME"]]).sum()
+    var = sum(
+        len(g) / (len(g) - 1) * ((g - g.mean()) ** 2).sum() for _, g in z.groupby(level=0)
+    )
+    return np.sqrt(var) * 100
+
+
+class TestEstimateProportions:
+    def test_matches_naive(self, sample: pd.DataFrame):
+        """Estimados y errores estándar coinciden con el cálculo celda por celda."""
+        result = estimate_proportions(sample, ["P1"], EnahoConfig())
+        assert set(result["categoria"]) == {"1", "2"}
+        for _, row in result.iterrows():
+            expected = naive_se(sample, row["Departamento"], row["categoria"])
+            assert row["error_estandar"] == pytest.approx(expected)
+
+        totals = result.groupby("Departamento")["estimado"].sum()
+        np.testing.assert_allclose(totals, 100)
+
+    def test_interval_and_flag(self, sample: pd.DataFrame):
+        result = estimate_proportions(sample, ["P1"], EnahoConfig(), by=None, cv_max=0.1)
+        assert list(result["Ambito"].unique()) == ["Nacional"]
+        half_width = result["ic_superior"] - result["estimado"]
+        np.testing.assert_allclose(half_width, 1.959964 * result["error_estandar"], rtol=1e-6)
+        assert result["referencial"].all()
+
+    def test_bootstrap_close_to_taylor(self, sample: pd.DataFrame):
+        """Las réplicas bootstrap dan errores estándar cercanos a los de Taylor."""
+        taylor = estimate_proportions(sample, ["P1"], EnahoConfig())
+        bootstrap = estimate_proportions(
+            sample, ["P1"], EnahoConfig(), method="bootstrap", replicates=2000, seed=0
+        )
+        pd.testing.assert_series_equal(taylor["estimado"], bootstrap["estimado"])
+        np.testing.assert_allclose(
+            bootstrap["error_estandar"], taylor["error_estandar"], rtol=0.15
+        )
+
+    def test_cleaner_from_path(self, sample: pd.DataFrame, tmp_path):
+        """Desde un archivo se leen también las otras `variables`, el estrato y el conglomerado."""
+        path = tmp_path / "enaho_85_2023.csv"
+        sample.assign(AÑO=2023, P2=sample["P1"].iloc[::-1].to_numpy()).to_csv(path, index=False)
+
+        cleaner = EncuestaCleaner("enaho")
+        cleaner.target_variable_id = "P1"
+        result = cleaner.initialize(path).estimate_proportions(variables=["P1", "P2"]).get_df()
+        expected = estimate_proportions(pd.read_csv(path), ["P1", "P2"], EnahoConfig())
+        pd.testing.assert_frame_equal(result, expected)
+        assert set(result["variable"]) == {"P1", "P2"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import distribution_stats
+
+
+@pytest.fixture
+def sumaria() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 600
+    return pd.DataFrame(
+        {
+            "AÑO": rng.choice([2022, 2023], n),
+            "Departamento": rng.choice(["Cusco", "Lima"], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "GPC": rng.lognormal(6, 0.8, n),
+        }
+    )
+
+
+class TestDistributionStats:
+    def test_matches_pairwise_gini(self, sumaria: pd.DataFrame):
+        """Gini, mediana y media coinciden con las fórmulas directas en cada grupo."""
+        by = ["AÑO", "Departamento"]
+        result = distribution_stats(sumaria, "GPC", "FACTOR07", by=by).set_index(by)
+        for key, group in sumaria.groupby(by):
+            v, w = group["GPC"].to_numpy(), group["FACTOR07"].to_numpy()
+            mean = np.average(v, weights=w)
+            gini = (w[:, None] * w[None, :] * np.abs(v[:, None] - v[None, :])).sum() / (
+                2 * w.sum() ** 2 * mean
+            )
+            order = np.argsort(v)
+            median = v[order][np.searchsorted(np.cumsum(w[order]), w.sum() / 2)]
+            row = result.loc[key]
+            assert row["media"] == pytest.approx(mean)
+            assert row["gini"] == pytest.approx(gini)
+            assert row["p50"] == pytest.approx(median)
+            assert row[[f"d{i}" for i in range(1, 11)]].sum() == pytest.approx(100)
+
+    def test_pooled_years_equal_single_frame(self, sumaria: pd.DataFrame):
+        years = [sumaria[sumaria["AÑO"] == year] for year in (2022, 2023)]
+        pooled = distribution_stats(years, "GPC", "FACTOR07", by=["AÑO"])
+        single = distribution_stats(sumaria, "GPC", "FACTOR07", by=["AÑO"])
+        pd.testing.assert_frame_equal(pooled, single)
+
+    def test_equal_values(self):
+        """Sin desigualdad: Gini y Theil son 0 y cada decil tiene el 10%."""
+        df = pd.DataFrame({"GPC": [100.0] * 20, "FACTOR07": [1.0] * 20})
+        result = distribution_stats(df, "GPC", "FACTOR07").iloc[0]
+        assert result["gini"] == pytest.approx(0, abs=1e-12)
+        assert result["theil"] == pytest.approx(0, abs=1e-12)
+        assert result["d1"] == pytest.approx(10)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 10_000
+    return pd.DataFrame(
+        {
+            "AÑO": 2023,
+            "UBIGEO": rng.choice(["010101", "150101"], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "P1": rng.choice(["1", "2", " ", ""], n).astype(object),
+        }
+    )
+
+
+class TestFrugalCleaner:
+    def test_same_result(self, sample: pd.DataFrame):
+        """El modo frugal da el mismo resultado; el perfil de memoria se activa aparte."""
+        def run(frugal: bool, profile_memory: bool = False) -> EncuestaCleaner:
+            cleaner = EncuestaCleaner("enaho", frugal=frugal, profile_memory=profile_memory)
+            cleaner.target_variable_id = "P1"
+            return cleaner.initialize(sample.copy()).remove_nas().add_factor()
+
+        normal, frugal = run(False), run(True)
+        pd.testing.assert_frame_equal(normal.df, frugal.df)
+        assert normal.df_original is not None and frugal.df_original is None
+        # Sin profile_memory no se mide nada (tracemalloc es costoso)
+        assert normal.memory_usage().empty and frugal.memory_usage().empty
+
+        profiled = run(True, profile_memory=True)
+        pd.testing.assert_frame_equal(profiled.df, frugal.df)
+        report = profiled.memory_usage()
+        assert list(report["step"]) == ["initialize", "remove_nas", "add_factor"]
+        assert (report["peak_bytes"] > 0).all()
+
+    def test_remove_nas_drops_blanks(self, sample: pd.DataFrame):
+        cleaner = EncuestaCleaner("enaho", frugal=True)
+        cleaner.target_variable_id = "P1"
+        df = cleaner.initialize(sample).remove_nas().df
+        assert list(df["P1"].cat.categories) == ["1", "2"]
+        assert df["P1"].notna().all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
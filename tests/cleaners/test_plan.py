@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner, _ubigeo
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 5_000
+    return pd.DataFrame(
+        {
+            "AÑO": 2023,
+            "UBIGEO": rng.choice(["010101", "150101"], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "P1": rng.choice(["1", "2", "3", " "], n).astype(object),
+            "OTRA": 1,
+        }
+    )
+
+
+def lazy_cleaner() -> EncuestaCleaner:
+    cleaner = EncuestaCleaner("enaho", lazy=True)
+    cleaner.target_variable_id = "P1"
+    return cleaner
+
+
+class TestQueryPlan:
+    def test_optimized_plan(self, sample: pd.DataFrame):
+        """Filtros primero, mapeo fusionado con la agregación y columnas empujadas al lector."""
+        cleaner = lazy_cleaner()
+        cleaner.initialize(sample).add_departamentos().remove_nas().filter_by_variable()
+        cleaner.group_by_departamento().to_row_percentage()
+        steps = cleaner.explain().splitlines()
+        assert steps == [
+            "1. initialize(columns=['AÑO', 'FACTOR07', 'P1', 'UBIGEO'])",
+            "2. remove_nas()",
+            "3. _group_by_new_departamentos(with_year=True, with_factor=True)",
+            "4. to_row_percentage()",
+        ]
+
+    def test_unused_mapping_dropped(self, sample: pd.DataFrame):
+        cleaner = lazy_cleaner()
+        cleaner.initialize(sample).remove_nas().add_departamentos().filter_by_variable()
+        cleaner.count_categories(with_factor=False)
+        assert cleaner.explain().splitlines() == [
+            "1. initialize(columns=['AÑO', 'P1'])",
+            "2. remove_nas()",
+            "3. count_categories(with_factor=False, percentage=True)",
+        ]
+
+    def test_same_result_as_eager(self, sample: pd.DataFrame):
+        eager = EncuestaCleaner("enaho")
+        eager.target_variable_id = "P1"
+        expected = eager.initialize(sample).remove_nas().add_factor().get_df()
+
+        cleaner = lazy_cleaner().initialize(sample).remove_nas().add_factor()
+        assert cleaner.plan.steps  # nada se ejecutó todavía
+        pd.testing.assert_frame_equal(cleaner.get_df(), expected)
+        assert not cleaner.plan.steps
+
+    def test_fused_departamentos_on_csv(self, sample: pd.DataFrame, tmp_path, monkeypatch):
+        """El paso fusionado y las columnas empujadas a la lectura del CSV dan lo mismo."""
+        monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+        monkeypatch.setattr(
+            _ubigeo, "_departamento", lambda code: "Lima" if code.startswith("15") else "Amazonas"
+        )
+        path = tmp_path / "enaho_85_2023.csv"
+        sample.to_csv(path, index=False)
+
+        def chain(cleaner: EncuestaCleaner) -> EncuestaCleaner:
+            cleaner.initialize(path).remove_nas().add_departamentos()
+            return cleaner.group_by_departamento().to_row_percentage()
+
+        eager = EncuestaCleaner("enaho")
+        eager.target_variable_id = "P1"
+        expected = chain(eager).get_df()
+
+        cleaner = chain(lazy_cleaner())
+        assert "_group_by_new_departamentos" in cleaner.explain()
+        assert "columns=['AÑO', 'FACTOR07', 'P1', 'UBIGEO']" in cleaner.explain()
+        pd.testing.assert_frame_equal(cleaner.get_df(), expected)
+
+
+class TestPolarsEngine:
+    def test_same_result_as_pandas(self, sample: pd.DataFrame):
+        """engine="polars" retorna el mismo DataFrame que el flujo en pandas."""
+        pytest.importorskip("polars")
+        expected = EncuestaCleaner("enaho")
+        expected.target_variable_id = "P1"
+        expected.initialize(sample).remove_nas().count_categories(with_factor=False)
+
+        cleaner = EncuestaCleaner("enaho", engine="polars")
+        cleaner.target_variable_id = "P1"
+        cleaner.initialize(sample).remove_nas().count_categories(with_factor=False)
+        pd.testing.assert_frame_equal(cleaner.get_df(), expected.get_df(), check_dtype=False)
+
+    @pytest.mark.parametrize("suffix", [".csv", ".dta"])
+    def test_department_percentages(self, sample: pd.DataFrame, suffix: str, tmp_path, monkeypatch):
+        """
+        Tabla por departamento en porcentajes, leyendo un CSV (scan) o un .dta
+        cuyas etiquetas no están en orden alfabético (se conserva su orden).
+        """
+        pytest.importorskip("polars")
+        monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+        monkeypatch.setattr(
+            _ubigeo, "_departamento", lambda code: "Lima" if code.startswith("15") else "Amazonas"
+        )
+        path = tmp_path / f"enaho_85_2023{suffix}"
+        if suffix == ".csv":
+            sample.to_csv(path, index=False)
+        else:
+            sample = sample.drop(columns="OTRA")
+            sample["P1"] = pd.Categorical(sample["P1"], categories=["3", "2", "1", " "])
+            sample.to_stata(path, write_index=False, version=118)
+
+        def chain(cleaner: EncuestaCleaner) -> EncuestaCleaner:
+            cleaner.target_variable_id = "P1"
+            cleaner.initialize(path).remove_nas().add_departamentos()
+            return cleaner.group_by_departamento().to_row_percentage()
+
+        expected = chain(EncuestaCleaner("enaho")).get_df()
+        result = chain(EncuestaCleaner("enaho", engine="polars")).get_df()
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
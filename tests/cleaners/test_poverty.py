@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import estimate_proportions, poverty_indicators
+from inei_tools.configs.encuesta_config import EnahoConfig
+
+
+@pytest.fixture
+def sumaria() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    psu = np.repeat(np.arange(200), 6)
+    n = len(psu)
+    return pd.DataFrame(
+        {
+            "AÑO": np.where(psu < 100, 2022, 2023),
+            "CONGLOME": psu,
+            "ESTRATO": psu % 5,
+            "Departamento": rng.choice(["Cusco", "Lima"], n),
+            "FACTOR07": rng.uniform(20, 300, n),
+            "MIEPERHO": rng.integers(1, 7, n),
+            "GASHOG2D": rng.lognormal(9.5, 0.7, n),
+            "LINEA": 400.0,
+        }
+    )
+
+
+class TestPovertyIndicators:
+    def test_fgt_values(self, sumaria: pd.DataFrame):
+        """FGT0/1/2 del total coinciden con el cálculo directo por persona."""
+        result = poverty_indicators(sumaria, EnahoConfig()).set_index("indicador")
+        weights = sumaria["FACTOR07"] * sumaria["MIEPERHO"]
+        gpc = sumaria["GASHOG2D"] / (12 * sumaria["MIEPERHO"])
+        poor = gpc < sumaria["LINEA"]
+        gap = (1 - gpc / sumaria["LINEA"]) * poor
+        for name, values in [("fgt0", poor), ("fgt1", gap), ("fgt2", gap**2)]:
+            expected = np.average(values, weights=weights) * 100
+            assert result.loc[name, "estimado"] == pytest.approx(expected)
+
+    def test_fgt0_se_matches_proportions(self, sumaria: pd.DataFrame):
+        """El error estándar de la incidencia es el de la proporción de pobres."""
+        sumaria["LINEA_ANUAL"] = sumaria["LINEA"] * 40
+        result = poverty_indicators(
+            sumaria, EnahoConfig(), groupings=[["Departamento"]],
+            line_column="LINEA_ANUAL", members_column=None, per_capita=False,
+        )
+        result = result[result["indicador"] == "fgt0"]
+        sumaria["POBRE"] = np.where(sumaria["GASHOG2D"] < sumaria["LINEA_ANUAL"], "1", "0")
+        expected = estimate_proportions(sumaria, ["POBRE"], EnahoConfig())
+        expected = expected[expected["categoria"] == "1"]
+        np.testing.assert_allclose(result["error_estandar"], expected["error_estandar"])
+
+    def test_pooled_years(self, sumaria: pd.DataFrame):
+        """Una lista de años da lo mismo que un solo DataFrame con estratos por año."""
+        years = [sumaria[sumaria["AÑO"] == year] for year in (2022, 2023)]
+        pooled = poverty_indicators(years, EnahoConfig(), groupings=[["AÑO"]])
+        nested = sumaria.assign(ESTRATO=sumaria["ESTRATO"] * 10 + sumaria["AÑO"] - 2022)
+        single = poverty_indicators(nested, EnahoConfig(), groupings=[["AÑO"]])
+        pd.testing.assert_frame_equal(pooled, single)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import _ubigeo, geographic_rollup
+from inei_tools.configs.encuesta_config import EnahoConfig
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 3_000
+    return pd.DataFrame(
+        {
+            "UBIGEO": rng.choice([10101, 10102, 80101, 80801, 150101, "150201"], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "P1": rng.choice(["1", "2", " "], n),
+        }
+    )
+
+
+class TestGeographicRollup:
+    def test_levels_match_direct_groupby(self, sample: pd.DataFrame):
+        """Cada nivel derivado de los distritos coincide con agregar los microdatos."""
+        result = geographic_rollup(sample, "P1", EnahoConfig(), names=False)
+        result = result[result["nivel"] == "provincia"].set_index(["ubigeo", "P1"])["total"]
+
+        valid = sample[sample["P1"].str.strip() != ""]
+        prefix = valid["UBIGEO"].astype(str).str.zfill(6).str[:4]
+        expected = valid.groupby([prefix, "P1"])["FACTOR07"].sum()
+        np.testing.assert_allclose(result.sort_index(), expected.sort_index())
+
+    def test_departamentos_match_map_departamentos(self, sample: pd.DataFrame, monkeypatch):
+        """Lima Metropolitana y Lima Región se separan igual que en `map_departamentos`."""
+        monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+        names = {"01": "Amazonas", "08": "Cusco", "1501": "Lima Metropolitana", "15": "Lima Región"}
+        monkeypatch.setattr(
+            _ubigeo, "_departamento", lambda code: names.get(code[:4]) or names[code[:2]]
+        )
+        result = geographic_rollup(sample, "P1", EnahoConfig(), levels=("departamento",))
+        assert dict(zip(result["ubigeo"], result["nombre"])) == {
+            "01": "Amazonas", "08": "Cusco", "1501": "Lima Metropolitana", "15": "Lima Región"
+        }
+
+        valid = sample[sample["P1"].str.strip() != ""]
+        departamentos = _ubigeo.map_departamentos(valid["UBIGEO"])
+        expected = valid.groupby([departamentos, "P1"], observed=True)["FACTOR07"].sum()
+        result = result.set_index(["nombre", "P1"])["total"]
+        np.testing.assert_allclose(result.sort_index(), expected.sort_index())
+
+    def test_national_percentages(self, sample: pd.DataFrame):
+        result = geographic_rollup(
+            sample, "P1", EnahoConfig(), levels=("nacional",), with_factor=False, names=False
+        )
+        assert result["n"].sum() == (sample["P1"] != " ").sum()
+        assert result["porcentaje"].sum() == pytest.approx(100)
+
+    def test_invalid_level(self, sample: pd.DataFrame):
+        with pytest.raises(ValueError):
+            geographic_rollup(sample, "P1", EnahoConfig(), levels=("region",))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+from inei_tools.cleaners import _ubigeo
+
+NOMBRES = {"01": "Amazonas", "08": "Cusco", "15": "Lima Región", "1501": "Lima Metropolitana"}
+
+
+@pytest.fixture(autouse=True)
+def resolver(monkeypatch):
+    """Resolución fija (sin ubigeos_peru) y tablas de búsqueda vacías en cada test."""
+    monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+    monkeypatch.setattr(
+        _ubigeo, "_departamento", lambda code: NOMBRES.get(code[:4]) or NOMBRES[code[:2]]
+    )
+
+
+class TestNormalizeUbigeo:
+    def test_formats(self):
+        for value in (10101, 10101.0, "10101", "010101", " 10101.0 "):
+            assert _ubigeo.normalize_ubigeo(value) == "010101"
+        for value in (None, pd.NA, float("nan"), "", "nan"):
+            assert _ubigeo.normalize_ubigeo(value) is None
+
+
+class TestMapDepartamentos:
+    def test_alphabetical_order(self):
+        """Las categorías no dependen del orden en que aparecen las filas."""
+        series = pd.Series(["150101", "080101", "150201", "010101"])
+        result = _ubigeo.map_departamentos(series)
+        assert list(result.cat.categories) == [
+            "Amazonas", "Cusco", "Lima Metropolitana", "Lima Región"
+        ]
+        assert result.tolist() == ["Lima Metropolitana", "Cusco", "Lima Región", "Amazonas"]
+        reversed_order = _ubigeo.map_departamentos(series.iloc[::-1])
+        assert list(reversed_order.cat.categories) == list(result.cat.categories)
+
+    def test_int_and_na(self):
+        """UBIGEO numérico (sin el 0 inicial) y vacíos -> NA, con el índice original."""
+        series = pd.Series([10101, None, 150101, 10102], index=[5, 6, 7, 8], dtype="Int64")
+        result = _ubigeo.map_departamentos(series)
+        assert result.index.tolist() == [5, 6, 7, 8]
+        assert result.iloc[[0, 2, 3]].tolist() == ["Amazonas", "Lima Metropolitana", "Amazonas"]
+        assert pd.isna(result.iloc[1])
+        assert result.dtype == "category"
+
+
+class TestMapNombres:
+    def test_persistent_memo(self, tmp_path, monkeypatch):
+        """Cada escritura se valida una vez; otra sesión la lee de la caché SQLite."""
+        monkeypatch.setenv("INEI_TOOLS_CACHE_DIR", str(tmp_path / "cache"))
+        monkeypatch.setattr(_ubigeo, "_NOMBRES", {})
+        calls = []
+
+        def validate(raw: str, kind: str) -> str:
+            calls.append(raw)
+            return raw.strip().title()
+
+        monkeypatch.setattr(_ubigeo, "_validate_nombre", validate)
+        series = pd.Series(["LIMA", " cusco", "LIMA", None, " cusco"])
+        result = _ubigeo.map_nombres(series, "departamento")
+        assert result.tolist()[:3] == ["Lima", "Cusco", "Lima"] and pd.isna(result.iloc[3])
+        assert sorted(calls) == [" cusco", "LIMA"]
+
+        # Nueva sesión: sin memo en el proceso, pero con la tabla persistente
+        monkeypatch.setattr(_ubigeo, "_NOMBRES", {})
+        calls.clear()
+        _ubigeo.map_nombres(series, "departamento")
+        assert calls == []
+        _ubigeo.map_nombres(pd.Series(["LIMA"]), "provincia")
+        assert calls == ["LIMA"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
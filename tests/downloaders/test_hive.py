@@ -0,0 +1,101 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.downloaders import Downloader
+from inei_tools.downloaders._hive import partition_dir, write_metadata, write_partition
+from inei_tools.downloaders.inei_downloader import ArchivoINEI
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 1_000
+    return pd.DataFrame(
+        {
+            "UBIGEO": rng.choice([10101, 150101, 150201], n),
+            "FACTOR07": rng.uniform(10, 300, n),
+            "P1": rng.choice([1, 2, 3], n),
+        }
+    )
+
+
+class TestHiveLayout:
+    def test_partitions_and_metadata(self, tmp_path: Path, sample: pd.DataFrame):
+        directory = partition_dir(tmp_path, "Enaho", "85", 2023)
+        assert directory == tmp_path / "encuesta=enaho" / "modulo=85" / "anio=2023"
+
+        paths = write_partition(sample, directory, departamento_column="UBIGEO")
+        assert sorted(path.parent.name for path in paths) == ["departamento=01", "departamento=15"]
+        assert write_metadata(directory)
+
+        metadata = pq.read_metadata(directory / "_metadata")
+        assert metadata.num_rows == len(sample)
+        statistics = metadata.row_group(0).column(1).statistics
+        assert statistics is not None and statistics.has_min_max
+
+    def test_different_schemas(self, tmp_path: Path, sample: pd.DataFrame):
+        """Sin esquema común no se escribe un _metadata inválido."""
+        write_partition(sample, partition_dir(tmp_path, "enaho", "85", 2022))
+        write_partition(sample.drop(columns="P1"), partition_dir(tmp_path, "enaho", "85", 2023))
+        assert not write_metadata(tmp_path)
+        assert not (tmp_path / "_metadata").exists()
+
+    def test_stale_metadata_removed(self, tmp_path: Path, sample: pd.DataFrame):
+        """Un _metadata anterior no queda apuntando a archivos con otro esquema."""
+        write_partition(sample, partition_dir(tmp_path, "enaho", "85", 2022))
+        assert write_metadata(tmp_path)
+        write_partition(sample.drop(columns="P1"), partition_dir(tmp_path, "enaho", "85", 2023))
+        assert not write_metadata(tmp_path)
+        assert not (tmp_path / "_metadata").exists()
+
+
+def hive_downloader(output_dir: Path, overwrite: bool = False) -> Downloader:
+    """Downloader en layout hive con un módulo ya "descargado" (sin red)."""
+    downloader = Downloader(
+        modulos=85, anios=[2023], output_dir=output_dir, descomprimir=True, data_only=True,
+        overwrite=overwrite, layout="hive", partition_by_departamento=True, logger=False,
+    )
+    downloader.archivos_a_descargar = [
+        ArchivoINEI("2023", "Enaho", "906", "85", "906-Modulo85", output_dir / "enaho_85_2023.csv")
+    ]
+    return downloader
+
+
+class TestDownloaderPartitions:
+    def test_write_partitions(self, tmp_path: Path, sample: pd.DataFrame):
+        """Cada archivo descargado pasa a Parquet por departamento y se elimina el plano."""
+        sources = [tmp_path / "enaho_85_2023.csv", tmp_path / "enaho_85_2023_1.csv"]
+        sample.iloc[:600].to_csv(sources[0], index=False)
+        sample.iloc[600:].to_csv(sources[1], index=False)
+        downloader = hive_downloader(tmp_path)
+        downloader.downloaded_files = set(sources)
+
+        directory = partition_dir(tmp_path, "enaho", "85", 2023)
+        assert downloader._write_partitions() == [directory]
+        assert not any(source.exists() for source in sources)
+        assert not downloader.downloaded_files
+        assert sorted(p.relative_to(directory).as_posix() for p in directory.rglob("*.parquet")) == [
+            "departamento=01/part-0.parquet", "departamento=01/part-1.parquet",
+            "departamento=15/part-0.parquet", "departamento=15/part-1.parquet",
+        ]
+        assert pq.read_metadata(directory / "_metadata").num_rows == len(sample)
+        assert (tmp_path / "_metadata").exists()
+
+    @pytest.mark.parametrize("overwrite", [False, True])
+    def test_existing_partition(self, tmp_path: Path, sample: pd.DataFrame, overwrite: bool):
+        """Una partición ya escrita se omite, o se borra con overwrite=True."""
+        directory = partition_dir(tmp_path, "enaho", "85", 2023)
+        write_partition(sample, directory)
+        downloader = hive_downloader(tmp_path, overwrite=overwrite)
+
+        downloader._assert_partitions()
+        status = downloader.archivos_a_descargar[0].status
+        assert status == ("download" if overwrite else "exists")
+        assert (directory / "part-0.parquet").exists() is not overwrite
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,93 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.query import SurveyLake, parse_file_name
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Usa una caché temporal para no escribir en la carpeta del usuario."""
+    monkeypatch.setenv("INEI_TOOLS_CACHE_DIR", str(tmp_path / "cache"))
+
+
+class TestParseFileName:
+    def test_downloader_names(self):
+        parsed = parse_file_name(Path("data/enaho_85_2023.csv"))
+        assert (parsed.encuesta, parsed.modulo, parsed.anio, parsed.view) == (
+            "enaho", "85", 2023, "enaho.m85"
+        )
+        # Variantes de módulos divididos en varios archivos
+        assert parse_file_name(Path("enaho_85_2023_1.dta")).anio == 2023
+        assert parse_file_name(Path("enaho_panel_1474_2021.dta")).encuesta == "enaho_panel"
+        assert parse_file_name(Path("sumaria-2023.dta")) is None
+
+    def test_hive_layout(self):
+        parsed = parse_file_name(
+            Path("data/encuesta=enaho/modulo=85/anio=2023/departamento=15/part-0.parquet")
+        )
+        assert (parsed.view, parsed.anio, parsed.departamento) == ("enaho.m85", 2023, "15")
+
+
+class TestSurveyLake:
+    def test_views_and_virtual_columns(self, tmp_path: Path):
+        pytest.importorskip("duckdb")
+        for year in (2022, 2023, 2024):
+            pd.DataFrame({"P1$05": [1, 2, 2], "FACTOR07": [1.0, 2.0, 3.0]}).to_csv(
+                tmp_path / f"enaho_85_{year}.csv", index=False
+            )
+
+        with SurveyLake(tmp_path) as lake:
+            assert list(lake.views["vista"]) == ["enaho.m85"]
+            query = """
+                SELECT anio, SUM(FACTOR07) AS poblacion FROM enaho.m85
+                WHERE anio >= 2023 AND "P1$05" = 2 GROUP BY anio ORDER BY anio
+            """
+            result = lake.sql(query)
+            assert result["anio"].tolist() == [2023, 2024]
+            assert result["poblacion"].tolist() == [5.0, 5.0]
+            # Segunda vez desde la caché de resultados
+            pd.testing.assert_frame_equal(lake.sql(query), result)
+
+    def test_quoted_partition_value(self, tmp_path: Path):
+        """Un valor de partición hive con comilla simple (o un cero inicial) se conserva como texto."""
+        pytest.importorskip("duckdb")
+        folder = tmp_path / "encuesta=enaho" / "modulo=85" / "anio=2023" / "departamento=0'X"
+        folder.mkdir(parents=True)
+        pd.DataFrame({"FACTOR07": [1.0, 2.0]}).to_parquet(folder / "part-0.parquet")
+        with SurveyLake(tmp_path) as lake:
+            result = lake.sql("SELECT DISTINCT modulo, departamento FROM enaho.m85")
+        assert result.values.tolist() == [["85", "0'X"]]
+
+    def test_cp1252_csv(self, tmp_path: Path):
+        """Un CSV en cp1252 no se lee como latin-1 ("€" y comillas tipográficas)."""
+        pytest.importorskip("duckdb")
+        names = ["Peñalosa “€”", "Ñuñoa"] * 50
+        pd.DataFrame({"NOMBRE": names, "FACTOR07": 1.0}).to_csv(
+            tmp_path / "enaho_85_2023.csv", index=False, encoding="cp1252"
+        )
+        with SurveyLake(tmp_path) as lake:
+            result = lake.sql("SELECT DISTINCT NOMBRE FROM enaho.m85 ORDER BY NOMBRE")
+        assert result["NOMBRE"].tolist() == ["Peñalosa “€”", "Ñuñoa"]
+
+    def test_results_cache_bounded(self, tmp_path: Path):
+        """Los resultados en disco no pasan de `max_cache_bytes` (se eliminan los más antiguos)."""
+        pytest.importorskip("duckdb")
+        pd.DataFrame({"P1$05": range(1_000), "FACTOR07": 1.0}).to_csv(
+            tmp_path / "enaho_85_2023.csv", index=False
+        )
+        results = tmp_path / "cache" / "lake" / "results"
+        with SurveyLake(tmp_path, max_cache_bytes=20_000) as lake:
+            for limit in range(100, 1_000, 100):
+                lake.sql(f'SELECT "P1$05" FROM enaho.m85 WHERE "P1$05" < {limit}')
+            assert sum(f.stat().st_size for f in results.glob("*.arrow")) <= 20_000
+            assert 0 < len(list(results.glob("*.arrow"))) < 9
+
+        # El último resultado sigue en disco para otra sesión
+        with SurveyLake(tmp_path, max_cache_bytes=20_000) as lake:
+            lake.connection.close()  # sin DuckDB: solo puede venir de la caché
+            result = lake.sql('SELECT "P1$05" FROM enaho.m85 WHERE "P1$05" < 900')
+        assert len(result) == 900
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,54 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.tendencias._lazy_frames import LazyFrames
+
+
+class CountingLoader:
+    def __init__(self):
+        self.calls: list[Path] = []
+
+    def __call__(self, path: Path) -> pd.DataFrame:
+        self.calls.append(path)
+        return pd.DataFrame({"x": range(1_000), "path": str(path)})
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[Path]:
+    # Mismo nombre en carpetas distintas: son años distintos
+    return [tmp_path / "2022" / "enaho01.dta", tmp_path / "2023" / "enaho01.dta"]
+
+
+class TestLazyFrames:
+    def test_lazy_and_keyed_by_path(self, paths: list[Path]):
+        loader = CountingLoader()
+        frames = LazyFrames(paths, loader)
+        assert list(frames) == paths and not loader.calls
+
+        assert frames[paths[1]]["path"].iloc[0] == str(paths[1])
+        assert loader.calls == [paths[1]]
+        assert frames[str(paths[0])]["path"].iloc[0] == str(paths[0])
+
+    def test_memory_budget(self, paths: list[Path]):
+        """Con presupuesto 0 solo queda el último año; con espacio, se reutilizan."""
+        loader = CountingLoader()
+        frames = LazyFrames(paths, loader, memory_budget=0)
+        frames[paths[0]]
+        frames[paths[1]]
+        assert list(frames._resident) == [paths[1]]
+        frames[paths[0]]
+        assert loader.calls == [paths[0], paths[1], paths[0]]
+
+        loader = CountingLoader()
+        frames = LazyFrames(paths, loader, memory_budget=10 * 1024**2)
+        for _ in range(2):
+            for path in paths:
+                frames[path]
+        assert loader.calls == paths
+        frames.memory_budget = 0
+        frames.trim()
+        assert frames.resident_bytes == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
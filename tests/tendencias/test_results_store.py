@@ -0,0 +1,103 @@
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.tendencias import ResultsStore, _results_store
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ResultsStore:
+    return ResultsStore(tmp_path / "tendencias.sqlite")
+
+
+class TestResultsStore:
+    def test_roundtrip_and_invalidation(self, tmp_path: Path, store: ResultsStore):
+        path = tmp_path / "enaho_85_2023.csv"
+        pd.DataFrame({"P1$05": [1, 2]}).to_csv(path, index=False)
+        result = pd.DataFrame({"P1$05": ["1", "2"], "2023": [40.0, 60.0]})
+
+        store.put("enaho", path, {"P1$05": result}, "national")
+        pd.testing.assert_frame_equal(store.get("enaho", path, ["P1$05"], "national")["P1$05"], result)
+        # Otro método o variable no comparten resultados
+        assert store.get("enaho", path, ["P1$05"], "department") == {}
+        assert store.get("enaho", path, ["P1$06"], "national") == {}
+
+        # Si el INEI actualiza el archivo, el resultado anterior ya no vale
+        pd.DataFrame({"P1$05": [1, 1]}).to_csv(path, index=False)
+        assert store.get("enaho", path, ["P1$05"], "national") == {}
+        store.put("enaho", path, {"P1$05": result}, "national")
+        with closing(store._connect()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (1,)
+
+    def test_engine_and_version(self, tmp_path: Path, store: ResultsStore, monkeypatch):
+        """Otro engine u otra versión del formato no reutilizan el resultado."""
+        path = tmp_path / "enaho_85_2023.csv"
+        pd.DataFrame({"P1$05": [1, 2]}).to_csv(path, index=False)
+        result = pd.DataFrame({"P1$05": ["1", "2"], "2023": [40.0, 60.0]})
+
+        store.put("enaho", path, {"P1$05": result}, "national", engine="c")
+        assert list(store.get("enaho", path, ["P1$05"], "national", engine="c")) == ["P1$05"]
+        assert store.get("enaho", path, ["P1$05"], "national", engine="polars") == {}
+
+        monkeypatch.setattr(_results_store, "RESULT_VERSION", _results_store.RESULT_VERSION + 1)
+        assert store.get("enaho", path, ["P1$05"], "national", engine="c") == {}
+        store.put("enaho", path, {"P1$05": result}, "national", engine="c")
+        with closing(store._connect()) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM results").fetchone() == (1,)
+
+    def test_arrow_roundtrip(self, tmp_path: Path, store: ResultsStore):
+        """Se guarda como Arrow IPC (no pickle) y vuelven las mismas etiquetas y tipos."""
+        path = tmp_path / "enaho_85_2023.csv"
+        pd.DataFrame({"P1$05": [1, 2]}).to_csv(path, index=False)
+        department = pd.DataFrame(
+            {
+                "Departamento": pd.Categorical(
+                    ["Cusco", "Lima"], categories=pd.Index(["Cusco", "Lima"], dtype=object)
+                ),
+                "Año": [2023, 2023],
+                1.0: [40.0, 55.0],
+                2.0: [60.0, 45.0],
+            }
+        )
+        department.columns.name = "P1$05"
+        national = pd.DataFrame({"P1$05": pd.Categorical([2.0, 1.0]), 2023: [40.0, 60.0]})
+
+        store.put("enaho", path, {"P1$05": department}, "department")
+        store.put("enaho", path, {"P1$05": national}, "national")
+        with closing(store._connect()) as conn:
+            blobs = [row[0] for row in conn.execute("SELECT result FROM results")]
+        assert all(blob.startswith(b"ARROW1") for blob in blobs)
+        for method, expected in (("department", department), ("national", national)):
+            result = store.get("enaho", path, ["P1$05"], method)["P1$05"]
+            pd.testing.assert_frame_equal(result, expected)
+
+    def test_same_name_other_folder(self, tmp_path: Path, store: ResultsStore):
+        """Archivos con el mismo nombre en carpetas distintas no se reemplazan entre sí."""
+        result = pd.DataFrame({"P1$05": ["1", "2"], "2023": [40.0, 60.0]})
+        paths = []
+        for i, folder in enumerate(("a", "b")):
+            (tmp_path / folder).mkdir()
+            path = tmp_path / folder / "enaho_85_2023.csv"
+            pd.DataFrame({"P1$05": [1, i]}).to_csv(path, index=False)
+            store.put("enaho", path, {"P1$05": result}, "national")
+            paths.append(path)
+        for path in paths:
+            assert list(store.get("enaho", path, ["P1$05"], "national")) == ["P1$05"]
+
+    def test_old_table_replaced(self, tmp_path: Path):
+        """Una base con la tabla anterior (sin engine ni versión) se recrea."""
+        path = tmp_path / "tendencias.sqlite"
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute(
+                "CREATE TABLE results (encuesta TEXT, modulo TEXT, variable TEXT, method TEXT, "
+                "file_hash TEXT, source TEXT, result BLOB, created REAL)"
+            )
+        store = ResultsStore(path)
+        with closing(store._connect()) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(results)")]
+        assert {"engine", "version"} <= set(columns)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
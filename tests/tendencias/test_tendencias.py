@@ -0,0 +1,136 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools import Tendencias
+from inei_tools.downloaders import Downloader
+from inei_tools.tendencias import ResultsStore, tendencias as tendencias_module
+
+VARIABLES = ["P1$05", "P1$06"]
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Usa una caché temporal para no escribir en la carpeta del usuario."""
+    monkeypatch.setenv("INEI_TOOLS_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def write_year(directory: Path, year: int, seed: int | None = None) -> Path:
+    rng = np.random.default_rng(year if seed is None else seed)
+    n = 2_000
+    df = pd.DataFrame(
+        {
+            "AÑO": year,
+            "UBIGEO": rng.choice(["010101", "080101", "150101"], n),
+            "FACTOR07": rng.uniform(10, 300, n).round(2),
+        }
+    )
+    for variable in VARIABLES:
+        df[variable] = rng.choice(["1", "2", "3"], n)
+    path = directory / f"enaho_85_{year}.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> list[Path]:
+    return [write_year(tmp_path, year) for year in (2022, 2023)]
+
+
+class TestTendencias:
+    def test_several_variables(self, paths: list[Path]):
+        """Con una lista se retorna {variable: DataFrame}, igual que variable por variable."""
+        tendencias = Tendencias("enaho", data_source=paths, target_variable_id=VARIABLES)
+        national = tendencias.get_national_trends()
+        department = tendencias.get_department_trends()
+        assert list(national) == VARIABLES and list(department) == VARIABLES
+        assert tendencias.cleaner.target_variable_id == VARIABLES[0]
+
+        for variable in VARIABLES:
+            single = Tendencias("enaho", data_source=paths, target_variable_id=variable)
+            expected = single.get_national_trends()
+            assert isinstance(expected, pd.DataFrame)
+            assert list(expected.columns) == [variable, 2022, 2023]
+            pd.testing.assert_frame_equal(national[variable], expected)
+            pd.testing.assert_frame_equal(department[variable], single.get_department_trends())
+
+    def test_parallel_same_as_sequential(self, paths: list[Path]):
+        """Con workers=2 cada año se limpia en otro proceso y el resultado no cambia."""
+        sequential = Tendencias("enaho", data_source=paths, target_variable_id=VARIABLES)
+        parallel = Tendencias("enaho", data_source=paths, target_variable_id=VARIABLES, workers=2)
+
+        for method in ("get_national_trends", "get_department_trends"):
+            expected = getattr(sequential, method)()
+            result = getattr(parallel, method)()
+            for variable in VARIABLES:
+                pd.testing.assert_frame_equal(result[variable], expected[variable])
+
+    def test_workers_after_polars_run(self, paths: list[Path]):
+        """
+        Los workers no heredan por fork el pool de hilos de Polars ya creado en
+        este proceso (se bloquearían en `future.result()`).
+        """
+        pytest.importorskip("polars")
+        polars = Tendencias("enaho", data_source=paths, target_variable_id=VARIABLES, engine="polars")
+        expected = polars.get_national_trends()
+        parallel = Tendencias(
+            "enaho", data_source=paths, target_variable_id=VARIABLES, engine="polars", workers=2
+        )
+        result = parallel.get_national_trends()
+        for variable in VARIABLES:
+            pd.testing.assert_frame_equal(result[variable], expected[variable])
+
+    def test_hive_downloader_rejected(self, tmp_path: Path):
+        """Las particiones hive no son un archivo por año: error claro antes de descargar."""
+        downloader = Downloader(
+            modulos=85, anios=[2023], output_dir=tmp_path, descomprimir=True, data_only=True,
+            layout="hive", logger=False,
+        )
+        downloader.download_all = lambda: pytest.fail("no se debe descargar")
+        tendencias = Tendencias("enaho", data_source=downloader, target_variable_id="P1$05")
+        with pytest.raises(ValueError, match="layout='hive'"):
+            tendencias.get_national_trends()
+
+    def test_store_computes_only_new_or_changed_years(self, tmp_path: Path, monkeypatch):
+        """Con un ResultsStore, la segunda ejecución solo limpia el año nuevo y el modificado."""
+        cleaned = []
+        clean_year = tendencias_module._clean_year
+
+        def spy(cleaner, source, variables, method):
+            cleaned.append(int(source["AÑO"].iloc[0]))
+            return clean_year(cleaner, source, variables, method)
+
+        monkeypatch.setattr(tendencias_module, "_clean_year", spy)
+        store = ResultsStore(tmp_path / "tendencias.sqlite")
+        paths = [write_year(tmp_path, year) for year in (2021, 2022, 2023)]
+        for method in ("get_national_trends", "get_department_trends"):
+            first = Tendencias(
+                "enaho", data_source=paths, target_variable_id=VARIABLES, store=store
+            )
+            getattr(first, method)()
+        assert cleaned == [2021, 2022, 2023] * 2
+
+        # El INEI corrige 2022 y publica 2024
+        write_year(tmp_path, 2022, seed=99)
+        paths.append(write_year(tmp_path, 2024))
+        cleaned.clear()
+        for method in ("get_national_trends", "get_department_trends"):
+            stored = Tendencias(
+                "enaho", data_source=paths, target_variable_id=VARIABLES, store=store
+            )
+            result = getattr(stored, method)()
+            assert sorted(cleaned) == [2022, 2024]
+            cleaned.clear()
+
+            fresh = Tendencias("enaho", data_source=paths, target_variable_id=VARIABLES)
+            expected = getattr(fresh, method)()
+            cleaned.clear()
+            for variable in VARIABLES:
+                df = result[variable]
+                years = df.columns[1:] if method == "get_national_trends" else df["Año"].unique()
+                assert sorted(years) == [2021, 2022, 2023, 2024]
+                pd.testing.assert_frame_equal(result[variable], expected[variable])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner
+from inei_tools.configs.encuesta_config import EnahoConfig, EnapresConfig
+from inei_tools.utils.columns import match_columns, normalize_column_name, read_column_names
+
+
+class TestMatchColumns:
+    def test_case_and_separator(self):
+        """`P1$05` (csv/dbf), `p1_05` (stata) y `P1_05` (spss) son la misma columna."""
+        assert normalize_column_name(" p1$05 ") == normalize_column_name("P1_05") == "P1_05"
+        mapping = match_columns(["año", "p1_05", "Factor07", "OTRA"], ["AÑO", "P1$05", "FACTOR07"])
+        assert mapping == {"año": "AÑO", "p1_05": "P1$05", "Factor07": "FACTOR07"}
+
+    def test_exact_name_first_and_missing(self):
+        """Un nombre idéntico gana sobre uno equivalente; los que faltan se omiten."""
+        mapping = match_columns(["P1_05", "P1$05"], ["P1$05", "ESTRATO"])
+        assert mapping == {"P1$05": "P1$05"}
+
+
+class TestRequiredColumns:
+    def test_per_encuesta(self):
+        assert EnahoConfig().required_columns("P1$05", "P1$06") == [
+            "AÑO", "UBIGEO", "FACTOR07", "ESTRATO", "CONGLOME", "P1$05", "P1$06"
+        ]
+        # Sin duplicados aunque la variable objetivo sea una columna estándar
+        assert EnapresConfig().required_columns("NOMBREPP") == [
+            "ANIO", "NOMBREDD", "FACTOR", "ESTRATO", "CONGLOMERADO", "NOMBREPP"
+        ]
+
+
+class TestProjectedRead:
+    def test_only_required_columns(self, tmp_path: Path):
+        """Con `columns` el cleaner lee solo esas columnas, con los nombres pedidos."""
+        path = tmp_path / "enaho_85_2023.csv"
+        pd.DataFrame(
+            {
+                "año": [2023, 2023],
+                "ubigeo": ["010101", "150101"],
+                "factor07": [1.5, 2.5],
+                "p1_05": ["1", "2"],
+                "p1_06": ["2", "2"],
+                "OTRA": [0, 0],
+            }
+        ).to_csv(path, index=False)
+        assert read_column_names(path) == ["año", "ubigeo", "factor07", "p1_05", "p1_06", "OTRA"]
+
+        cleaner = EncuestaCleaner("enaho")
+        cleaner.target_variable_id = "P1$05"
+        df = cleaner.initialize(path, columns=cleaner.required_columns()).get_df()
+        assert list(df.columns) == ["AÑO", "UBIGEO", "FACTOR07", "P1$05"]
+        assert df["P1$05"].astype(str).tolist() == ["1", "2"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
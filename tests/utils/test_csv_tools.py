@@ -0,0 +1,80 @@
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.utils import sniff_csv
+from inei_tools.utils import csv_tools
+from inei_tools.utils.csv_tools import _DIALECT_CACHE
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Usa una caché temporal para no escribir en la carpeta del usuario."""
+    monkeypatch.setenv("INEI_TOOLS_CACHE_DIR", str(tmp_path / "cache"))
+    _DIALECT_CACHE.clear()
+
+
+class TestSniffCsv:
+    def test_latin1_semicolon_decimal_comma(self, tmp_path: Path):
+        """Detecta encoding, delimitador y coma decimal en una sola lectura."""
+        path = tmp_path / "enaho.csv"
+        path.write_bytes("AÑO;UBIGEO;FACTOR07\n2023;010101;123,45\n2023;150101;98,5\n".encode("cp1252"))
+
+        dialect = sniff_csv(path)
+        assert dialect.delimiter == ";"
+        assert dialect.decimal == ","
+        assert dialect.encoding in ("cp1252", "latin1")
+
+        df = pd.read_csv(path, **dialect.read_csv_kwargs())
+        assert list(df.columns) == ["AÑO", "UBIGEO", "FACTOR07"]
+        assert df["FACTOR07"].sum() == pytest.approx(221.95)
+
+    def test_excel_sep_hint(self, tmp_path: Path):
+        """La línea 'sep=;' de Excel define el delimitador y desplaza la cabecera."""
+        path = tmp_path / "excel.csv"
+        path.write_text("sep=|\nA|B\n1|2\n", encoding="utf-8")
+
+        dialect = sniff_csv(path)
+        assert dialect.delimiter == "|"
+        assert dialect.header == 1
+
+    def test_short_file_not_truncated(self, tmp_path: Path):
+        """En un archivo completo, un byte cp1252 al final no se descarta como un corte."""
+        path = tmp_path / "corto.csv"
+        path.write_bytes("A,B\n1,Ñ".encode("cp1252"))
+
+        dialect = sniff_csv(path)
+        assert dialect.encoding == "cp1252"
+        assert pd.read_csv(path, **dialect.read_csv_kwargs())["B"].tolist() == ["Ñ"]
+
+    def test_truncated_sample(self, tmp_path: Path):
+        """
+        En una muestra cortada, un carácter UTF-8 partido al final no descarta
+        UTF-8, pero un byte cp1252 cerca del final sí.
+        """
+        path = tmp_path / "largo.csv"
+        body = "A,B\n" + "1,x\n" * (csv_tools.SNIFF_BYTES // 4)
+        path.write_bytes((body[: csv_tools.SNIFF_BYTES - 3] + "Ñ,1").encode("cp1252") + b"\n")
+        assert sniff_csv(path).encoding == "cp1252"
+
+        raw = (body[: csv_tools.SNIFF_BYTES - 1] + "Ñ").encode("utf-8")
+        assert len(raw) == csv_tools.SNIFF_BYTES + 1
+        assert csv_tools._encoding_from_bytes(raw[: csv_tools.SNIFF_BYTES]) == "utf-8"
+
+    def test_cache_is_persistent(self, tmp_path: Path, monkeypatch):
+        """Una segunda detección del mismo archivo sale de la caché SQLite."""
+        path = tmp_path / "cache.csv"
+        path.write_text("A,B\n1,2\n", encoding="utf-8")
+
+        first = sniff_csv(path)
+        _DIALECT_CACHE.clear()
+
+        def fail(raw: bytes):
+            raise AssertionError("el archivo se volvió a leer para detectar su formato")
+
+        monkeypatch.setattr(csv_tools, "_sniff_bytes", fail)
+        assert sniff_csv(path) == first
+        assert (tmp_path / "cache" / "cache.sqlite").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,74 @@
+import datetime
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.utils.dbf import iter_dbf_batches, read_dbf_header, read_dbf_native
+
+# Escritor independiente para no validar el lector con sus propios supuestos
+dbf = pytest.importorskip("dbf")
+
+ROWS = [
+    ("Peñalosa “€”", 12.5, 3, datetime.date(2023, 1, 2), True),
+    ("Borrado", 1.0, 1, None, False),
+    ("Ana", None, 7, None, None),
+    ("Cusco", 99.25, 12, datetime.date(2024, 12, 31), False),
+]
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    path = tmp_path / "enaho_85_2023.dbf"
+    table = dbf.Table(
+        str(path),
+        "NOMBRE C(20); MONTO N(10,2); CANT N(5,0); FECHA D; ACTIVO L",
+        codepage="cp1252",
+        dbf_type="db3",
+    )
+    table.open(dbf.READ_WRITE)
+    for row in ROWS:
+        table.append(row)
+    dbf.delete(table[1])
+    table.close()
+    return path
+
+
+class TestReadDbf:
+    def test_field_types(self, path: Path):
+        """Texto cp1252, números, fechas y lógicos; los registros borrados se omiten."""
+        header = read_dbf_header(path)
+        assert header.encoding == "cp1252"
+        assert [(f.name, f.type) for f in header.fields] == [
+            ("NOMBRE", "C"), ("MONTO", "N"), ("CANT", "N"), ("FECHA", "D"), ("ACTIVO", "L")
+        ]
+
+        df = read_dbf_native(path)
+        assert df["NOMBRE"].tolist() == ["Peñalosa “€”", "Ana", "Cusco"]
+        np.testing.assert_array_equal(df["MONTO"], [12.5, np.nan, 99.25])
+        assert df["CANT"].dtype == np.int64 and df["CANT"].tolist() == [3, 7, 12]
+        assert df["FECHA"].iloc[0] == pd.Timestamp("2023-01-02") and pd.isna(df["FECHA"].iloc[1])
+        assert df["ACTIVO"].iloc[0] is True and df["ACTIVO"].iloc[2] is False
+        assert pd.isna(df["ACTIVO"].iloc[1])
+
+    def test_usecols_and_batches(self, path: Path):
+        df = read_dbf_native(path, usecols=["CANT", "NOMBRE"])
+        assert list(df.columns) == ["NOMBRE", "CANT"]
+        batches = list(iter_dbf_batches(path, usecols=["CANT"], batch_rows=2))
+        assert [len(batch) for batch in batches] == [1, 2]
+
+    def test_truncated_file(self, path: Path, caplog):
+        """Si la cabecera declara más registros de los que hay, se leen los completos."""
+        header = read_dbf_header(path)
+        raw = path.read_bytes()
+        # Se corta el último registro a la mitad
+        path.write_bytes(raw[: header.header_size + 3 * header.record_size + 10])
+
+        with caplog.at_level(logging.WARNING):
+            df = read_dbf_native(path)
+        assert df["NOMBRE"].tolist() == ["Peñalosa “€”", "Ana"]
+        assert "declara 4 registros" in caplog.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.utils.memory import PeakMemory, copy_on_write
+
+
+class TestPeakMemory:
+    def test_measures_allocation(self):
+        """El pico incluye arreglos creados y liberados dentro del bloque."""
+        with PeakMemory() as peak:
+            values = np.ones(1_000_000)
+            del values
+        assert peak.bytes >= 8_000_000
+
+
+class TestCopyOnWrite:
+    def test_copy_inside_block(self):
+        """Modificar una columna extraída no cambia el DataFrame original."""
+        with copy_on_write():
+            df = pd.DataFrame({"a": [1, 2]})
+            column = df["a"]
+            column.iloc[0] = 10
+            assert df["a"].iloc[0] == 1
+
+    @pytest.mark.skipif(
+        int(pd.__version__.split(".")[0]) >= 3, reason="en pandas >= 3 copy-on-write siempre está activo"
+    )
+    def test_restores_option(self):
+        """Al salir del bloque la opción global vuelve a su valor anterior."""
+        before = pd.get_option("mode.copy_on_write")
+        with copy_on_write():
+            assert pd.get_option("mode.copy_on_write") is True
+        assert pd.get_option("mode.copy_on_write") == before
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner, _ubigeo
+from inei_tools.utils import sniff_csv
+from inei_tools.utils.reading import read_csv_arrow, read_parallel, read_spss
+
+pyreadstat = pytest.importorskip("pyreadstat")
+
+
+@pytest.fixture
+def sample() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 3_000
+    return pd.DataFrame(
+        {
+            "UBIGEO": rng.choice(["010101", "150101"], n),
+            "FACTOR07": rng.uniform(1, 300, n),
+            "N": rng.integers(0, 5, n).astype("int8"),
+            "F": rng.uniform(0, 1, n).astype("float32"),
+            "M": np.where(rng.random(n) < 0.1, np.nan, rng.integers(0, 5, n)),
+        }
+    )
+
+
+class TestReadParallel:
+    def test_stata_same_as_sequential(self, tmp_path: Path, sample: pd.DataFrame):
+        """Mismos tipos que `pd.read_stata`: categorías en el orden de sus códigos y anchos de Stata."""
+        rng = np.random.default_rng(1)
+        sample["P1"] = pd.Categorical(
+            rng.choice(["No", "Sí", "Tal vez"], len(sample)), categories=["Tal vez", "Sí", "No"]
+        )
+        path = tmp_path / "enaho_85_2023.dta"
+        sample.to_stata(path, write_index=False)
+
+        expected = pd.read_stata(path)
+        pd.testing.assert_frame_equal(read_parallel(path, workers=2), expected)
+        pd.testing.assert_frame_equal(
+            read_parallel(path, usecols=["P1", "N"], workers=2), pd.read_stata(path, columns=["P1", "N"])
+        )
+
+    def test_spss_same_as_sequential(self, tmp_path: Path, sample: pd.DataFrame):
+        sample["P1"] = np.random.default_rng(1).choice([1, 2], len(sample))
+        path = tmp_path / "enaho_85_2023.sav"
+        pyreadstat.write_sav(sample, str(path), variable_value_labels={"P1": {1: "Sí", 2: "No"}})
+
+        expected, _ = read_spss(str(path))
+        pd.testing.assert_frame_equal(read_parallel(path, workers=2), expected)
+
+
+def write_survey_csv(path: Path, **to_csv) -> Path:
+    rng = np.random.default_rng(0)
+    n = 3_000
+    values = rng.choice([1, 2, 3], n).astype(object)
+    values[[5, 2_000]] = None  # enteros con campos vacíos: float en pandas
+    pd.DataFrame(
+        {
+            "AÑO": 2023,
+            "UBIGEO": rng.choice([10101, 150101], n),
+            "FACTOR07": rng.uniform(1, 300, n).round(2),
+            "P1": values,
+            "NOMBRE": rng.choice(["Peñalosa", "Ñuñoa", None], n),
+        }
+    ).to_csv(path, index=False, **to_csv)
+    return path
+
+
+class TestReadCsvArrow:
+    def test_same_as_read_csv(self, tmp_path: Path):
+        """Mismos valores y tipos que `pd.read_csv`, también en cp1252 con coma decimal."""
+        pytest.importorskip("pyarrow")
+        path = write_survey_csv(
+            tmp_path / "enaho_85_2023.csv", sep=";", decimal=",", encoding="cp1252"
+        )
+        dialect = sniff_csv(path)
+        expected = pd.read_csv(path, **dialect.read_csv_kwargs())
+        pd.testing.assert_frame_equal(read_csv_arrow(path, dialect), expected)
+
+    def test_cleaner_same_as_c(self, tmp_path: Path, monkeypatch):
+        """engine="pyarrow" da las mismas tablas nacional y por departamento que "c"."""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(_ubigeo, "_DEPARTAMENTOS", {})
+        monkeypatch.setattr(
+            _ubigeo, "_departamento", lambda code: "Lima" if code.startswith("15") else "Amazonas"
+        )
+        path = write_survey_csv(tmp_path / "enaho_85_2023.csv")
+
+        def tables(engine: str) -> list[pd.DataFrame]:
+            national = EncuestaCleaner("enaho", engine=engine)
+            national.target_variable_id = "P1"
+            department = EncuestaCleaner("enaho", engine=engine)
+            department.target_variable_id = "P1"
+            return [
+                national.initialize(path).remove_nas().count_categories().get_df(),
+                department.initialize(path).remove_nas().add_departamentos()
+                .group_by_departamento().to_row_percentage().get_df(),
+            ]
+
+        for result, expected in zip(tables("pyarrow"), tables("c")):
+            pd.testing.assert_frame_equal(result, expected)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+import sqlite3
+from pathlib import Path
+import pandas as pd
+import pytest
+from inei_tools.cleaners import EncuestaCleaner
+from inei_tools.utils import TableCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Usa una caché temporal para no escribir en la carpeta del usuario."""
+    monkeypatch.setenv("INEI_TOOLS_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def write_csv(path: Path, n: int = 100) -> Path:
+    pd.DataFrame({"UBIGEO": ["010101"] * n, "P1$05": range(n)}).to_csv(path, index=False)
+    return path
+
+
+class TestTableCache:
+    def test_roundtrip(self, tmp_path: Path):
+        """Una tabla guardada se recupera igual, indexada por contenido y opciones."""
+        cache = TableCache()
+        path = write_csv(tmp_path / "enaho.csv")
+        df = pd.read_csv(path)
+
+        key = cache.key(path, engine="c", columns=["P1$05"])
+        assert cache.get(key) is None
+        cache.put(key, df)
+        pd.testing.assert_frame_equal(cache.get(key), df)
+
+        # Otras columnas proyectadas -> otra entrada
+        assert cache.key(path, engine="c", columns=["UBIGEO"]) != key
+
+    def test_key_changes_with_content(self, tmp_path: Path):
+        """Si el archivo cambia, la clave cambia y no se usa la tabla vieja."""
+        cache = TableCache()
+        path = write_csv(tmp_path / "enaho.csv", n=10)
+        key = cache.key(path)
+        write_csv(path, n=20)
+        assert cache.key(path) != key
+
+    def test_lru_eviction(self, tmp_path: Path):
+        """Al superar max_bytes se eliminan las tablas menos usadas."""
+        df = pd.DataFrame({"x": range(10_000)})
+        cache = TableCache(max_bytes=1)
+        cache.put("a", df)
+        assert cache.get("a") is None
+
+        cache = TableCache(tmp_path / "lru")
+        cache.put("a", df)
+        size = (cache.directory / "a.arrow").stat().st_size
+        # Caben dos tablas; "a" se usa después de escribir "b", así que sale "b"
+        cache.max_bytes = 2 * size + size // 2
+        cache.put("b", df)
+        assert cache.get("a") is not None
+        cache.put("c", df)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert not (cache.directory / "b.arrow").exists()
+
+    def test_unsupported_table_not_cached(self, tmp_path: Path):
+        """Una tabla que Arrow no puede convertir no interrumpe la lectura."""
+        cache = TableCache()
+        cache.put("mixta", pd.DataFrame({"x": pd.Series([1, "a", 2.5], dtype=object)}))
+        assert cache.get("mixta") is None
+        assert not list(cache.directory.glob("mixta*"))
+
+    def test_reader_in_key(self, tmp_path: Path):
+        """
+        Las lecturas con pyreadstat (en paralelo) y pd.read_stata no comparten
+        entradas; el modo frugal no cambia la tabla leída y sí la comparte.
+        """
+        path = tmp_path / "enaho_85_2023.dta"
+        pd.DataFrame({"AÑO": [2023] * 10, "P1": range(10)}).to_stata(path, write_index=False, version=118)
+        cache = TableCache()
+
+        sequential = EncuestaCleaner("enaho", cache=cache)
+        parallel = EncuestaCleaner("enaho", cache=cache, read_workers=2, parallel_read_min_bytes=0)
+        frugal = EncuestaCleaner("enaho", cache=cache, frugal=True)
+        for cleaner in (sequential, parallel, sequential, frugal):
+            cleaner.initialize(path)
+        with sqlite3.connect(cache.directory / "index.sqlite") as conn:
+            assert conn.execute("SELECT COUNT(*) FROM entries").fetchone() == (2,)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])